@@ -12,12 +12,12 @@ from telegram.ext import (
     ContextTypes,
     filters,
 )
+from shared import botmeta, metrics, resources, throttle, webhook
+from shared.supervisor import supervisor
+from shared.outbound import OutboundScheduler
 
 # ================= LOGGING =================
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+# Output is set up once for the process by shared/logs.py
 logger = logging.getLogger(__name__)
 
 # ================= CONFIG =================
@@ -127,14 +127,23 @@ async def start_bot1():
     app = (
         Application.builder()
         .token(os.getenv("BOT1_TOKEN"))
+        .rate_limiter(OutboundScheduler("bot1"))
+        .request(resources.telegram_request())
         .build()
     )
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    # Every link is a download through the API: a few per user per minute
+    throttle.install(app, "bot1", [
+        throttle.Rule("download", 3, 60, text=r"https?://", notice="⏳ One download at a time, send the next link in a minute."),
+    ])
 
     await app.bot.initialize()
     await app.initialize()
+    await botmeta.load(app)
+    metrics.instrument(app, "bot1")
+    supervisor.attach("bot1", app)
     await app.start()
-    await app.updater.start_polling()
+    await webhook.start_updates("bot1", app)
     
@@ -5,7 +5,6 @@ import logging
 import pytz
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from motor.motor_asyncio import AsyncIOMotorClient
 from aiohttp import web
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from telegram.ext import (
@@ -18,18 +17,20 @@ from telegram.ext import (
     ConversationHandler,
     Application
 )
+from shared import botmeta, metrics, resources, tenants, throttle, webhook
+from shared.botmeta import prebuilt
+from shared.outbound import Lane, OutboundScheduler
+from shared.supervisor import supervisor
 
 # ================= LOGGING SETUP =================
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Output is set up once for the process by shared/logs.py
 logger = logging.getLogger(__name__)
+send_logger = logging.getLogger(f"{__name__}.send")  # sampled (LOG_SAMPLE): floods of send failures
 
 # ================= CONFIGURATION =================
 BOT_TOKEN = os.getenv("BOT_TOKEN", "")
 MONGO_URI = os.getenv("MONGO_URI", "")
-LOG_CHANNEL_ID = int(os.getenv("LOG_CHANNEL_ID", ""))
+LOG_CHANNEL_ID = int(os.getenv("LOG_CHANNEL_ID") or 0)  # 0 = no log channel
 PORT = int(os.getenv("PORT", "8080"))
 
 ADMINS_STR = os.getenv("ADMIN_IDS", "5298223577")
@@ -46,6 +47,18 @@ CATEGORY_CHANNELS = {
 }
 DEFAULT_CHANNEL = -1002539932770
 
+# Values above are the defaults; each tenant's own come from its settings in Mongo
+conf = tenants.Settings(
+    LOG_CHANNEL_ID=LOG_CHANNEL_ID,
+    ADMINS=ADMINS,
+    OWNER_USERNAME=OWNER_USERNAME,
+    UPI_ID=UPI_ID,
+    PLAN_IMG_URL=PLAN_IMG_URL,
+    FORCE_SUB_CHANNELS=FORCE_SUB_CHANNELS,
+    CATEGORY_CHANNELS=CATEGORY_CHANNELS,
+    DEFAULT_CHANNEL=DEFAULT_CHANNEL,
+)
+
 # ================= BOT SETTINGS =================
 IST = pytz.timezone('Asia/Kolkata')
 TRIAL_HOURS = 24
@@ -64,16 +77,14 @@ CAPTION_TEXT = (
 )
 
 # ================= DATABASE SETUP =================
-# Fixed Client for Motor 2.5.1
-client = AsyncIOMotorClient(
-    MONGO_URI,
-    tls=True,
-    tlsAllowInvalidCertificates=False
-)
+# Process-wide client: one connection pool shared with the other bots
+# (TLS follows the URI, mongodb+srv:// implies it; MONGO_TLS=true forces it)
+client = resources.motor(MONGO_URI)
 
 db = client["telegram_bot_db"]
-users_col = db["users"]
-media_col = db["media"]
+# Per tenant: "users" for the default bot, "<tenant>.users" for the others
+users_col = tenants.Scoped(lambda t: db[t.collection("users")])
+media_col = tenants.Scoped(lambda t: db[t.collection("media")])
 
 # ================= UTILITY FUNCTIONS =================
 
@@ -111,7 +122,7 @@ async def send_log(bot, log_type, user, additional_text=""):
         text = additional_text
 
     try:
-        await bot.send_message(LOG_CHANNEL_ID, text, parse_mode="HTML")
+        await bot.send_message(conf.LOG_CHANNEL_ID, text, parse_mode="HTML")
     except Exception as e:
         logger.error(f"Log error: {e}")
 
@@ -127,6 +138,7 @@ async def check_user_membership(bot, user_id, channels):
 
 # ================= KEYBOARDS =================
 
+@prebuilt
 def get_main_keyboard(is_admin=False):
     buttons = [
         [InlineKeyboardButton("▶ Start Browsing", callback_data="send_media")],
@@ -138,6 +150,7 @@ def get_main_keyboard(is_admin=False):
         buttons.append([InlineKeyboardButton("⚙️ Admin Panel", callback_data="admin_panel")])
     return InlineKeyboardMarkup(buttons)
 
+@prebuilt
 def get_media_keyboard():
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("👍 Like", callback_data="like"), 
@@ -148,6 +161,7 @@ def get_media_keyboard():
          InlineKeyboardButton("❌ Close", callback_data="close")]
     ])
 
+@prebuilt
 def get_plans_keyboard():
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("1 Month - ₹50", callback_data="pay_1"),
@@ -157,19 +171,22 @@ def get_plans_keyboard():
         [InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_menu_del")] 
     ])
 
+@prebuilt
 def get_payment_keyboard():
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("📤 Send Payment Proof", callback_data="submit_proof")],
         [InlineKeyboardButton("🔙 Back", callback_data="plans")]
     ])
 
+@prebuilt
 def get_category_keyboard():
     buttons = []
-    for category in CATEGORY_CHANNELS.keys():
+    for category in conf.CATEGORY_CHANNELS.keys():
         buttons.append([InlineKeyboardButton(f"{category}", callback_data=f"set_category_{category}")])
     buttons.append([InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_menu")])
     return InlineKeyboardMarkup(buttons)
 
+@prebuilt
 def get_admin_keyboard():
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("➕ Add Premium to User", callback_data="admin_add_premium")],
@@ -186,7 +203,7 @@ class UserManager:
 
     async def create_user(self, user_id, name):
         expiry = get_ist_now()
-        default_cat = list(CATEGORY_CHANNELS.keys())[0] if CATEGORY_CHANNELS else "🎬 All "
+        default_cat = list(conf.CATEGORY_CHANNELS.keys())[0] if conf.CATEGORY_CHANNELS else "🎬 All "
         user_data = {
             "_id": str(user_id),
             "name": name,
@@ -311,9 +328,9 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_data = await user_manager.create_user(user.id, user.full_name)
         await send_log(context.bot, "NEW_USER", user)
 
-    if not await check_user_membership(context.bot, user.id, FORCE_SUB_CHANNELS):
+    if not await check_user_membership(context.bot, user.id, conf.FORCE_SUB_CHANNELS):
         buttons = []
-        for cid in FORCE_SUB_CHANNELS:
+        for cid in conf.FORCE_SUB_CHANNELS:
             try:
                 chat = await context.bot.get_chat(cid)
                 link = chat.invite_link or await chat.export_invite_link()
@@ -332,7 +349,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"🎁 Plan: {plan_name}\n"
         f"⏳ Expires: {format_datetime(user_data['expires'])}"
     )
-    await update.message.reply_text(text, reply_markup=get_main_keyboard(user.id in ADMINS))
+    await update.message.reply_text(text, reply_markup=get_main_keyboard(user.id in conf.ADMINS))
 
 async def send_media_handler(update: Update, context: ContextTypes.DEFAULT_TYPE, specific_mid=None):
     if update.callback_query:
@@ -360,7 +377,7 @@ async def send_media_handler(update: Update, context: ContextTypes.DEFAULT_TYPE,
         else: await message.reply_text(msg, reply_markup=markup, parse_mode="HTML")
         return
 
-    cid = CATEGORY_CHANNELS.get(user_data.get("current_category"), DEFAULT_CHANNEL)
+    cid = conf.CATEGORY_CHANNELS.get(user_data.get("current_category"), conf.DEFAULT_CHANNEL)
     
     if specific_mid:
         mid = specific_mid
@@ -384,12 +401,12 @@ async def send_media_handler(update: Update, context: ContextTypes.DEFAULT_TYPE,
         if update.callback_query: await query.answer()
         asyncio.create_task(auto_delete(context, user_id, sent.message_id))
     except Exception as e:
-        logger.error(f"Send failed: {e}")
+        send_logger.error(f"Send failed: {e}")
         if update.callback_query: await query.answer("Media unavailable.", show_alert=True)
 
 async def auto_delete(context, chat_id, mid):
     await asyncio.sleep(600)
-    try: await context.bot.delete_message(chat_id, mid)
+    try: await context.bot.delete_message(chat_id, mid, rate_limit_args=Lane.BACKGROUND)
     except: pass
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -418,7 +435,7 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"📁 Total Media in Bot: {total_media}"
     )
     
-    await query.message.edit_text(text, reply_markup=get_main_keyboard(user.id in ADMINS), parse_mode="HTML")
+    await query.message.edit_text(text, reply_markup=get_main_keyboard(user.id in conf.ADMINS), parse_mode="HTML")
 
 # ================= PLAN & PAYMENT HANDLERS =================
 
@@ -441,7 +458,7 @@ async def plans_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.message.delete()
         await context.bot.send_photo(
             chat_id=query.from_user.id,
-            photo=PLAN_IMG_URL,
+            photo=conf.PLAN_IMG_URL,
             caption=caption,
             reply_markup=get_plans_keyboard(),
             parse_mode="HTML"
@@ -464,7 +481,7 @@ async def handle_payment_selection(update: Update, context: ContextTypes.DEFAULT
         "🧾 <b>Payment Details:</b>\n\n"
         f"Plan: <b>{name}</b>\n"
         f"Amount: <b>{price} Ruppee</b>\n"
-        f"UPI ID: <code>{UPI_ID}</code>\n\n"
+        f"UPI ID: <code>{conf.UPI_ID}</code>\n\n"
         f"🆔 <b>Your User Id:</b> <code>{user_id}</code>\n\n"
         "<i>Scan QR or Pay through UPI ID and send Payment proof.</i>"
     )
@@ -484,7 +501,7 @@ async def proof_receive(update: Update, context: ContextTypes.DEFAULT_TYPE):
     caption = f"Plan Request\nUser ID: `{user.id}`"
     try:
         await context.bot.send_photo(
-            chat_id=LOG_CHANNEL_ID,
+            chat_id=conf.LOG_CHANNEL_ID,
             photo=photo,
             caption=f"#Proof\n\nIᴅ - <code>{user.id}</code>\nNᴀᴍᴇ - {user.full_name}\nPlan Request Received.",
             parse_mode="HTML"
@@ -495,7 +512,7 @@ async def proof_receive(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         "✅ <b>Proof Received!</b>\n\nPlease wait for admin approval.",
         parse_mode="HTML",
-        reply_markup=get_main_keyboard(user.id in ADMINS)
+        reply_markup=get_main_keyboard(user.id in conf.ADMINS)
     )
     return ConversationHandler.END
 
@@ -508,7 +525,7 @@ async def proof_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
-    if query.from_user.id not in ADMINS:
+    if query.from_user.id not in conf.ADMINS:
         await query.answer("❌ Admins Only!", show_alert=True)
         return
     
@@ -520,7 +537,7 @@ async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def admin_premium_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    if query.from_user.id not in ADMINS: return ConversationHandler.END
+    if query.from_user.id not in conf.ADMINS: return ConversationHandler.END
     if query.message.text: await query.message.edit_text("👤 <b>Send User ID</b>:", parse_mode="HTML")
     else: await query.message.reply_text("👤 <b>Send User ID</b>:", parse_mode="HTML")
     return "GET_USER_ID"
@@ -547,7 +564,7 @@ async def admin_premium_get_days(update: Update, context: ContextTypes.DEFAULT_T
 
 async def admin_index_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    if query.from_user.id not in ADMINS: return ConversationHandler.END
+    if query.from_user.id not in conf.ADMINS: return ConversationHandler.END
     await query.message.reply_text("📤 Send Channel Link/ID:", parse_mode="HTML")
     return "GET_CHANNEL"
 
@@ -625,7 +642,7 @@ async def callback_dispatcher(update: Update, context: ContextTypes.DEFAULT_TYPE
     elif data.startswith("set_category_"):
         cat = data.replace("set_category_", "")
         await user_manager.update_user(user_id, {"current_category": cat})
-        await update.callback_query.message.edit_text(f"✅ Category set to: {cat}", reply_markup=get_main_keyboard(user_id in ADMINS))
+        await update.callback_query.message.edit_text(f"✅ Category set to: {cat}", reply_markup=get_main_keyboard(user_id in conf.ADMINS))
         
     elif data == "plans":
         await plans_menu(update, context)
@@ -634,7 +651,7 @@ async def callback_dispatcher(update: Update, context: ContextTypes.DEFAULT_TYPE
         await handle_payment_selection(update, context)
             
     elif data == "plan_referral":
-        link = f"https://t.me/{context.bot.username}?start=ref_{user_id}"
+        link = botmeta.get(context.bot).deep_link(f"ref_{user_id}")
         caption = (
             f"🔗 <b>Referral Program</b>\n\n"
             f"Link: `{link}`\n\n"
@@ -650,7 +667,7 @@ async def callback_dispatcher(update: Update, context: ContextTypes.DEFAULT_TYPE
         await admin_panel(update, context)
         
     elif data == "back_to_menu":
-        await update.callback_query.message.edit_text(f"✨ Welcome!", reply_markup=get_main_keyboard(user_id in ADMINS))
+        await update.callback_query.message.edit_text(f"✨ Welcome!", reply_markup=get_main_keyboard(user_id in conf.ADMINS))
     
     elif data == "back_to_menu_del":
         await update.callback_query.message.delete()
@@ -683,12 +700,15 @@ async def post_init(app: Application):
     await web_start()
     try: 
         await client.admin.command('ping')
-        await app.bot.send_message(LOG_CHANNEL_ID, "🟢 <b>Bot Restarted & Online</b>", parse_mode="HTML")
+        await app.bot.send_message(conf.LOG_CHANNEL_ID, "🟢 <b>Bot Restarted & Online</b>", parse_mode="HTML")
     except Exception as e: logger.error(e)
 
-async def start_bot2():
+async def start_bot2(tenant_id: str = ""):
+    tenant = await tenants.start_as("bot2", tenant_id)
     app = ApplicationBuilder() \
-        .token(os.getenv("BOT2_TOKEN")) \
+        .token(tenant.token or os.getenv("BOT2_TOKEN")) \
+        .rate_limiter(OutboundScheduler(tenant.name, background_chats=[conf.LOG_CHANNEL_ID])) \
+        .request(resources.telegram_request()) \
         .post_init(post_init) \
         .build()
     
@@ -719,8 +739,15 @@ async def start_bot2():
     app.add_handler(CommandHandler("start", start_command))
     app.add_handler(CallbackQueryHandler(callback_dispatcher))
     app.add_handler(MessageHandler(filters.ChatType.CHANNEL, save_media))
+    # Each media tap reads and writes the user's document and sends a video
+    throttle.install(app, tenant.name, [
+        throttle.Rule("browse", 10, 20, callback=r"^(send_media|next|previous)$"),
+    ])
 
     await app.bot.initialize()
     await app.initialize()
+    await botmeta.load(app)
+    metrics.instrument(app, tenant.name)
+    supervisor.attach(tenant.name, app, ping=lambda: client.admin.command("ping"))
     await app.start()
-    await app.updater.start_polling()
+    await webhook.start_updates(tenant.name, app)
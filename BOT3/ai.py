@@ -0,0 +1,148 @@
+"""
+APEX CRICKET - CPU OPPONENT
+Picks come from precomputed mixed-strategy tables (BOT3/ai_tables.py,
+generated by tools/gen_bot3_ai_tables.py) indexed by the game situation.
+On hard, the CPU also models each player's recent picks and exploits them.
+"""
+
+import random
+from enum import IntEnum
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from BOT3 import rules
+from BOT3.match import CPU, Match, State
+
+# Situations beyond these are scaled down onto the tables
+MAX_BALLS = 12
+MAX_NEED = 40
+MAX_WICKETS = 3
+
+NUMBERS = (1, 2, 3, 4, 5, 6)
+MODEL_DECAY = 0.8          # weight kept by older picks each time a player picks again
+MAX_MODELS = 50_000
+EXPLOIT_GAIN = 2.0         # how eagerly hard mode trusts the model once it is confident
+
+
+class Difficulty(IntEnum):
+    EASY = 0     # uniform random, like the old CPU
+    NORMAL = 1   # equilibrium mix for the situation
+    HARD = 2     # equilibrium mix, plus exploiting the player's habits
+
+
+def parse_difficulty(args: Sequence[str]) -> Difficulty:
+    """Difficulty named in command args (e.g. /start T5 hard), or NORMAL"""
+    for arg in args:
+        if arg.upper() in Difficulty.__members__:
+            return Difficulty[arg.upper()]
+    return Difficulty.NORMAL
+
+
+def difficulty_at(value: int) -> Difficulty:
+    return Difficulty(value) if value in Difficulty._value2member_map_ else Difficulty.NORMAL
+
+
+# ================= TABLES =================
+def _cumulative(table: bytes) -> List[Tuple[int, ...]]:
+    """Every 6-byte weight row as cumulative weights, ready for random.choices"""
+    return [tuple(accumulate(table[i:i + 6])) for i in range(0, len(table), 6)]
+
+
+try:
+    from BOT3 import ai_tables
+    _CHASE = _cumulative(ai_tables.CHASE)
+    _FIRST = _cumulative(ai_tables.FIRST_INNINGS)
+except ImportError:  # tables not generated yet, fall back to uniform play
+    _CHASE = _FIRST = None
+
+
+def situation(m: Match) -> Tuple[bool, int]:
+    """(chasing, table index) for the current ball"""
+    balls = rules.balls_left(m)
+    wickets = min(m.max_wickets - m.wickets, MAX_WICKETS)
+    chasing = m.state in (State.INNING2, State.SUPER2)
+    need = m.target - m.score
+    if balls > MAX_BALLS:
+        # Long formats: same required rate over the balls the tables know about
+        need = -(-need * MAX_BALLS // balls)
+        balls = MAX_BALLS
+    if chasing:
+        need = min(max(need, 1), MAX_NEED)
+        return True, ((balls - 1) * MAX_NEED + need - 1) * MAX_WICKETS + wickets - 1
+    return False, (balls - 1) * MAX_WICKETS + wickets - 1
+
+
+def table_pick(m: Match, batting: bool) -> int:
+    if _CHASE is None:
+        return random.choice(NUMBERS)
+    chasing, index = situation(m)
+    rows = _CHASE if chasing else _FIRST
+    return random.choices(NUMBERS, cum_weights=rows[2 * index + (0 if batting else 1)])[0]
+
+
+# ================= PLAYER MODEL =================
+class ChoiceModel:
+    """Decayed Markov counts of a player's picks: previous pick -> next pick"""
+    __slots__ = ("rows", "last")
+
+    def __init__(self):
+        self.rows = [[1.0] * 6 for _ in range(7)]  # row 0 = no previous pick
+        self.last = 0
+
+    def predict(self) -> List[float]:
+        row = self.rows[self.last]
+        total = sum(row)
+        return [c / total for c in row]
+
+    def observe(self, number: int):
+        row = self.rows[self.last]
+        for i in range(6):
+            row[i] *= MODEL_DECAY
+        row[number - 1] += 1.0
+        self.last = number
+
+
+class CpuPlayer:
+    """Chooses the CPU's number for a ball and learns from the human's picks"""
+
+    def __init__(self, max_models: int = MAX_MODELS):
+        self.max_models = max_models
+        self._models: Dict[str, ChoiceModel] = {}
+
+    def model(self, uid: str) -> ChoiceModel:
+        model = self._models.pop(uid, None)
+        if model is None:
+            model = ChoiceModel()
+            if len(self._models) >= self.max_models:
+                del self._models[next(iter(self._models))]  # least recently used
+        self._models[uid] = model
+        return model
+
+    def pick(self, m: Match, opponent: Optional[str] = None) -> int:
+        """The CPU's number for the current ball; must run before the human's pick is observed"""
+        difficulty = Difficulty(m.difficulty)
+        if difficulty == Difficulty.EASY:
+            return random.choice(NUMBERS)
+        batting = m.batsman == CPU
+        if difficulty == Difficulty.HARD and opponent is not None:
+            predicted = self.model(opponent).predict()
+            confidence = max(predicted) - 1 / 6
+            if random.random() < confidence * EXPLOIT_GAIN:
+                if batting:
+                    # Avoid the number the bowler is likely to match, favour big hits
+                    return max(NUMBERS, key=lambda n: (1 - predicted[n - 1]) * n)
+                return max(NUMBERS, key=lambda n: predicted[n - 1])
+        return table_pick(m, batting)
+
+    def observe(self, uid: str, number: int):
+        self.model(uid).observe(number)
+
+
+def win_probability(m: Match) -> Optional[float]:
+    """Chasing side's chance from the tables, None outside a chase"""
+    if _CHASE is None:
+        return None
+    chasing, index = situation(m)
+    if not chasing:
+        return None
+    return ai_tables.WIN_PROBABILITY[index] / 255
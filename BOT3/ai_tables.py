@@ -0,0 +1,423 @@
+"""
+APEX CRICKET - CPU STRATEGY TABLES
+Generated by tools/gen_bot3_ai_tables.py (2000 iterations per situation), do not edit.
+Each situation holds 12 bytes: batsman weights for 1-6, then bowler weights for 1-6.
+"""
+
+MAX_BALLS = 12
+MAX_NEED = 40
+MAX_WICKETS = 3
+
+# index ((balls - 1) * MAX_NEED + need - 1) * MAX_WICKETS + wickets - 1
+CHASE = bytes.fromhex(
+    "2a2a2a2b2b2b2b2b2b2a2a2a2a2a2a2b2b2b2b2b2b2a2a2a2a2a2a2b2b2b2b2b2b2a2a2a013333333333013333333333"
+    "013333333333013333333333013333333333013333333333010140404040010140404040010140404040010140404040"
+    "010140404040010140404040010101555555010101555555010101555555010101555555010101555555010101555555"
+    "010101027f7f010101017f7f010101027f7f010101017f7f010101027f7f010101017f7f01010101a9560101010154ab"
+    "01010101a9560101010154ab01010101a9560101010154ab0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "013434323432013333333333013434323432013333333333312b29292929042336363636010140404040010140404040"
+    "0101404040400101404040402a302b29292901102e40404001014e3b3c3a0101124d504f01014e3b3c3a0101124d504f"
+    "013837312f2f010f1e3a4c4c0101015c51510101013f60600101015c51510101013f6060013838352f2b0107222f4c5b"
+    "01014a483a320101122b556d01014a483a320101122b556d010148413e370101203a4560010148413e370101203a4560"
+    "010148413e370101203a4560010148433b38010102415666010148433b38010102415666010148433b38010102415666"
+    "010101694f480101012a5f76010101694f480101012a5f76010101694f480101012a5f760101016d543f01010113618b"
+    "0101016d543f01010113618b0101016d543f01010113618b010101019867010101016699010101019867010101016699"
+    "0101010198670101010166990101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d013333333333013333333333302b29292929092235353535312a29292929052635353535"
+    "01393131323201063d3d3f3f2e2e2a28282809132b3d3d3d0139323131310117313d3d3d0101443e3e3e01012a474747"
+    "2c2e2e2a262609151e364646013837322f2f0112273d44440102493c3c3c01011f414f4f2d2e2e2c26240817222b4251"
+    "013937332e2e010628384a4f010148423b3a010124394c562d2f2c2a2924051927313c4f010148403d3a0101253e4854"
+    "010148403d3a0101253e485401393532302d01162936434801014d403c3701010e41535d01014d403c3701010e41535d"
+    "013a3632302c010d2638464e010106604f4a010101395c6a010106604f4a010101395c6a010248413c380101233a4d56"
+    "01010166544601010133597301010166544601010133597301014b423c37010117394f600101016b5044010101245f7c"
+    "0101016b5044010101245f7c01014b443b3501010e355368010149483d3101010a315075010149483d3101010a315075"
+    "0101016454460101013656730101016454460101013656730101016454460101013656730101016a5243010101265e7a"
+    "0101016a5243010101265e7a0101016a5243010101265e7a0101016c543f0101010f648c0101016c543f0101010f648c"
+    "0101016c543f0101010f648c01010101976801010101659a01010101976801010101659a01010101976801010101659a"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "312a292929290628343434342e2e2a2828280a122b3d3d3d2e2d292929290c1a2c393939013831323232011c333b3b3b"
+    "2c2d2e2a27270c151e3545452d2d2c2928280a1b2635404001393530313101142b3d41412e2e2d2b26240c182129414f"
+    "2f2d2b292826071a28303f46013b3631302d01082b3a474b2e2e2c2a2a240d1b262e384b282f2c2b2828011b2a363c47"
+    "010147413c3b0101283e4a4f2e2e2b2927270a1b28333b4401393432312f01152b37404801014b3f3c3901011a3f5155"
+    "2e2e2c2a2826061828343e48013a37322f2d010d2839464b01014c4239380101143a525e2c2f2d2a272603152635424a"
+    "010247403d380101263b4b5401014c423a3701010b3d536401393632302d01142534444d01014a413c3801011a3c5059"
+    "01014c433b3401010d39556501393733302c010f2534455101014b423b3601010f3a536301014b433b3501010d3a5266"
+    "013937332f2d010a24384654010144473c3701010239586c010144473c3701010239586c012a3c37322f010121384d58"
+    "01010165524801010132587401010165524801010132587401014a423d3601011a384e5e0101016a5244010101285e79"
+    "0101016a5244010101285e7901014b433b360101103852650101016c52410101011962850101016c5241010101196285"
+    "010147483c340101033556700101026656400101012d537f0101026656400101012d537f0101016753450101012e5879"
+    "0101016754450101012f58780101016754450101012f58780101016b5242010101215f7f0101016b5242010101215f7f"
+    "0101016b5242010101215f7f0101016b553f0101010d63900101016b553f0101010d63900101016b553f0101010d6390"
+    "01010101976801010101639c01010101976801010101639c01010101976801010101639c0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d292929290e1f2e373737"
+    "2c2d2e2a27270c151e3545452d2d2c2928280e1b243340402e2e2c2a27270a1e29353c3c2e2e2d2b26240d182129404f"
+    "2f2d2c2928260e1c262d3d452d2e2c2a2727061d2b333b422f2d2c2a29240e1b262e374b2f2d2c2a28260e1d29313843"
+    "013834323130011c2c373c442f2d2b2928260d1c28323a432e2e2b2a27270a1d2a343a4101393431312f01152b384047"
+    "2f2e2c2928250b1927323d452d2e2c292727051a2a353d44013a3631302f010c2a3c434a2f2e2c2a27260a1725333f47"
+    "2a302d2a29260117283641480101463f3d3b0101283d49502f2d2b2a2825091825313f48013936322f2e01152735434a"
+    "01014a413c3801011f3c4d572e2e2c2a2825071826323e4a013b3633302c010f2836444e01014b413a380101163b525c"
+    "2e2f2d2a2725041726333f4b013a37332f2c01082538485201014b423b3701010d3c52641335322f2d2901152735424d"
+    "010248413c38010123394d56010146463c370101023a596a01393532302e01112535454f01014a413c3801011b3a4e5c"
+    "010103625247010101375a6f013a37342f2c010d2436465301014c423c350101103a5263010105625047010101335874"
+    "013838332f2d01082237485501014a453b3501010736566c0101434a3d350101023456730118423b3733010120374b5c"
+    "01010164534701010134577401010165544601010134577401014a423c3701011a384e5f0101016852450101012b5a79"
+    "0101016852450101012b5a7901014b433b360101123651660101016b524201010120607f0101016b524201010120607f"
+    "01014b463b3301010a35546c0101016c533f0101010f648b0101016c533f0101010f648b010103645246010101345873"
+    "01010169573f01010126538601010169573f0101012653860101016853440101012b5b79010101695442010101285a7d"
+    "010101695442010101285a7d0101016c53400101011b5e850101016c543f0101011b5f850101016c543f0101011b5f85"
+    "01010169573f0101010a629301010169573f0101010a629301010169573f0101010a629301010101986701010101629d"
+    "01010101986701010101629d01010101986701010101629d0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727111e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c2928260f1c262d3c452e2d2b2a2727101f2930393f2e2d2c2a29240e1b262e374b2e2c2b2a2927101e28303742"
+    "2f2d2b2a28270d1f2a32383f2f2d2b2928260d1c28313a432e2d2b2a27270f1e2932393f2d2e2b2a2827091e2b34393f"
+    "2f2e2b2928260c1a27323d442e2d2b2927270c1c28333a422c2f2c2a2727041b2b363c432f2e2b2a27260c1824323e47"
+    "2f2e2b2928260b1a28333c4401383432312f01192a373f472e2e2c2928260c1924303f482f2e2c292825091a27323d46"
+    "01393532312e0115293642492e2e2c2928250b1925303d492e2e2b2a2825061928333f47013b3631302d010d2838464b"
+    "2e2e2c2928260a1926323c472c2f2c2a282602182834404901393731312d0107263a47502f2e2c2a2725091826323e48"
+    "01393532312d01152736424b010248413c380101243a4b562f2e2c2a2825061726333f4a013a3632302d01112637454c"
+    "01014a413d3701011d3b4e592e2f2d2a272405162633404b013a37322f2d010b2537475101014b413b380101143b515f"
+    "2a2f2d2a282601152533434d01383832302d01062339485501014c433a3501010b3a546701393532302d01132634444f"
+    "010248413b39010121384c5a0101135b4c4501010138577001393733302c01102434455201014a423d3701011a394d5f"
+    "010101645249010101345873013937332f2c010b2437475201014b423c35010112395262010101675246010101305b74"
+    "01393833302b01072137495701014a453b340101093755690101016753440101012d59790110443e393401011f374b5e"
+    "01010661514801010135577301010266544401010130567801014a423c3701011a374e60010101665247010101305976"
+    "0101016753450101012e587901014b433b350101143650650101016a5243010101255c7e0101016a5243010101255c7e"
+    "01014b453c3301010c36536a0101016d53400101011860870101016d5340010101186087010145493d34010103345771"
+    "0101016a563e0101010b64900101016a563e0101010b64900101016754440101012f57780101016a573f010101215589"
+    "0101016a573f0101012155890101016a5342010101265b7d0101016a5441010101225b820101016a5441010101225b82"
+    "0101016c543f0101011860870101016c53400101011760890101016c534001010117608901010167593f010101086394"
+    "01010167593f01010108639401010167593f010101086394010101019a6501010101619e010101019a6501010101619e"
+    "010101019a6501010101619e0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a2a"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727121e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c292826101c262d3c452e2d2b2a2728121f2830383f2e2d2c2a29240e1b262e374b2f2c2b2a2927101e28303741"
+    "2e2d2b2a2926111f2931383e2f2d2b2928260d1c28313a432e2d2b2a2728101e2932393f2e2d2b2a2827101f2a32383e"
+    "2f2e2b2928260c1a27323d442f2d2b2927270e1c28323a412e2d2b2a27270d1d2a33393f2f2e2b2a27260c1825313e47"
+    "2f2d2b2928260e1b27323b422e2e2b2a27270b1c29343a412e2e2c2928260c1924303e472f2d2b2928260d1b27313c43"
+    "2d2e2c292727081b29343b432e2e2c2928260c1925303d482f2d2b2928260c1b28313c442d2f2c292727051a29343e45"
+    "2e2e2c2a28250d1a25323b472f2e2c2928250b1b28323b451933302d2c2a011929363f482f2e2b2a27260c1926303e47"
+    "2f2e2c292825081a28333d4601393532312d0115283644482f2e2c2928250b1925323c472e2e2c292825051827344047"
+    "013a36322f2e01102837454b2f2e2c2928250a1926323d472c2f2c2a272603172834404901393632302d010a2639464f"
+    "2f2e2b2a2825091826323e4803393532302c01162735424b01383832302d0105243949552f2e2c2a2825071826323e49"
+    "013a3533302d01132736444c010248413d38010122394c572e2f2d2a2724051726333f4b013a36322f2e010e25364650"
+    "01014a413c3801011c3a4e5a2c302d2b272502152534424d013a37332f2c010a2438475201014b423b37010114395161"
+    "03383532302d01142634434e01383833302c010422384b5601014c443b3401010a39546701393632302d011124344551"
+    "010248413c37010120374c5c010145483d3501010337586d013937342f2c010e2335465201014a423d3601011b384e5f"
+    "010102645347010101345774013938332f2c01092336475601014b433a37010113385163010101675246010101305b75"
+    "01383833302c010620374a5901014b443b3501010b3854680101016853440101012b5c79011a413b373101011f374b5e"
+    "010147483d3301010435566f01010169534301010129597d010149423c3701011b364d60010101645346010101335874"
+    "0101016754440101012c577c01014b433b350101153650650101016853440101012c5a79010101685245010101295a7c"
+    "01014b443b3401010e3654680101016a5243010101215e800101016b5243010101205e81010149473c3301010734566f"
+    "0101016d543e01010114618a0101016d543e01010114618a010104635146010101325776010101675a3e010101086295"
+    "010101675a3e0101010862950101016753450101012d5a780101016b583c0101011d578b0101016b583c0101011d578b"
+    "0101016a5243010101225c810101016b553f0101011d5c860101016b553f0101011d5c860101016c543f01010114608b"
+    "0101016c553e010101135f8d0101016c553e010101135f8d010101655b3e010101076395010101655c3e010101076395"
+    "010101655c3e010101076395010101019b6401010101629d010101019b6401010101629d010101019b6401010101629d"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff0101010101ff"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727121e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c292826101c262d3c452e2d2b2a2728121f282f383f2e2d2c2a29240e1b262e374b2e2c2b2a2927111e28303741"
+    "2e2d2b2a2927111f2831383e2f2d2b2928260d1c28313a432e2d2b2a2728101e2932393f2e2d2b2a2827111f2931383d"
+    "2f2e2b2928260c1a27323d442f2d2b2927270e1c28323a412e2d2b2a2727101e2932383e2f2e2b2a27260c1825313e47"
+    "2f2d2b2928260e1b27313b422e2d2b2a27280f1d283239402e2e2c2928260d1924303e472f2d2b2928270e1b27303c43"
+    "2f2d2b2927280e1c28323a412e2e2c2929260d1924303d482f2d2b2928270e1b27303c432f2d2b2927270c1c28323a42"
+    "2e2e2c2a27250d1a25323b472f2d2b2929260e1c28303b432e2e2b2927270a1b28333b432f2e2c2a27260c1926303d46"
+    "2f2d2b2928260d1b27313c432e2e2c292727071b29343c442f2e2c2b27250c1925313c472f2e2b2928260c1b27313c44"
+    "2d2f2c292727051928343f462e2e2c2928250c1925323c462f2e2c2928260a1a27323d45292f2d2a2927011728353f4a"
+    "2e2e2c2928260c1925323c472f2e2b292825081927323e4601383532312e01162836414b2e2e2c2928260b1926313d47"
+    "2d2e2b2a2727061827343e48013a3633302d01122836434c2f2e2c2928250a1926323d472c2f2c2a272704172734404a"
+    "013a3632302d010d2638474d2f2e2b2a2825091826323e4826302e2b292701162735414c013937332f2c010925384851"
+    "2f2e2c2a2825071826323f4901393533302d01142735444c01373933312c010323394a562e2f2c2a2724051726333f4b"
+    "013a3532302e01102536454f010148413b39010120384c5a2d2f2d2a272503152534414d013a37332f2c010d24364652"
+    "01014a413c3801011b394e5e27302e2a292601152635424e013938342f2c01082338485301014b423c35010114395161"
+    "01393632302d01122534445001383833302c010421384b5701014c443b3401010c39546601393733302c011024344552"
+    "010348423c3601011f374c5d010149463c3401010537566e013938342f2c010d2336465201014a423d3601011b384e5e"
+    "010104625247010101345774013a3833302b01082236485701014b423b37010114375163010101665346010101315a74"
+    "01383933302c01051f364a5a01014b443b3501010d3752690101016953440101012b5b79011c413b373001011f374b5e"
+    "010149463b3501010634566f0101016a5342010101275b7d010149423c3701011b364d61010105635244010101345774"
+    "010101695343010101265a7f01014b433c35010116364f640101016653460101012f587901010168544301010129597d"
+    "01014b443b35010110355267010101695244010101275b7d010101695343010101255c7e01014a463c3401010935546d"
+    "0101016c53400101011c5f840101016c543f0101011c5f840101444a3d350101033256740101016c563d01010110628e"
+    "0101016c563d01010110628e010102665443010101305778010101615e41010101046496010101615e41010101046496"
+    "01010168534401010129597d0101016b583c01010118588f0101016b583c01010118588f0101016b54400101011f5d83"
+    "0101016b553f010101185c8b0101016b553f010101185c8b0101016c553f01010111608e0101016c573d0101010f5f90"
+    "0101016c573d0101010f5f90010101635e3e010101066297010101625f3e010101056297010101625f3e010101056297"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727121e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c292826101c262d3c452e2d2b2a2728121f282f383f2e2d2c2a29240e1b262e374b2e2c2b2a2927111e28303741"
+    "2e2d2b2a2927111f2831383e2f2d2b2928260d1c28313a432e2d2b2a2728101e2932393f2e2d2b2a2827111f2931383d"
+    "2f2e2b2928260c1a27323d442f2d2b2927270e1c28323a412e2d2b2a2727101e2932383e2f2e2b2a27260c1825313e47"
+    "2f2d2b2928260e1b27313b422e2d2b292728101d2832393f2e2e2c2928260d1924303e472f2d2b2928270e1b27303c43"
+    "2f2d2b2927280f1d283139412e2e2c2929260d1924303d482f2d2b2928270e1b27303b432f2d2b2927270f1d28313a41"
+    "2e2e2c2a27250d1a25323b472f2d2b2929270e1c27303b432f2d2b2927270e1c28313a422f2e2c2a27260d1926303d46"
+    "2f2d2b2928260e1b27303b422f2d2b2927270d1c28323a422f2e2b2b27250c1925313d472f2d2b2928270d1b27303c44"
+    "2f2e2b2928260b1b28323b442e2e2c2a28250d1925323c462f2d2b2928270d1a27303d442f2e2c292826091a28323c45"
+    "2e2e2c2928250d1a25323b462f2d2b2928270c1a27303d442e2e2c292727071a28333d462e2e2c2a28250d1a25323b46"
+    "2f2d2b2928260b1a27313d452d2e2c292727051928343e482e2e2c2a28250c1925323c462f2e2b2928260a1a27323d45"
+    "2b2f2c2a29260217283440492e2e2c2928250c1925323c462f2e2b2a2826081927323f4602383532312d01162735424a"
+    "2e2e2c2928260b1926313d472d2e2b2a2826061827343e4901393632312d01132736434c2f2e2c2928250a1926323d47"
+    "2d2f2c2a272604172734404a013a3633302d01102637454d2f2e2b2a2825091826323e482b2f2d2a282601162635434b"
+    "013b37322f2c010b253747512f2e2c2a2825071826323f4902393532302c01152735434c01383732302d010724394755"
+    "2e2f2c2a2724061726333f4b01393532302d01122635444e01363934312c010222394a582d2f2d2a272504152534404c"
+    "013a36332f2d010f24354651010149423c3801011f384c5c2b302d2b282602142533434e013a38332f2b010b24374753"
+    "01014a423c3701011b384d5f03383532302d01132534444f013838332f2c01072237485701014b423c36010115385260"
+    "01393633302c01112434455201373933302c010321384b5801014b433b3601010d395366013937342f2c010f24354652"
+    "010349423d3601011f374c5d010149463c3401010636576c013837332f2d010c2336465401014a423c3701011b374e5e"
+    "01011e584841010101355872013938332f2b01082236485701014b423b37010115375063010101655346010101335973"
+    "01373934302b01041f364a5b01014b443c3401010f3652680101016853450101012d59790120403a362f01011e374c5e"
+    "01014a463b3401010835546e010101695343010101275b7e010149423c3701011b364d610101444a3d34010103345771"
+    "0101016a5343010101235b8101014b433c35010117354f640101026452470101013257760101016a5440010101235b81"
+    "01014b443b350101123552660101016853440101012d5a790101016a5540010101245a8101014a453c3501010b35536c"
+    "0101016a5243010101245d7e0101016b5440010101215d82010148483d330101063356700101016c533f010101186086"
+    "0101016c53400101011760880101056351450101013156780101016b573e0101010c61920101016b573d0101010c6192"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727121e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c292826101c262d3c452e2d2b2a2728121f282f383f2e2d2c2a29240e1b262e374b2e2c2b2a2927111e28303741"
+    "2e2d2b2a2927111f2831383e2f2d2b2928260d1c28313a432e2d2b2a2728101e2932393f2e2d2b2a2827111f2931383d"
+    "2f2e2b2928260c1a27323d442f2d2b2927270e1c28323a412e2d2b2a2727101e2932383e2f2e2b2a27260c1825313e47"
+    "2f2d2b2928260e1b27313b422e2d2b292728101d2832393f2e2e2c2928260d1924303e472f2d2b2928270e1b27303c43"
+    "2f2d2b292728101d283139402e2e2c2929260d1924303d482f2d2b2928270e1b27303b432f2d2b2927270f1d28313a41"
+    "2e2e2c2a27250d1a25323b472f2d2b2929270e1c27303b432f2d2b2927270f1c28313a412f2e2c2a27260d1926303d46"
+    "2f2d2b2928270e1b27303b422f2d2b2927270f1c28313a422f2e2b2b27260c1925313d472f2d2b2928270e1b27303c44"
+    "2f2d2b2928260e1c28313a422e2e2c2a28250d1925323c462f2d2b2928270e1b27303c442f2d2b2928260d1c28313b43"
+    "2e2e2c2a28250d1a25323b462f2d2b2928270d1a27303c442f2e2b2928260c1b28313b432e2e2c2a28250d1a25323b46"
+    "2f2d2b2928270d1a27303c442f2e2b2928250b1b28323c442e2e2c2a27250d1925323b472f2d2b2928270c1a27303d45"
+    "2f2e2c292826091a28323c452e2e2c2a27250d1925323c472f2d2b2928270c1a27313d452f2e2c292726071928333d47"
+    "2e2e2c2a28250c1925323c462f2d2b2928260b1a27313d462e2e2c292925051827343f472e2e2c2928250c1925323c46"
+    "2f2d2b2928260a1927313e462c2f2c2a27260317283440482e2e2c2928260c1925323d462f2e2c2a2726081827333f47"
+    "1c32302d2b2901162735404c2e2e2c2928260b1926313d472e2e2b2a2826061727333e4901393532312c01142735434b"
+    "2f2e2c2928250a1926323d472e2f2c2a272604172733404b013a3632302d01122636454c2f2e2b2a2825091826323e48"
+    "2d2f2d2a272602152634424c013a36322f2e010e243746502f2e2c2a2825071826323f491734312e2c2801152634424d"
+    "013a37332f2c010a243847522e2f2c2a2825061726333f4a01393532302d01132635444d01383833302c010623384856"
+    "2d2f2d2a272504162534404c01393632302d01112535455001353a34302b010221394b592c302d2b272502152534424e"
+    "013a37332f2c010d23354652010249423c3701011f374c5d21322f2c2a2701142535424e013938332f2c010a23374753"
+    "01014a423d3601011b384d5f02393632302d01122434445101393833302b01062237495701014b423b37010115385161"
+    "01393733302c01102434455201363933302d010320374b5a01014b433b3601010e385366013938342f2c010e23354652"
+    "010348413d3601011e374c5d01014a463b3401010837566b013938332f2c010a2236475601014a423c3701011b374e5f"
+    "010146493d34010103355671013939332f2b01072137495801014b433b37010116365063010104645345010101345873"
+    "01373934302b01041f364b5c01014b443c3401011036526701010166524701010130597601253f39352e01011e374c5e"
+    "01014b463c3301010b36536b0101016852450101012b5b79010149423c3701011b364d61010147473c34010105335671"
+    "0101016a5343010101255d7e01014a443c35010118364e630101066351450101013358740101016b5440010101215c81"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727121e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c292826101c262d3c452e2d2b2a2728121f282f383f2e2d2c2a29240e1b262e374b2e2c2b2a2927111e28303741"
+    "2e2d2b2a2927111f2831383e2f2d2b2928260d1c28313a432e2d2b2a2728101e2932393f2e2d2b2a2827111f2931383d"
+    "2f2e2b2928260c1a27323d442f2d2b2927270e1c28323a412e2d2b2a2727101e2932383e2f2e2b2a27260c1825313e47"
+    "2f2d2b2928260e1b27313b422e2d2b292728101d2832393f2e2e2c2928260d1924303e472f2d2b2928270e1b27303c43"
+    "2f2d2b292728101d283139402e2e2c2929260d1924303d482f2d2b2928270e1b27303b432f2d2b2927270f1d28313941"
+    "2e2e2c2a27250d1a25323b472f2d2b2929270e1c27303b432f2d2b2927270f1c28313a412f2e2c2a27260d1926303d46"
+    "2f2d2b2928270e1b27303b422f2d2b2927270f1c28313a422f2e2b2b27260c1925313d472f2d2b2928270e1b27303c44"
+    "2f2d2b2928260f1c27313a422e2e2c2a28250d1925323c462f2d2b2928270e1b27303c442f2d2b2928260f1c27313a42"
+    "2e2e2c2a28250d1a25323b462f2d2b2928270e1a27303c442f2d2b2928260e1c28313a422e2e2c2a28250d1a25323b46"
+    "2e2d2b2928270d1a27303c442f2e2b2928260e1c28313b422e2e2c2a27250d1925323b472e2d2b2928270d1a27303c44"
+    "2f2e2b2928260d1c28313b432f2e2c2a27250d1925323c472e2d2b2928270d1a27303c452f2e2b2928260c1b28313c43"
+    "2e2e2c2a28250d1925323b462e2d2b2928270d1a27303d452f2e2c2928250b1b28323c442e2e2c2a28250d1a25323b46"
+    "2e2e2c2928260c1a26313d452f2e2c292825091a28323d462e2e2c2a28250d1a25323b462f2e2c2928260b1a27313d46"
+    "2f2e2c292825071927333e472e2e2c2928250c1a25323c462f2e2c2928260b1927313e462d2f2c2a2726051828344047"
+    "2e2e2c2928250c1925323c462f2d2b2a2826091926323e472c2f2c2a27260317283440492e2e2c2928260b1926323d47"
+    "2f2e2c2a2726081826323e4829302d2a292601162635424b2e2e2c2928260b1926323d472e2e2c2a2825061726333f49"
+    "02393532302c01152735434b2f2e2c2928250a1926323d472e2f2c2a272504172633404b01393533302d01132636444c"
+    "2f2e2b2a2825091826323e482d2f2d2a272503162634414c013a3632302e01102536464e2f2e2c2a2825081826323e49"
+    "29302d2a292601152634424c013a37332f2c010c243646522e2e2c2a2825061726333f4a02393532302d01142635434d"
+    "013938332f2c0109243848532e2f2d2a272504162534404c01393532302d01122535444f01383833302b010522384a57"
+    "2c2f2d2b272503152534414d013a36332f2d010f2435465201333b35302c010121384b5a29302d2a282601142533434f"
+    "013a37342f2c010d24364652010249423c3601011e374c5d03383632302d011324344450013938332f2d010923374755"
+    "01014a423d3601011b384e5e01393633302c01112434455201393833302b01062237495701014b423b37010116385161"
+    "013937332f2b01102334465201353934302d010220384a5b01014b433b3601010f375266013938342f2c010d23364653"
+    "010348423d3501011e374c5d01014b453a3501010a36546b013a38332f2b010a2236475701014a423c3701011b374e5f"
+    "010148473d3401010436566e013938342f2b01072137495801014a433b37010117364f63010107625244010101345774"
+    "2a2a2a2b2b2b2b2b2b2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2b2b2a2a2a2a2c2c2a2a2a2a2c2a2a2a2a2a1b2e2e2e2e2e"
+    "2c2a2a2a2a2a1c2d2d2d2d2d2c2a2a2a2a2a1d2d2d2d2d2d302b292929290922353535352f2a2a2a2a2a0e2533333333"
+    "2f2a2a2a2a2a1226323232322e2e2a2828280a122b3d3d3d2e2d292929290f1a2d3939392e2d29292929121e2e363636"
+    "2c2d2e2a27270c151e3545452d2d2c2928280f1b24333f3f2d2d2c2a2727121e28333a3a2e2e2d2b26240d182129404f"
+    "2f2d2c292826101c262d3c452e2d2b2a2728121f282f383f2e2d2c2a29240e1b262e374b2e2c2b2a2927111e28303741"
+    "2e2d2b2a2927111f2831383e2f2d2b2928260d1c28313a432e2d2b2a2728101e2932393f2e2d2b2a2827111f2931383d"
+    "2f2e2b2928260c1a27323d442f2d2b2927270e1c28323a412e2d2b2a2727101e2932383e2f2e2b2a27260c1825313e47"
+    "2f2d2b2928260e1b27313b422e2d2b292728101d2832393f2e2e2c2928260d1924303e472f2d2b2928270e1b27303c43"
+    "2f2d2b292728101d283139402e2e2c2929260d1924303d482f2d2b2928270e1b27303b432f2d2b2927270f1d28313941"
+    "2e2e2c2a27250d1a25323b472f2d2b2929270e1c27303b432f2d2b2927270f1c28313a412f2e2c2a27260d1926303d46"
+    "2f2d2b2928270e1b27303b422f2d2b2927270f1c28313a412f2e2b2b27260c1925313d472f2d2b2928270e1b27303c44"
+    "2f2d2b2928260f1c27313a422e2e2c2a28250d1925323c462f2d2b2928270e1b27303c442f2d2b2928260f1c27313a42"
+    "2e2e2c2a28250d1a25323b462f2d2b2928270e1a27303c442f2e2c2928260f1c27313a422e2e2c2a28250d1a25323b46"
+    "2e2d2b2928270e1a27303c442f2d2b2928260f1c28313a422e2e2c2a27250d1925323b472e2d2b2928270d1a27303c44"
+    "2f2d2b2928260e1c28313b422f2e2c2a27250d1925323c472e2d2b2928270d1a26303c442f2d2b2928260e1c28313b42"
+    "2e2e2c2a27250d1925323b462e2e2c2928270d1a26303c452f2d2b2928260d1c28313b422e2e2c2a28250d1925323b46"
+    "2e2e2c2928260d1a26303c452f2d2b2928260d1b28313c432e2e2c2a28250d1a25323b462e2e2c2928260d1a26303d45"
+    "2f2d2b2928260c1b28313c432e2e2c2a28250d1925323b462e2e2c2928260c1a26303d452f2e2c2928250b1b28323c44"
+    "2e2e2c2a28250d1925323b462e2e2c2928260c1a26313d452f2e2c292825091a27323d452e2e2c2a28250d1925323c46"
+    "2f2e2c2928260b1926313d462f2e2b2a2825071927333e462e2e2c2928250c1a25323c462f2e2b2928260a1926313e47"
+    "2d2e2c2a2726061828343e472e2e2c2928250c1925323c462f2e2b2a2726091826323e482c2f2c2a2727041727343f49"
+    "2e2e2c2928260b1926323d472f2e2c2a2725081826323e482b2f2d2a282602162734424a2e2e2c2928260b1926323d47"
+    "2e2e2c2a2825061726333f49093734312f2b01152735424c2f2e2c2928250a1926323d472e2e2c2a2725051726333f4b"
+    "01393532302d01142735434c2f2e2b2a2825091826323e482e2f2d2a272503162633404c013a3532302d01122636454d"
+    "2f2e2c2a2825081826323e492b302c2a272602152534434d013a36332f2d010e243646512e2e2c2a2825061726333f4a"
+    "0e3633302e2a01152635424d013a37332f2b010b243747522e2f2c2a282505162633404b01393532302d01132635444e"
+    "013838332f2c0108233848542d2f2d2b272503152534414d01393632302d01112434455101383833302c010421384b57"
+    "2b302d2b272502142533434e013a37342f2c010e2435465201323b36302c010120384b5b1b33302d2b2901142535434f"
+    "013937332f2c010c24374653010249423d3601011e374c5d02393632302c011224334451013938332f2c010822374857"
+    "01014a423d3601011b384e5e01393733302c01112434455201383833302c010520374a5901014b423b37010116375061"
+)
+
+# batting side's win probability * 255, same index as CHASE
+WIN_PROBABILITY = bytes.fromhex(
+    "eaeaeaccccccbfbfbfaaaaaa808080555555000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000eafbfbd1f5f5c9efefbfe5e5b4cfcfa5b8b89494947e7e7e"
+    "6969694e4e4e333333000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "eafbfed1f7fdcaf4fbc2f0f8b8ebf0aee3e7a2d9d996caca8cb8b87fa2a27285856365655353534242423030301f1f1f"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000eafbfed1f7fecaf4fdc2f1fbb9eefaafe9f7a5e3f39bdcec"
+    "93d5e38acbd780c1c777b3b46da1a1638e8e5978784d5e5e4144443636362a2a2a1d1d1d131313000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+    "eafbfed1f7fecaf4fdc2f1fcb9eefbb0eaf9a5e5f79ce0f594dbf18cd5ed85cee77dc6df75bed46db3c665a9b55e9ba2"
+    "568c8d4d7c7c456a6a3c56563441412b2e2e2223231a1a1a1212120b0b0b000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f6"
+    "95dcf48dd7f186d2ee7eccea77c5e571bfdf6ab7d863afcf5da6c3569cb55092a54a869343797f3c6a6c365c5d2f4d4d"
+    "293c3c222c2c1c1e1e1616161010100b0b0b070707000000000000000000000000000000000000000000000000000000"
+    "eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f795dcf58dd8f386d3f07fceee78c8ea72c3e76cbde266b6dd"
+    "60b0d75aa9d055a1c84f99be4a90b24487a43f7d963a73863467742f5b622a4f512543442036361b2929161d1d121414"
+    "0e0e0e0a0a0a070707040404000000000000000000000000eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f7"
+    "95dcf58dd8f386d3f17fceef78c9ec72c4e96cbfe666b9e261b3de5cadd957a7d452a1ce4d9ac74893bf438cb73f84ad"
+    "3a7ca1367395326b872d6279295869254d592143491d3a3c193030152626121c1c0f14140c0d0d090909060606040404"
+    "eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f795dcf58dd8f386d3f17fceef78c9ed72c4ea6cbfe766bae4"
+    "61b5e15cafdd57aad952a4d44e9fcf4a99ca4593c4418cbe3d86b6397fae3679a632719c2e6a912b6285275b7824536c"
+    "204a5f1d42511a394317313614292b1122220e1a1a0c1313eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f7"
+    "95dcf58dd8f386d3f17fceef78c9ed72c4ea6cbfe766bae561b5e25cb0de57abdb53a6d74ea1d34a9bcf4696ca4290c5"
+    "3f8bc03b85ba387fb43479ad3173a52e6d9d2b679528608c255a822253761f4c6b1c4560193e5417374914303d122931"
+    "eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f795dcf58dd8f386d3f17fceef78c9ed72c4ea6cbfe866bae5"
+    "61b5e25cb0df57abdc53a6d84ea1d54a9cd14697cd4392c93f8dc43c88bf3983ba357eb53278af2f73a92d6ea32a689c"
+    "276394245d8d2257851f527c1d4c731b466918405f163a54eafbfed1f7fecaf4fdc2f1fcb9eefbb0eafaa5e5f89ce1f7"
+    "95dcf58dd8f386d3f17fceef78c9ed72c4ea6cbfe866bae561b5e25cb0df57abdc53a6d94ea1d54a9cd24798ce4393ca"
+    "3f8ec63c89c23985be3680b9337bb43076af2e72aa2b6da528689f266399245e9221598c1f54841d4f7d1b4a7619456e"
+)
+
+# index (balls - 1) * MAX_WICKETS + wickets - 1
+FIRST_INNINGS = bytes.fromhex(
+    "0101016753450101012e58790101016753450101012e58790101016753450101012e587901014b433c35010116354f64"
+    "0101016753450101012e58790101016753450101012e587901363934302c010320374a5b010106625244010101345774"
+    "0101016753450101012e5879013837332f2d010c2336465401014b443c3401010d365369010101655247010101315876"
+    "01393633302d01102434455201014b433c35010115354f6501010563524401010134587403383532302d01142635434e"
+    "010149423b3701011b374e5f010148463c3501010535566f2d302d2a272502152534414d01343a35302d010220384a5b"
+    "01014b443c3401010d3653692f2f2c2a2724051726333f4b013938332f2b01072237485701014b443c34010113365165"
+    "2f2e2c2a2825071726323f49013837332f2d010c2336465401014a433c36010118354f632f2e2b2a2825081826333e48"
+    "013937342f2c010f24354652010149423b3701011b374e5f2f2e2c292825091826323d4701393632302d011124344551"
+    "0111443e393301011f384b5e2f2e2b2a27260a1825323e4802393532302d01132635434e01373833302c010420364a5a"
+)
+
+# expected first-innings runs, same index as FIRST_INNINGS
+EXPECTED_RUNS = [3.24, 3.24, 3.24, 5.68, 6.49, 6.49, 7.58, 9.48, 9.73, 9.12, 12.23, 12.89, 10.37, 14.7, 15.92, 11.39, 16.88, 18.82, 12.24, 18.81, 21.56, 12.96, 20.54, 24.12, 13.57, 22.09, 26.48, 14.08, 23.45, 28.65, 14.51, 24.66, 30.63, 14.87, 25.71, 32.47]
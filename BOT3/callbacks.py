@@ -0,0 +1,64 @@
+"""
+APEX CRICKET - CALLBACK DATA
+Buttons carry 6 packed bytes (action, match id, ball sequence) as 8 base64 chars
+"""
+
+import base64
+import binascii
+import struct
+from enum import IntEnum
+from typing import Optional, Tuple
+
+
+class Action(IntEnum):
+    MODE_CPU = 1
+    MODE_DUEL = 2
+    JOIN = 3
+    HEADS = 4
+    TAILS = 5
+    BAT = 6
+    BOWL = 7
+    SURRENDER = 8
+    T_JOIN = 9       # tournament buttons carry the tournament id in place of a match id
+    T_START = 10
+    N1 = 11
+    N2 = 12
+    N3 = 13
+    N4 = 14
+    N5 = 15
+    N6 = 16
+    T_CANCEL = 17
+
+
+NUMBERS = (Action.N1, Action.N2, Action.N3, Action.N4, Action.N5, Action.N6)
+MODES = (Action.MODE_CPU, Action.MODE_DUEL)
+TOURNAMENT = (Action.T_JOIN, Action.T_START, Action.T_CANCEL)
+TOKEN_LENGTH = 8
+
+# action byte -> Action, precompiled so decoding never branches on strings
+_ACTIONS = [None] * 256
+for _action in Action:
+    _ACTIONS[_action] = _action
+
+# ">B3sH": action, 3-byte match id (6 hex chars), 16-bit ball sequence
+_PACK = struct.Struct(">B3sH")
+
+
+def encode(action: Action, match_id: str, seq: int) -> str:
+    """Callback data for one button"""
+    raw = _PACK.pack(action, bytes.fromhex(match_id), seq & 0xFFFF)
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode(data: str) -> Optional[Tuple[Action, str, int]]:
+    """(action, match id, seq), or None for foreign or malformed data"""
+    if len(data) != TOKEN_LENGTH:
+        return None
+    try:
+        action, match_id, seq = _PACK.unpack(base64.urlsafe_b64decode(data))
+    except (binascii.Error, ValueError, struct.error):
+        return None
+    action = _ACTIONS[action]
+    if action is None:
+        return None
+    return action, match_id.hex().upper(), seq
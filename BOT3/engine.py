@@ -0,0 +1,66 @@
+"""
+APEX CRICKET - GAME ENGINE
+Telegram-free match flow: picks go in, ball results come out.
+main.py only renders what the engine returns, so the whole game can be
+driven by tools and simulators without a bot.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Optional
+
+from BOT3 import rules
+from BOT3.match import Match
+from BOT3.rules import Result
+
+
+class Pick(IntEnum):
+    REJECTED = 0   # not this player's turn, or already picked for this ball
+    WAITING = 1    # recorded, the other side still has to pick
+    READY = 2      # both numbers are in, the ball can be bowled
+
+
+@dataclass(slots=True)
+class Ball:
+    bat: int
+    bowl: int
+    batsman: str
+    bowler: str
+    wicket: bool
+    result: Result
+    winner: Optional[str] = None       # set once the match is decided (None on a tie)
+    powerplay: Optional[int] = None    # powerplay runs of an innings that just ended
+
+    @property
+    def finished(self) -> bool:
+        return self.result in (Result.CHASED, Result.DEFENDED, Result.TIED)
+
+
+def submit(m: Match, uid: str, number: int) -> Pick:
+    if not m.choose(uid, number):
+        return Pick.REJECTED
+    return Pick.READY if m.ready else Pick.WAITING
+
+
+def play_ball(m: Match, bat: int, bowl: int) -> Ball:
+    """Bowl one delivery and move the match on (next innings, super over or result)"""
+    ball = Ball(bat, bowl, m.batsman, m.bowler, rules.record_ball(m, bat, bowl), rules.outcome(m))
+    if ball.result == Result.CHASED:
+        ball.winner = m.batsman
+    elif ball.result == Result.DEFENDED:
+        ball.winner = m.bowler
+    elif ball.result == Result.INNINGS_OVER:
+        if rules.spec_of(m).powerplay_overs:
+            ball.powerplay = rules.powerplay_runs(m)
+        m.start_second_innings()
+    elif ball.result == Result.SUPER_OVER:
+        rules.start_super_over(m)
+    return ball
+
+
+def play_match(m: Match, pick: Callable[[Match, str], int]) -> Optional[str]:
+    """Play an already started match to the end, asking pick(m, uid) for every number"""
+    while True:
+        ball = play_ball(m, pick(m, m.batsman), pick(m, m.bowler))
+        if ball.finished:
+            return ball.winner
@@ -6,14 +6,48 @@ import random
 
 import asyncio
 
-import uuid
+import functools
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import logging
+
+from telegram import ChatMember, Update, InlineKeyboardButton, InlineKeyboardMarkup
 
 from telegram.ext import ApplicationBuilder, CommandHandler, CallbackQueryHandler, ContextTypes
 
 from telegram.constants import ParseMode
 
+from telegram.error import TelegramError
+
+
+
+from shared import botmeta, metrics, resources, throttle, webhook
+
+from shared.outbound import Lane, OutboundScheduler
+
+from shared.supervisor import supervisor
+
+from BOT3 import ai, callbacks, engine, rules
+
+from BOT3.stats import GLOBAL, StatsBook, open_stats_store
+
+from BOT3.callbacks import Action
+
+from BOT3.match import CPU, Match, MatchStore, Mode, open_snapshot
+
+from BOT3.render import Renderer
+
+from BOT3.engine import Pick
+
+from BOT3.rules import Result
+
+from BOT3.tournament import Kind, Phase, TournamentManager, MIN_PLAYERS, REGISTRATION_TTL
+
+
+
+logger = logging.getLogger(__name__)
+
+
+
 # ================= CONFIGURATION =================
 
 BOT3_TOKEN = os.getenv("BOT3_TOKEN", "YOUR_BOT3_TOKEN_HERE")
@@ -24,11 +58,31 @@ STADIUM_EMOJI = "🏟️"
 
 FOOTER = "\n\n───\n🌟 **Powered by [𝐒𝐇𝐈𝐕𝐀 𝐂𝐇𝐀𝐔𝐃𝐇𝐀𝐑𝐘](https://t.me/theprofessorreport_bot)**"
 
-STATS_FILE = "stats.json"
+STATS_FILE = os.getenv("BOT3_STATS_LOG", "stats.jsonl")  # append-only event log of finished matches
+
+STATS_DB = os.getenv("BOT3_STATS_DB", "stats.db")  # SQLite path or mongodb:// URI the log is compacted into
+
+SNAPSHOT_TARGET = os.getenv("BOT3_SNAPSHOT", "")  # SQLite path or mongodb:// URI, empty = off
+
+BALL_SUSPENSE = 1.2  # seconds the ball stays "in the air"
+
+CONCURRENT_UPDATES = 256
+
+
+
+matches = MatchStore(snapshot=open_snapshot(SNAPSHOT_TARGET))
+
+renderer = Renderer(DIVIDER, FOOTER)
 
+matches.on_remove.append(renderer.forget)
 
+stats = StatsBook(STATS_FILE, open_stats_store(STATS_DB))
 
-matches_cache = {}
+cpu = ai.CpuPlayer()
+
+tournaments = TournamentManager(snapshot=matches.snapshot)
+
+matches.on_remove.append(tournaments.match_removed)
 
 
 
@@ -56,17 +110,15 @@ def get_commentary(runs, is_wicket):
 
 
 
-def get_num_kb(cid):
+def button(text, action, m):
 
-    return InlineKeyboardMarkup([
+    return InlineKeyboardButton(text, callback_data=callbacks.encode(action, m.match_id, m.seq))
 
-        [InlineKeyboardButton("1️⃣", callback_data=f"n1_{cid}"), InlineKeyboardButton("2️⃣", callback_data=f"n2_{cid}"), InlineKeyboardButton("3️⃣", callback_data=f"n3_{cid}")],
 
-        [InlineKeyboardButton("4️⃣", callback_data=f"n4_{cid}"), InlineKeyboardButton("5️⃣", callback_data=f"n5_{cid}"), InlineKeyboardButton("6️⃣", callback_data=f"n6_{cid}")],
 
-        [InlineKeyboardButton("🏳️ SURRENDER", callback_data=f"surrender_{cid}")]
+def get_toss_kb(m):
 
-    ])
+    return InlineKeyboardMarkup([[button("🌕 HEADS", Action.HEADS, m), button("🌑 TAILS", Action.TAILS, m)]])
 
 
 
@@ -76,17 +128,31 @@ def get_num_kb(cid):
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
+    spec = rules.parse_format(context.args)
+
+    difficulty = ai.parse_difficulty(context.args)
+
     intro = (f"{STADIUM_EMOJI} **APEX CRICKET WORLD**\n{DIVIDER}\n\n"
 
              f"Welcome to the most realistic Hand-Cricket bot!\n\n"
 
-             f"🏆 **Format:** 1 Over | 2 Wickets Max")
+             f"🏆 **Format:** {spec.label}\n"
+
+             f"🤖 **CPU Level:** {difficulty.name}")
+
+    # Every /start offers a fresh match id, so one chat can host several matches
+
+    match_id = matches.new_id()
+
+    # Mode buttons carry the setup (format index, CPU level) where later buttons carry the ball sequence
+
+    setup = rules.FORMAT_LIST.index(spec) | difficulty << 8
 
     kb = InlineKeyboardMarkup([
 
-        [InlineKeyboardButton("🤖 VS CPU", callback_data=f"mode_cpu_{update.effective_chat.id}"),
+        [InlineKeyboardButton("🤖 VS CPU", callback_data=callbacks.encode(Action.MODE_CPU, match_id, setup)),
 
-         InlineKeyboardButton("👥 VS FRIEND", callback_data=f"mode_duel_{update.effective_chat.id}")]
+         InlineKeyboardButton("👥 VS FRIEND", callback_data=callbacks.encode(Action.MODE_DUEL, match_id, setup))]
 
     ])
 
@@ -110,316 +176,730 @@ async def cancel_match(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     
 
-    if chat_id in matches_cache and matches_cache[chat_id].get("match_id") == m_id:
+    if tournaments.is_tournament_match(m_id):
+
+        await update.message.reply_text("🏆 Tournament matches can't be cancelled. Use 🏳️ SURRENDER to concede.")
+
+        return
+
+    
+
+    async with matches.lock(m_id):
+
+        m = matches.get(m_id)
+
+        if m and m.chat_id == chat_id:
+
+            matches.pop(m_id)
+
+            await update.message.reply_text(f"🛑 **Match `{m_id}` has been cancelled successfully!**\nYou can now start a new one.")
+
+        else:
+
+            await update.message.reply_text("⚠️ **Invalid Match ID!** No active match found with this ID in this group.")
+
+
+
+async def leaderboard_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    chat = update.effective_chat
+
+    scope = GLOBAL if chat.type == "private" else str(chat.id)
+
+    board = stats.leaderboard(scope)
+
+    if not board:
+
+        await update.message.reply_text("📭 No finished matches yet. Be the first: /start")
+
+        return
+
+    
+
+    title = "🌍 GLOBAL LEADERBOARD" if scope == GLOBAL else "🏟️ GROUP LEADERBOARD"
+
+    medals = ["🥇", "🥈", "🥉"]
+
+    lines = [f"{medals[i] if i < 3 else f'{i + 1}.'} **{s.name}** - {s.wins} W | {s.runs} runs | SR {s.strike_rate:.0f}"
+
+             for i, (_, s) in enumerate(board)]
+
+    await update.message.reply_text(f"🏆 **{title}**\n{DIVIDER}\n" + "\n".join(lines) + FOOTER, parse_mode=ParseMode.MARKDOWN)
+
+
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    uid = str(update.effective_user.id)
+
+    chat = update.effective_chat
+
+    scopes = [("🌍 CAREER", GLOBAL)]
+
+    if chat.type != "private": scopes.append(("🏟️ THIS GROUP", str(chat.id)))
+
+    
+
+    text = f"📊 **PLAYER STATS** - {update.effective_user.first_name}\n{DIVIDER}\n"
+
+    for label, scope in scopes:
+
+        s = stats.get(scope, uid)
+
+        if not s:
+
+            text += f"\n**{label}:** no matches yet\n"
+
+            continue
+
+        text += (f"\n**{label}**\n"
+
+                 f"🏏 Matches: {s.matches} | Wins: {s.wins}\n"
+
+                 f"📈 Runs: {s.runs} off {s.balls} (SR {s.strike_rate:.1f})\n"
+
+                 f"🎯 Wickets: {s.wickets}\n")
+
+    await update.message.reply_text(text + FOOTER, parse_mode=ParseMode.MARKDOWN)
+
+
+
+# ================= TOURNAMENTS =================
+
+
+
+def tournament_kb(t):
+
+    return InlineKeyboardMarkup([[
+
+        InlineKeyboardButton("✋ JOIN", callback_data=callbacks.encode(Action.T_JOIN, t.tournament_id, 0)),
+
+        InlineKeyboardButton("🚀 START", callback_data=callbacks.encode(Action.T_START, t.tournament_id, 0)),
+
+        InlineKeyboardButton("🛑 CANCEL", callback_data=callbacks.encode(Action.T_CANCEL, t.tournament_id, 0)),
+
+    ]])
+
+
+
+def registration_text(t):
+
+    kind = "KNOCKOUT" if t.kind == Kind.KNOCKOUT else "LEAGUE"
+
+    players = "\n".join(f"{i + 1}. {t.name(uid)}" for i, uid in enumerate(t.players))
+
+    return (f"🏆 **APEX {kind} `{t.tournament_id}`** | {t.format_name}\n{DIVIDER}\n"
+
+            f"👥 **Players ({len(t.players)}):**\n{players}\n\n"
+
+            f"Tap JOIN to enter. {t.name(t.creator)} starts it when ready; "
+
+            f"it's called off after {REGISTRATION_TTL // 60} minutes without a new player.")
+
+
+
+def bracket_text(t):
 
-        del matches_cache[chat_id]
+    text = f"🏆 **TOURNAMENT `{t.tournament_id}`**\n{DIVIDER}\n"
 
-        await update.message.reply_text(f"🛑 **Match `{m_id}` has been cancelled successfully!**\nYou can now start a new one.")
+    if t.kind == Kind.LEAGUE:
+
+        text += "\n".join(f"{i + 1}. {t.name(uid)} - **{pts}** pts" for i, (uid, pts) in enumerate(t.standings()))
+
+        text += f"\n\n📅 **Round {t.round + 1}:**\n"
+
+        fixtures = t.round_fixtures(t.round)
 
     else:
 
-        await update.message.reply_text("⚠️ **Invalid Match ID!** No active match found with this ID in this group.")
+        fixtures = [f for f in t.fixtures if f.round <= t.round]
 
+    for f in fixtures:
 
+        result = f" ➜ **{t.name(f.winner)}**" if f.winner else " (tie)" if f.done else " ⏳"
 
-# ================= CORE ENGINE =================
+        away = t.name(f.away) if f.away or f.round else "BYE"
 
+        text += f"R{f.round + 1}: {t.name(f.home)} vs {away}{result}\n"
 
+    return text
 
-async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
-    query = update.callback_query
+
+async def can_cancel(bot, t, user_id):
+
+    """The organiser or a group admin"""
+
+    if str(user_id) == t.creator:
+
+        return True
+
+    try:
+
+        member = await bot.get_chat_member(t.chat_id, user_id)
+
+    except TelegramError:
+
+        return False
+
+    return member.status in (ChatMember.ADMINISTRATOR, ChatMember.OWNER)
+
+async def tournament_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    chat = update.effective_chat
+
+    if chat.type == "private":
+
+        await update.message.reply_text("🏆 Tournaments run in groups. Add me to one and send /tournament there!")
+
+        return
+
+    
 
     user = update.effective_user
 
-    uid, data = str(user.id), query.data.split('_')
+    uid, chat_id = str(user.id), str(chat.id)
 
-    action, chat_id = data[0], data[-1]
+    t = tournaments.in_chat(chat_id)
 
+    if context.args and context.args[0].lower() == "cancel":
 
+        if t is None:
 
-    m = matches_cache.get(chat_id)
+            await update.message.reply_text("⚠️ There's no tournament running in this group.")
 
+        elif not await can_cancel(context.bot, t, user.id):
 
+            await update.message.reply_text("🚫 Only the organiser or a group admin can cancel the tournament.")
 
-    # Spectator Guard
+        else:
 
-    if action.startswith('n') or action in ["tb", "tw", "th", "tt", "surrender"]:
+            async with tournaments.lock(t.tournament_id):
 
-        if m and uid not in m["players"]:
+                tournaments.cancel(t)
 
-            await query.answer("🚫 OOPS! You are just a Spectator. You can't play this match!", show_alert=True)
+            await update.message.reply_text(f"🛑 **Tournament `{t.tournament_id}` has been cancelled.**", parse_mode=ParseMode.MARKDOWN)
+
+        return
+
+    if t is None:
+
+        kind = Kind.LEAGUE if any(arg.lower() == "league" for arg in context.args) else Kind.KNOCKOUT
+
+        t = tournaments.create(chat_id, uid, user.first_name, kind, rules.parse_format(context.args).name)
+
+    elif t.phase != Phase.REGISTERING:
+
+        await update.message.reply_text(bracket_text(t) + FOOTER, parse_mode=ParseMode.MARKDOWN)
+
+        return
+
+    else:
+
+        tournaments.join(t, uid, user.first_name)
+
+    await update.message.reply_text(registration_text(t) + FOOTER, reply_markup=tournament_kb(t), parse_mode=ParseMode.MARKDOWN)
+
+
+
+async def on_tournament_button(query, update, action, tournament_id):
+
+    uid = str(update.effective_user.id)
+
+    async with tournaments.lock(tournament_id):
+
+        t = tournaments.get(tournament_id)
+
+        if t is None or t.phase != Phase.REGISTERING:
+
+            await query.answer("⌛ Registration for this tournament is closed.", show_alert=False)
 
             return
 
+        
 
+        if action == Action.T_JOIN:
 
-    # Initial Mode Setup
+            if not tournaments.join(t, uid, update.effective_user.first_name):
 
-    if action == "mode":
+                await query.answer("You're already in (or it's full)!", show_alert=False)
 
-        match_id = str(uuid.uuid4())[:6].upper()
+                return
 
-        matches_cache[chat_id] = {
+            await query.edit_message_text(registration_text(t) + FOOTER, reply_markup=tournament_kb(t), parse_mode=ParseMode.MARKDOWN)
 
-            "match_id": match_id, "players": [uid] if data[1]=="duel" else [uid, "cpu"],
+            return
+
+        
+
+        if action == Action.T_CANCEL:
+
+            if not await can_cancel(query.get_bot(), t, update.effective_user.id):
 
-            "names": {uid: user.first_name, "cpu": "APEX AI 🤖"},
+                await query.answer("🚫 Only the organiser or a group admin can cancel the tournament.", show_alert=True)
 
-            "score": 0, "wickets": 0, "overs": 0, "balls": 0, "choices": {},
+                return
 
-            "state": "toss", "cpu_mode": data[1]=="cpu", "total_overs": 1, "max_wickets": 2, "history": []
+            tournaments.cancel(t)
 
-        }
+            await query.edit_message_text(f"🛑 **Tournament `{t.tournament_id}` has been cancelled.**" + FOOTER, parse_mode=ParseMode.MARKDOWN)
+
+            return
 
         
 
-        txt = f"{STADIUM_EMOJI} **MATCH ID: `{match_id}`**\n{DIVIDER}\n"
+        if uid != t.creator:
 
-        if data[1] == "cpu":
+            await query.answer("🚫 Only the organiser can start the tournament.", show_alert=True)
 
-            m = matches_cache[chat_id]
+            return
 
-            m["toss_caller"] = uid
+        if len(t.players) < MIN_PLAYERS:
 
-            await query.edit_message_text(f"{txt}🪙 **TOSS TIME**\n\n{user.first_name}, call Heads or Tails:", 
+            await query.answer(f"Need at least {MIN_PLAYERS} players!", show_alert=True)
 
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🌕 HEADS", callback_data=f"th_{chat_id}"), InlineKeyboardButton("🌑 TAILS", callback_data=f"tt_{chat_id}")]]) , parse_mode=ParseMode.MARKDOWN)
+            return
 
-        else:
+        tournaments.start(t)
 
-            await query.edit_message_text(f"{txt}👥 **WAITING FOR OPPONENT...**\n\nAsk your friend to join the battle!", 
+        await query.edit_message_text(bracket_text(t) + FOOTER, parse_mode=ParseMode.MARKDOWN)
 
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏏 JOIN MATCH", callback_data=f"j_{chat_id}")]]) , parse_mode=ParseMode.MARKDOWN)
 
-        return
 
+async def launch_fixture(bot, t, f):
 
+    """Post a tournament fixture as a normal duel, straight to the toss"""
 
-    if not m: return
+    spec = rules.FORMATS[t.format_name]
 
+    m = Match(matches.new_id(), t.chat_id, players=[f.home, f.away], names=[t.name(f.home), t.name(f.away)],
 
+              mode=Mode.DUEL, format_name=spec.name, total_overs=spec.overs, max_wickets=spec.wickets)
 
-    # Join logic
+    m.toss_caller = random.choice(m.players)
 
-    if action == "j" and uid not in m["players"]:
+    m.advance()
 
-        m["players"].append(uid)
+    matches.put(m)
 
-        m["names"][uid] = user.first_name
+    try:
 
-        m["toss_caller"] = random.choice(m["players"])
+        # Fixtures are background traffic; the scheduler keeps them within the group's limit
 
-        await query.edit_message_text(f"🪙 **TOSS CALL**\n\nHey {m['names'][m['toss_caller']]}, it's your turn to call!", 
+        await bot.send_message(t.chat_id, f"🏆 **TOURNAMENT `{t.tournament_id}`** | Round {f.round + 1}\n{DIVIDER}\n"
 
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🌕 HEADS", callback_data=f"th_{chat_id}"), InlineKeyboardButton("🌑 TAILS", callback_data=f"tt_{chat_id}")]]) , parse_mode=ParseMode.MARKDOWN)
+                               f"⚔️ **{m.names[0]}** vs **{m.names[1]}** | ID: `{m.match_id}`\n\n"
 
-        return
+                               f"🪙 {m.name(m.toss_caller)}, call the toss!",
 
+                               reply_markup=get_toss_kb(m), parse_mode=ParseMode.MARKDOWN, rate_limit_args=Lane.NORMAL)
 
+    except Exception:
 
-    # Toss Result
+        # No message, no way to play it: the tournament records a walkover instead
 
-    if action in ["th", "tt"] and uid == m["toss_caller"]:
+        matches.pop(m.match_id)
 
-        m["toss_winner"] = uid if (m["cpu_mode"] or random.choice([0,1])==1) else [p for p in m["players"] if p != uid][0]
+        raise
 
-        await query.edit_message_text(f"🎊 **{m['names'][m['toss_winner']]}** won the toss!\nChoose your strategy:", 
+    return m.match_id
 
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏏 BAT", callback_data=f"tb_{chat_id}"), InlineKeyboardButton("🎯 BOWL", callback_data=f"tw_{chat_id}")]]) , parse_mode=ParseMode.MARKDOWN)
 
-        return
 
+async def finish_tournament(bot, t):
+
+    await bot.send_message(t.chat_id, bracket_text(t) + f"\n👑 **CHAMPION: {t.name(t.champion)}** 🎉" + FOOTER,
+
+                           parse_mode=ParseMode.MARKDOWN, rate_limit_args=Lane.NORMAL)
+
+async def expire_tournament(bot, t):
+
+    await bot.send_message(t.chat_id, f"⌛ **Tournament `{t.tournament_id}` was called off:** nobody started it in time.\n"
+
+                           f"Send /tournament to open a new one.", parse_mode=ParseMode.MARKDOWN, rate_limit_args=Lane.BACKGROUND)
+
+
+
+# ================= CORE ENGINE =================
+
+
+
+async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+    query = update.callback_query
 
+    token = callbacks.decode(query.data)
 
-    # Strategy Selection
+    if token is None:
 
-    if action in ["tb", "tw"] and uid == m["toss_winner"]:
+        await query.answer("⌛ This button has expired.", show_alert=False)
 
-        p1, p2 = m["players"][0], m["players"][1]
+        return
 
-        if action == "tb": m["bat_f"], m["bowl_f"] = uid, (p2 if uid==p1 else p1)
+    
 
-        else: m["bowl_f"], m["bat_f"] = uid, (p2 if uid==p1 else p1)
+    action, match_id, seq = token
 
-        m.update({"current_batsman": m["bat_f"], "current_bowler": m["bowl_f"], "state": "inning1"})
+    if action in callbacks.TOURNAMENT:
 
-        await update_scorecard(query, m, chat_id)
+        await on_tournament_button(query, update, action, match_id)
 
         return
 
+    
+
+    # Updates run concurrently, so everything touching a match holds its lock
+
+    async with matches.lock(match_id):
+
+        m = matches.get(match_id)
+
+        
+
+        if action in callbacks.MODES:
 
+            if m is None:
 
-    # Gameplay Logic
+                await start_match(query, update, action, match_id, rules.format_at(seq & 0xFF), ai.difficulty_at(seq >> 8))
 
-    if action.startswith('n'):
+            else:
 
-        if uid in m["choices"]:
+                # Double tap, or someone else already picked a mode on this message
 
-            await query.answer("Wait for the other player! ⏳", show_alert=False)
+                await query.answer("⌛ This button has expired.", show_alert=False)
 
             return
 
         
 
-        m["choices"][uid] = int(action[1])
+        if not m or seq != m.seq:
 
-        if m["cpu_mode"]: m["choices"]["cpu"] = random.randint(1,6)
+            await query.answer("⌛ This button has expired.", show_alert=False)
+
+            return
 
         
 
-        if len(m["choices"]) == 2:
+        uid = str(update.effective_user.id)
 
-            await resolve_ball(query, m, chat_id)
+        # Spectator Guard
 
-        else:
+        if action != Action.JOIN and uid not in m.players:
 
-            other_p = [p for p in [m["current_batsman"], m["current_bowler"]] if p != uid][0]
+            await query.answer("🚫 OOPS! You are just a Spectator. You can't play this match!", show_alert=True)
 
-            await update_scorecard(query, m, chat_id, waiting_for=m["names"][other_p])
+            return
 
-        await query.answer()
+        
 
+        await ACTION_HANDLERS[action](query, context, m, uid, action)
 
+        matches.touch(m)
 
-async def resolve_ball(query, m, cid):
 
-    b_id, bo_id = m["current_batsman"], m["current_bowler"]
 
-    b1, b2 = m["choices"][b_id], m["choices"][bo_id]
+async def start_match(query, update, action, match_id, spec, difficulty):
 
-    m["choices"] = {}
+    user = update.effective_user
 
-    
+    uid = str(user.id)
 
-    await query.edit_message_text(f"🏏 **{m['names'][b_id]}** is ready...\n🎯 **{m['names'][bo_id]}** runs in...\n\n⚡ *THE BALL IS IN THE AIR...*", parse_mode=ParseMode.MARKDOWN)
+    m = Match(match_id, str(update.effective_chat.id), players=[uid], names=[user.first_name],
 
-    await asyncio.sleep(1.2)
+              mode=Mode.CPU if action == Action.MODE_CPU else Mode.DUEL,
 
+              format_name=spec.name, total_overs=spec.overs, max_wickets=spec.wickets, difficulty=difficulty)
 
+    if m.cpu_mode: m.add_player(CPU, "APEX AI 🤖")
 
-    is_wicket = (b1 == b2)
+    m.advance()
 
-    comm = get_commentary(b1, is_wicket)
+    matches.put(m)
 
     
 
-    if is_wicket:
+    txt = f"{STADIUM_EMOJI} **MATCH ID: `{match_id}`** | {spec.name}\n{DIVIDER}\n"
 
-        m["wickets"] += 1
+    if m.cpu_mode:
 
-        m["history"].append("🔴")
+        m.toss_caller = uid
 
-        res = f"☝️ **OUT! ( {b1} vs {b2} )**"
+        await query.edit_message_text(f"{txt}🪙 **TOSS TIME**\n\n{user.first_name}, call Heads or Tails:", 
+
+            reply_markup=get_toss_kb(m), parse_mode=ParseMode.MARKDOWN)
 
     else:
 
-        m["score"] += b1
+        await query.edit_message_text(f"{txt}👥 **WAITING FOR OPPONENT...**\n\nAsk your friend to join the battle!", 
 
-        m["history"].append(f"`{b1}`")
+            reply_markup=InlineKeyboardMarkup([[button("🏏 JOIN MATCH", Action.JOIN, m)]]), parse_mode=ParseMode.MARKDOWN)
 
-        res = f"✨ **{b1} RUNS! ( {b1} vs {b2} )**"
 
 
+async def on_join(query, context, m, uid, action):
 
-    m["balls"] += 1
+    if uid in m.players or len(m.players) >= 2: return
 
-    if m["balls"] == 6: m["overs"] += 1; m["balls"] = 0
+    m.add_player(uid, query.from_user.first_name)
 
+    m.toss_caller = random.choice(m.players)
 
+    m.advance()
 
-    if (m["state"] == "inning2" and m["score"] >= m["target"]):
+    await query.edit_message_text(f"🪙 **TOSS CALL**\n\nHey {m.name(m.toss_caller)}, it's your turn to call!", 
 
-        await end_match(query, m, cid, b_id, "CHASE COMPLETED! 🏆")
+        reply_markup=get_toss_kb(m), parse_mode=ParseMode.MARKDOWN)
 
-    elif (m["wickets"] >= m["max_wickets"] or m["overs"] >= 1):
 
-        if m["state"] == "inning1":
 
-            m["target"] = m["score"] + 1
+async def on_toss(query, context, m, uid, action):
 
-            m.update({"state": "inning2", "current_batsman": m["bowl_f"], "current_bowler": m["bat_f"], "score": 0, "wickets": 0, "overs": 0, "balls": 0, "history": []})
+    if uid != m.toss_caller: return
 
-            await query.edit_message_text(f"🏁 **INNING OVER!**\n{DIVIDER}\n🎯 Target: **{m['target']}**\n\nGet ready for the chase!", reply_markup=get_num_kb(cid), parse_mode=ParseMode.MARKDOWN)
+    m.toss_winner = uid if (m.cpu_mode or random.choice([0,1])==1) else m.opponent(uid)
 
-        else:
+    m.advance()
 
-            await end_match(query, m, cid, bo_id, "TARGET DEFENDED! 🔥")
+    await query.edit_message_text(f"🎊 **{m.name(m.toss_winner)}** won the toss!\nChoose your strategy:", 
 
-    else:
+        reply_markup=InlineKeyboardMarkup([[button("🏏 BAT", Action.BAT, m), button("🎯 BOWL", Action.BOWL, m)]]), parse_mode=ParseMode.MARKDOWN)
+
+
+
+async def on_strategy(query, context, m, uid, action):
+
+    if uid != m.toss_winner: return
+
+    m.start_innings(uid if action == Action.BAT else m.opponent(uid))
+
+    m.advance()
 
-        await update_scorecard(query, m, cid, last_ball=res, comm=comm)
+    await update_scorecard(query, m)
 
 
 
-async def update_scorecard(query, m, cid, last_ball=None, comm=None, waiting_for=None):
+async def on_number(query, context, m, uid, action):
 
-    bat, bowl = m["current_batsman"], m["current_bowler"]
+    if not m.in_play: return
 
-    hist_str = " ".join(m["history"]) if m["history"] else "---"
+    if m.resolving:
+
+        await query.answer("⚡ Ball in play...", show_alert=False)
+
+        return
+
+    number = action - Action.N1 + 1
+
+    picked = engine.submit(m, uid, number)
+
+    if picked == Pick.REJECTED:
+
+        await query.answer("Wait for the other player! ⏳", show_alert=False)
+
+        return
 
     
 
-    status = (f"🏟️ **APEX ARENA** | ID: `{m['match_id']}`\n"
+    if m.cpu_mode:
 
-              f"{DIVIDER}\n")
+        # The CPU decides from the situation and the player's history, never this pick
 
-    if last_ball: status += f"{last_ball}\n"
+        picked = engine.submit(m, CPU, cpu.pick(m, uid))
 
-    if comm: status += f"🎤 _{comm}_\n\n"
+        cpu.observe(uid, number)
 
     
 
-    status += (f"🏏 **BAT:** {m['names'][bat]}\n"
+    if picked == Pick.READY:
 
-               f"🎯 **BOWL:** {m['names'][bowl]}\n\n"
+        await resolve_ball(query, m, context)
 
-               f"📊 **SCORE: {m['score']}/{m['wickets']}**\n"
+    else:
+
+        await update_scorecard(query, m, waiting_for=m.name(m.opponent(uid)))
+
+    await query.answer()
+
+
+
+async def on_surrender(query, context, m, uid, action):
+
+    await end_match(query, m, m.opponent(uid), f"{m.name(uid)} SURRENDERED 🏳️")
+
+
+
+# action -> handler, so dispatch is a single lookup
+
+ACTION_HANDLERS = {
+
+    Action.JOIN: on_join,
+
+    Action.HEADS: on_toss,
+
+    Action.TAILS: on_toss,
+
+    Action.BAT: on_strategy,
+
+    Action.BOWL: on_strategy,
+
+    Action.SURRENDER: on_surrender,
+
+    **{action: on_number for action in callbacks.NUMBERS},
+
+}
 
-               f"⏳ **OVERS: {m['overs']}.{m['balls']} / 1.0**\n"
 
-               f"📝 **BALLS:** [ {hist_str} ]\n")
+
+async def resolve_ball(query, m, context):
+
+    b_id, bo_id = m.batsman, m.bowler
+
+    b1, b2 = m.take_choices()
+
+    m.resolving = True
+
+    m.advance()
 
     
 
-    if m["state"] == "inning2":
+    try:
+
+        await renderer.edit(query, m, f"🏏 **{m.name(b_id)}** is ready...\n🎯 **{m.name(bo_id)}** runs in...\n\n⚡ *THE BALL IS IN THE AIR...*")
+
+    finally:
+
+        # The result lands later from its own task, so this handler returns now
+
+        context.application.create_task(finish_ball(query, m, b1, b2))
+
+
+
+async def finish_ball(query, m, b1, b2):
+
+    await asyncio.sleep(BALL_SUSPENSE)
+
+    async with matches.lock(m.match_id):
+
+        m.resolving = False
+
+        if matches.get(m.match_id) is not m: return  # cancelled or expired meanwhile
+
+        await apply_ball(query, m, b1, b2)
+
+        matches.touch(m)
 
-        status += f"🚩 **NEED {m['target'] - m['score']} FROM {6-(m['overs']*6+m['balls'])} BALLS**\n"
 
-    if waiting_for:
 
-        status += f"\n⏳ _Waiting for {waiting_for}..._"
+END_REASONS = {
 
+    Result.CHASED: "CHASE COMPLETED! 🏆",
 
+    Result.DEFENDED: "TARGET DEFENDED! 🔥",
 
-    await query.edit_message_text(status + FOOTER, reply_markup=get_num_kb(cid), parse_mode=ParseMode.MARKDOWN)
+    Result.TIED: "SCORES LEVEL! 🤝",
 
+}
 
 
-async def end_match(query, m, cid, winner, reason):
+
+async def apply_ball(query, m, b1, b2):
+
+    ball = engine.play_ball(m, b1, b2)
+
+    if ball.finished:
+
+        await end_match(query, m, ball.winner, END_REASONS[ball.result])
+
+    elif ball.result == Result.SUPER_OVER:
+
+        await renderer.edit(query, m, f"🤝 **SCORES LEVEL!**\n{DIVIDER}\n🔥 **SUPER OVER** - {m.name(m.batsman)} bats first!", renderer.number_pad(m))
+
+    elif ball.result == Result.INNINGS_OVER:
+
+        powerplay = f"⚡ Powerplay: **{ball.powerplay}** runs\n" if ball.powerplay is not None else ""
+
+        await renderer.edit(query, m, f"🏁 **INNING OVER!**\n{DIVIDER}\n🎯 Target: **{m.target}**\n{powerplay}\nGet ready for the chase!", renderer.number_pad(m))
+
+    else:
+
+        if ball.wicket:
+
+            res = f"☝️ **OUT! ( {b1} vs {b2} )**"
+
+        else:
+
+            res = f"✨ **{b1} RUNS! ( {b1} vs {b2} )**"
+
+        await update_scorecard(query, m, last_ball=res, comm=get_commentary(b1, ball.wicket))
+
+
+
+async def update_scorecard(query, m, last_ball=None, comm=None, waiting_for=None):
+
+    status = renderer.render_scorecard(m, last_ball, comm, waiting_for)
+
+    await renderer.edit(query, m, status, renderer.number_pad(m))
+
+
+
+async def end_match(query, m, winner, reason):
 
     status = (f"🏆 **MATCH FINISHED**\n{DIVIDER}\n"
 
-              f"👑 **WINNER:** {m['names'][winner]}\n"
+              f"👑 **WINNER:** {m.name(winner) if winner else 'NONE - MATCH TIED'}\n"
 
               f"📝 **REASON:** {reason}\n\n"
 
-              f"Final Score: {m['score']}/{m['wickets']}")
+              f"Final Score: {m.score}/{m.wickets}")
+
+    await renderer.edit(query, m, status + FOOTER)
+
+    stats.record(m, winner)
+
+    await tournaments.report(m.match_id, winner)
+
+    matches.pop(m.match_id)
+
+
+
+async def stop_background():
+
+    """Final match and tournament snapshot and stats compaction when the bot stops"""
+
+    await tournaments.stop_sweeper()
+
+    await matches.stop()
+
+    await stats.stop()
 
-    await query.edit_message_text(status + FOOTER, parse_mode=ParseMode.MARKDOWN)
 
-    matches_cache.pop(str(cid), None)
 
 async def start_bot3():
-    app = ApplicationBuilder().token(BOT3_TOKEN).build()
+    app = ApplicationBuilder().token(BOT3_TOKEN).rate_limiter(OutboundScheduler("bot3")).request(resources.telegram_request()).concurrent_updates(CONCURRENT_UPDATES).build()
     app.add_handler(CommandHandler("start", start_command))
     app.add_handler(CommandHandler("cricket", start_command))
     app.add_handler(CommandHandler("cancel", cancel_match))
+    app.add_handler(CommandHandler("leaderboard", leaderboard_command))
+    app.add_handler(CommandHandler("stats", stats_command))
+    app.add_handler(CommandHandler("tournament", tournament_command))
     app.add_handler(CallbackQueryHandler(handle_callback))
-    print("✅ PRO BOT ONLINE")
+    throttle.install(app, "bot3")  # the default per-user budget only: a match is many players tapping
+    logger.info("✅ PRO BOT ONLINE")
     
     await app.bot.initialize()
     await app.initialize()
+    await botmeta.load(app)
+    metrics.instrument(app, "bot3")
+    supervisor.attach("bot3", app, on_stop=stop_background)
+    tournaments.launch = functools.partial(launch_fixture, app.bot)
+    tournaments.finish = functools.partial(finish_tournament, app.bot)
+    tournaments.expire = functools.partial(expire_tournament, app.bot)
     await app.start()
-    await app.updater.start_polling()
+    await matches.load()
+    matches.start()
+    await tournaments.load(matches)
+    tournaments.start_sweeper()
+    await stats.load()
+    stats.start()
+    await webhook.start_updates("bot3", app)
 
@@ -0,0 +1,360 @@
+"""
+APEX CRICKET - MATCH STATE
+Compact per-match state, an expiring in-memory store and optional snapshots
+(which also keep the tournaments, see tournament.py)
+"""
+
+import asyncio
+import json
+import logging
+import secrets
+import sqlite3
+import time
+import weakref
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MATCH_TTL = 30 * 60          # drop matches idle for 30 minutes
+SWEEP_INTERVAL = 60
+CPU = "cpu"
+
+
+class State(IntEnum):
+    TOSS = 0
+    INNING1 = 1
+    INNING2 = 2
+    SUPER1 = 3
+    SUPER2 = 4
+
+
+class Mode(IntEnum):
+    DUEL = 0
+    CPU = 1
+
+
+# ================= MATCH =================
+@dataclass(slots=True)
+class Match:
+    match_id: str
+    chat_id: str
+    players: List[str]
+    names: List[str]
+    mode: Mode = Mode.DUEL
+    state: State = State.TOSS
+    format_name: str = "T1"  # key into rules.FORMATS
+    difficulty: int = 1      # ai.Difficulty of the CPU
+    total_overs: int = 1
+    max_wickets: int = 2
+    score: int = 0
+    wickets: int = 0
+    overs: int = 0
+    balls: int = 0
+    target: int = 0
+    toss_caller: str = ""
+    toss_winner: str = ""
+    bat_first: str = ""
+    bowl_first: str = ""
+    batsman: str = ""
+    bowler: str = ""
+    bat_choice: int = 0      # 0 = not chosen yet
+    bowl_choice: int = 0
+    resolving: bool = False  # a ball is in the air
+    seq: int = 0             # bumped whenever the buttons change, older buttons are stale
+    logs: List[bytearray] = field(default_factory=list)  # one byte per ball, one array per innings
+    last_active: float = field(default_factory=time.time)
+
+    @property
+    def cpu_mode(self) -> bool:
+        return self.mode == Mode.CPU
+
+    @property
+    def in_play(self) -> bool:
+        return self.state != State.TOSS
+
+    @property
+    def ready(self) -> bool:
+        """Both numbers are in for the current ball"""
+        return bool(self.bat_choice and self.bowl_choice)
+
+    @property
+    def log(self) -> bytearray:
+        """Balls of the current innings"""
+        return self.logs[-1] if self.logs else bytearray()
+
+    def advance(self) -> int:
+        """Invalidate the buttons currently on screen"""
+        self.seq = (self.seq + 1) & 0xFFFF
+        return self.seq
+
+    def name(self, uid: str) -> str:
+        return self.names[self.players.index(uid)]
+
+    def add_player(self, uid: str, name: str):
+        self.players.append(uid)
+        self.names.append(name)
+
+    def opponent(self, uid: str) -> str:
+        return self.players[1] if self.players[0] == uid else self.players[0]
+
+    def _new_innings(self, batsman: str, bowler: str, state: State):
+        self.batsman, self.bowler = batsman, bowler
+        self.score = self.wickets = self.overs = self.balls = 0
+        self.logs.append(bytearray())
+        self.state = state
+
+    def start_innings(self, batsman: str, state: State = State.INNING1):
+        self.bat_first, self.bowl_first = batsman, self.opponent(batsman)
+        self._new_innings(self.bat_first, self.bowl_first, state)
+
+    def start_second_innings(self):
+        self.target = self.score + 1
+        state = State.SUPER2 if self.state == State.SUPER1 else State.INNING2
+        self._new_innings(self.bowl_first, self.bat_first, state)
+
+    def choose(self, uid: str, number: int) -> bool:
+        """Record a player's number; False if they already picked for this ball"""
+        if uid == self.batsman:
+            if self.bat_choice:
+                return False
+            self.bat_choice = number
+        elif uid == self.bowler:
+            if self.bowl_choice:
+                return False
+            self.bowl_choice = number
+        else:
+            return False
+        return True
+
+    def take_choices(self):
+        """Return (batsman's number, bowler's number) and clear them for the next ball"""
+        choices = (self.bat_choice, self.bowl_choice)
+        self.bat_choice = self.bowl_choice = 0
+        return choices
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["logs"] = [log.hex() for log in self.logs]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Match":
+        data = dict(data)
+        data["mode"], data["state"] = Mode(data["mode"]), State(data["state"])
+        data["logs"] = [bytearray.fromhex(log) for log in data.get("logs", [])]
+        data["resolving"] = False  # the pending result died with the old process
+        return cls(**data)
+
+
+# ================= LOCKS =================
+class LockRegistry:
+    """
+    One asyncio.Lock per key, held weakly: a lock lives only while some
+    handler references it, so idle chats cost nothing.
+    """
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def __call__(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def __len__(self):
+        return len(self._locks)
+
+
+# ================= SNAPSHOTS =================
+class SqliteSnapshot:
+    """Match and tournament snapshots in a local SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS matches (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS tournaments (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def _save(self, table: str, changed: Iterable[Tuple[str, dict]], removed: Iterable[str]):
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, data) VALUES (?, ?)",
+                [(key, json.dumps(data)) for key, data in changed],
+            )
+            conn.executemany(f"DELETE FROM {table} WHERE key = ?", [(k,) for k in removed])
+
+    def _load(self, table: str) -> List[dict]:
+        with sqlite3.connect(self.path) as conn:
+            return [json.loads(row[0]) for row in conn.execute(f"SELECT data FROM {table}")]
+
+    def save(self, changed: Iterable[Match], removed: Iterable[str]):
+        self._save("matches", [(m.match_id, m.to_dict()) for m in changed], removed)
+
+    def load(self) -> List[Match]:
+        return [Match.from_dict(data) for data in self._load("matches")]
+
+    def save_tournaments(self, changed: Iterable[Tuple[str, dict]], removed: Iterable[str]):
+        self._save("tournaments", changed, removed)
+
+    def load_tournaments(self) -> List[dict]:
+        return self._load("tournaments")
+
+
+class MongoSnapshot:
+    """Match and tournament snapshots in MongoDB collections"""
+
+    def __init__(self, uri: str, db_name: str = "apex_cricket"):
+        from shared.resources import mongo
+        self.col = mongo(uri)[db_name]["matches"]
+        self.tournaments = mongo(uri)[db_name]["tournaments"]
+
+    @staticmethod
+    def _save(col, changed: Iterable[Tuple[str, dict]], removed: Iterable[str]):
+        from pymongo import DeleteOne, ReplaceOne
+        ops = [ReplaceOne({"_id": key}, {"_id": key, **data}, upsert=True) for key, data in changed]
+        ops += [DeleteOne({"_id": k}) for k in removed]
+        if ops:
+            col.bulk_write(ops, ordered=False)
+
+    @staticmethod
+    def _load(col) -> List[dict]:
+        return [{k: v for k, v in doc.items() if k != "_id"} for doc in col.find()]
+
+    def save(self, changed: Iterable[Match], removed: Iterable[str]):
+        self._save(self.col, [(m.match_id, m.to_dict()) for m in changed], removed)
+
+    def load(self) -> List[Match]:
+        return [Match.from_dict(data) for data in self._load(self.col)]
+
+    def save_tournaments(self, changed: Iterable[Tuple[str, dict]], removed: Iterable[str]):
+        self._save(self.tournaments, changed, removed)
+
+    def load_tournaments(self) -> List[dict]:
+        return self._load(self.tournaments)
+
+
+def open_snapshot(target: str):
+    """'' disables snapshots, a mongodb:// URI uses Mongo, anything else is a SQLite path"""
+    if not target:
+        return None
+    if target.startswith("mongodb"):
+        return MongoSnapshot(target)
+    return SqliteSnapshot(target)
+
+
+# ================= STORE =================
+class MatchStore:
+    """Live matches keyed by match id (several per chat), with idle expiry and periodic snapshots"""
+
+    def __init__(self, ttl: float = MATCH_TTL, snapshot=None):
+        self.ttl = ttl
+        self.snapshot = snapshot
+        self._matches: Dict[str, Match] = {}
+        self._dirty = set()
+        self._removed = set()
+        self.lock = LockRegistry()
+        self.on_remove: List[Callable[[str], None]] = []  # called with the id of every ended/expired match
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+
+    def __len__(self):
+        return len(self._matches)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._matches
+
+    def get(self, key: str) -> Optional[Match]:
+        """Look a match up and keep it from expiring; it's only rewritten once touch()ed"""
+        m = self._matches.get(key)
+        if m is not None:
+            m.last_active = time.time()
+        return m
+
+    def touch(self, m: Match):
+        """Mark a match changed, for the next snapshot (no-op once it has ended)"""
+        if self._matches.get(m.match_id) is m:
+            self._dirty.add(m.match_id)
+
+    def new_id(self) -> str:
+        """Unused 6-hex-digit match id"""
+        while True:
+            match_id = secrets.token_hex(3).upper()
+            if match_id not in self._matches:
+                return match_id
+
+    def put(self, m: Match):
+        self._matches[m.match_id] = m
+        self._dirty.add(m.match_id)
+        self._removed.discard(m.match_id)
+
+    def pop(self, key: str) -> Optional[Match]:
+        m = self._matches.pop(key, None)
+        self._dirty.discard(key)
+        if m is not None:
+            self._removed.add(key)
+            for callback in self.on_remove:
+                callback(key)
+        return m
+
+    def sweep(self, now: Optional[float] = None) -> List[Match]:
+        """Drop matches idle for longer than the TTL"""
+        cutoff = (now or time.time()) - self.ttl
+        expired = [m for m in self._matches.values() if m.last_active < cutoff]
+        for m in expired:
+            self.pop(m.match_id)
+        return expired
+
+    async def save(self):
+        """Write changed and removed matches to the snapshot backend"""
+        if not self.snapshot or not (self._dirty or self._removed):
+            return
+        changed = [self._matches[k] for k in self._dirty if k in self._matches]
+        removed = list(self._removed)
+        self._dirty, self._removed = set(), set()
+        try:
+            await asyncio.to_thread(self.snapshot.save, changed, removed)
+        except Exception as e:
+            self._dirty.update(m.match_id for m in changed)
+            self._removed.update(removed)
+            logger.error(f"Match snapshot failed: {e}")
+
+    async def load(self):
+        """Restore matches from the snapshot, skipping ones that already expired"""
+        if not self.snapshot:
+            return
+        cutoff = time.time() - self.ttl
+        for m in await asyncio.to_thread(self.snapshot.load):
+            if m.match_id in self._matches:
+                continue  # still live: the bot was restarted in-process
+            if m.last_active >= cutoff:
+                self._matches[m.match_id] = m
+            else:
+                self._removed.add(m.match_id)
+        logger.info(f"Restored {len(self._matches)} matches")
+
+    def start(self, interval: float = SWEEP_INTERVAL):
+        """Start the sweeper/snapshot loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop the loop, let a snapshot in progress finish, then write a final one"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+        await self.save()
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            expired = self.sweep()
+            if expired:
+                logger.info(f"Expired {len(expired)} idle matches")
+            self._writing = asyncio.ensure_future(self.save())
+            await asyncio.shield(self._writing)
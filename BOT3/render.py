@@ -0,0 +1,111 @@
+"""
+APEX CRICKET - RENDERING
+Precompiled scorecard templates, per-match keyboard cache and duplicate-edit suppression
+"""
+
+from typing import Dict, Optional, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
+
+from BOT3 import callbacks, rules
+from BOT3.callbacks import Action
+from BOT3.match import Match, State
+
+# ================= TEMPLATES =================
+# {divider} and {footer} are baked in once by Renderer, the rest is filled per ball
+SCORECARD = (
+    "🏟️ **APEX ARENA** | ID: `{match_id}`\n"
+    "{divider}\n"
+    "{last_ball}"
+    "{commentary}"
+    "{phase}"
+    "🏏 **BAT:** {batsman}\n"
+    "🎯 **BOWL:** {bowler}\n\n"
+    "📊 **SCORE: {score}/{wickets}**\n"
+    "⏳ **OVERS: {overs}.{balls} / {total_overs}.0**\n"
+    "📝 **THIS OVER:** [ {this_over} ]\n"
+    "{chase}"
+    "{waiting}"
+    "{footer}"
+)
+LAST_BALL = "{}\n"
+COMMENTARY = "🎤 _{}_\n\n"
+CHASE = "🚩 **NEED {} FROM {} BALLS**\n"
+WAITING = "\n⏳ _Waiting for {}..._"
+POWERPLAY = "⚡ **POWERPLAY**\n"
+SUPER_OVER = "🔥 **SUPER OVER**\n"
+
+NUMBER_ROWS = (
+    (("1️⃣", Action.N1), ("2️⃣", Action.N2), ("3️⃣", Action.N3)),
+    (("4️⃣", Action.N4), ("5️⃣", Action.N5), ("6️⃣", Action.N6)),
+    (("🏳️ SURRENDER", Action.SURRENDER),),
+)
+
+
+class Renderer:
+    """
+    Builds scorecards and number pads for live matches.
+    A match's number pad is rebuilt only when its ball sequence moves on, and
+    an edit identical to the last one sent for that match is skipped.
+    """
+
+    def __init__(self, divider: str, footer: str):
+        self.scorecard = SCORECARD.replace("{divider}", divider).replace("{footer}", footer)
+        self._pads: Dict[str, Tuple[int, InlineKeyboardMarkup]] = {}
+        self._sent: Dict[str, Tuple[str, Optional[InlineKeyboardMarkup]]] = {}
+        self.stats = {"pads_built": 0, "pads_reused": 0, "edits": 0, "edits_skipped": 0}
+
+    def number_pad(self, m: Match) -> InlineKeyboardMarkup:
+        cached = self._pads.get(m.match_id)
+        if cached is not None and cached[0] == m.seq:
+            self.stats["pads_reused"] += 1
+            return cached[1]
+        markup = InlineKeyboardMarkup([
+            [InlineKeyboardButton(text, callback_data=callbacks.encode(action, m.match_id, m.seq)) for text, action in row]
+            for row in NUMBER_ROWS
+        ])
+        self._pads[m.match_id] = (m.seq, markup)
+        self.stats["pads_built"] += 1
+        return markup
+
+    def render_scorecard(self, m: Match, last_ball=None, comm=None, waiting_for=None) -> str:
+        chase = phase = ""
+        if m.state in (State.INNING2, State.SUPER2):
+            chase = CHASE.format(m.target - m.score, rules.balls_left(m))
+        if m.state in (State.SUPER1, State.SUPER2):
+            phase = SUPER_OVER
+        elif rules.in_powerplay(m):
+            phase = POWERPLAY
+        return self.scorecard.format(
+            match_id=m.match_id,
+            last_ball=LAST_BALL.format(last_ball) if last_ball else "",
+            commentary=COMMENTARY.format(comm) if comm else "",
+            phase=phase,
+            batsman=m.name(m.batsman),
+            bowler=m.name(m.bowler),
+            score=m.score,
+            wickets=m.wickets,
+            overs=m.overs,
+            balls=m.balls,
+            total_overs=m.total_overs,
+            this_over=rules.this_over(m),
+            chase=chase,
+            waiting=WAITING.format(waiting_for) if waiting_for else "",
+        )
+
+    async def edit(self, query, m: Match, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> bool:
+        """Edit the match message unless it would show exactly what it shows now"""
+        last = self._sent.get(m.match_id)
+        if last is not None and last[0] == text and last[1] is reply_markup:
+            self.stats["edits_skipped"] += 1
+            return False
+        await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.MARKDOWN)
+        self._sent[m.match_id] = (text, reply_markup)
+        self.stats["edits"] += 1
+        return True
+
+    def forget(self, match_id: str):
+        """Drop cached state for a match that ended or expired"""
+        self._pads.pop(match_id, None)
+        self._sent.pop(match_id, None)
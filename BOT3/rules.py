@@ -0,0 +1,136 @@
+"""
+APEX CRICKET - MATCH RULES
+Format specs (overs, wickets, powerplay, super over) and the ball-by-ball rules
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, List, Sequence
+
+from BOT3.match import Match, State
+
+# One byte per ball: runs 1-6, or WICKET plus the number both players picked
+WICKET = 0x80
+BALL_SYMBOLS = ["`{}`".format(i & 0x7F) if i < WICKET else "🔴" for i in range(256)]
+
+
+@dataclass(frozen=True)
+class FormatSpec:
+    name: str
+    overs: int
+    wickets: int
+    powerplay_overs: int = 0
+    super_over: bool = True   # a tie goes to a super over instead of ending level
+
+    @property
+    def label(self) -> str:
+        overs = "1 Over" if self.overs == 1 else f"{self.overs} Overs"
+        return f"{overs} | {self.wickets} Wickets Max"
+
+
+FORMATS: Dict[str, FormatSpec] = {
+    "T1": FormatSpec("T1", overs=1, wickets=2),
+    "T2": FormatSpec("T2", overs=2, wickets=2),
+    "T5": FormatSpec("T5", overs=5, wickets=3, powerplay_overs=1),
+    "T10": FormatSpec("T10", overs=10, wickets=5, powerplay_overs=2),
+}
+# Position in this list is what the mode buttons carry
+FORMAT_LIST: List[FormatSpec] = list(FORMATS.values())
+DEFAULT_FORMAT = FORMATS["T1"]
+SUPER_OVER = FormatSpec("SUPER OVER", overs=1, wickets=2, super_over=False)
+
+
+class Result(IntEnum):
+    CONTINUE = 0
+    INNINGS_OVER = 1
+    CHASED = 2       # batting side reached the target
+    DEFENDED = 3     # bowling side held the chase below the target
+    SUPER_OVER = 4   # scores level, play a super over
+    TIED = 5         # scores level and no tiebreak left
+
+
+def parse_format(args: Sequence[str]) -> FormatSpec:
+    """Format named in command args (e.g. /start T10), or the default"""
+    for arg in args:
+        if arg.upper() in FORMATS:
+            return FORMATS[arg.upper()]
+    return DEFAULT_FORMAT
+
+
+def format_at(index: int) -> FormatSpec:
+    return FORMAT_LIST[index] if 0 <= index < len(FORMAT_LIST) else DEFAULT_FORMAT
+
+
+def spec_of(m: Match) -> FormatSpec:
+    if m.state in (State.SUPER1, State.SUPER2):
+        return SUPER_OVER
+    return FORMATS.get(m.format_name, DEFAULT_FORMAT)
+
+
+def legal_balls(m: Match) -> int:
+    return m.overs * 6 + m.balls
+
+
+def balls_left(m: Match) -> int:
+    return m.total_overs * 6 - legal_balls(m)
+
+
+def in_powerplay(m: Match) -> bool:
+    return m.overs < spec_of(m).powerplay_overs
+
+
+def powerplay_runs(m: Match, innings: int = -1) -> int:
+    """Runs scored in the powerplay overs of an innings (current by default)"""
+    log = m.logs[innings] if m.logs else b""
+    return sum(b for b in log[:spec_of(m).powerplay_overs * 6] if b < WICKET)
+
+
+def this_over(m: Match) -> str:
+    """Symbols for the balls of the current over, so rendering cost stays flat in long formats"""
+    log = m.log
+    start = len(log) - m.balls if m.balls else max(len(log) - 6, 0)
+    return " ".join([BALL_SYMBOLS[b] for b in log[start:]]) or "---"
+
+
+def record_ball(m: Match, bat: int, bowl: int) -> bool:
+    """Apply one delivery to the score, return True for a wicket"""
+    is_wicket = bat == bowl
+    if is_wicket:
+        m.wickets += 1
+        m.log.append(WICKET | bat)
+    else:
+        m.score += bat
+        m.log.append(bat)
+    m.balls += 1
+    if m.balls == 6:
+        m.overs += 1
+        m.balls = 0
+    return is_wicket
+
+
+def outcome(m: Match) -> Result:
+    """What the last recorded ball means for the match"""
+    chasing = m.state in (State.INNING2, State.SUPER2)
+    if chasing and m.score >= m.target:
+        return Result.CHASED
+    if m.wickets < m.max_wickets and m.overs < m.total_overs:
+        return Result.CONTINUE
+    if not chasing:
+        return Result.INNINGS_OVER
+    if m.score == m.target - 1:
+        return Result.SUPER_OVER if spec_of(m).super_over else Result.TIED
+    return Result.DEFENDED
+
+
+def start_super_over(m: Match):
+    """Tiebreak: the side that batted second bats first"""
+    m.start_innings(m.bowl_first, state=State.SUPER1)
+    m.total_overs, m.max_wickets = SUPER_OVER.overs, SUPER_OVER.wickets
+
+
+def innings_batters(m: Match) -> List[str]:
+    """Who batted each innings in m.logs (a super over reverses the batting order)"""
+    first = m.bat_first if len(m.logs) <= 2 else m.bowl_first
+    second = m.opponent(first)
+    return [first, second, second, first][:len(m.logs)]
+
@@ -0,0 +1,308 @@
+"""
+APEX CRICKET - PLAYER STATS
+Career stats per user, globally and per group. Finished matches are appended
+to a JSON-lines event log and periodically compacted into SQLite or MongoDB;
+leaderboards are served from in-memory top-K heaps.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import astuple, dataclass, fields
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from BOT3 import rules
+from BOT3.match import CPU, Match
+
+logger = logging.getLogger(__name__)
+
+GLOBAL = "global"          # scope for career stats across all chats
+TOP_K = 10
+FLUSH_SECONDS = 2          # event log append interval
+COMPACT_SECONDS = 300      # event log -> database interval
+
+
+# ================= AGGREGATES =================
+@dataclass(slots=True)
+class PlayerStats:
+    name: str = ""
+    matches: int = 0
+    wins: int = 0
+    runs: int = 0
+    balls: int = 0
+    wickets: int = 0
+
+    @property
+    def strike_rate(self) -> float:
+        return self.runs * 100 / self.balls if self.balls else 0.0
+
+    @property
+    def rank_key(self) -> Tuple[int, int]:
+        """Leaderboard order: wins, then runs"""
+        return self.wins, self.runs
+
+    def add(self, event: dict):
+        self.name = event["name"]
+        self.matches += 1
+        self.wins += event["won"]
+        self.runs += event["runs"]
+        self.balls += event["balls"]
+        self.wickets += event["wickets"]
+
+
+STAT_FIELDS = [f.name for f in fields(PlayerStats)]
+
+
+class TopK:
+    """
+    The K best users of one scope. Stats only ever grow, so an update is a heap
+    push (or replace of the current minimum); superseded entries are skipped
+    lazily. Every update is O(log K).
+    """
+
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self._heap: List[tuple] = []           # (rank key, user id), min at the top
+        self._members: Dict[str, tuple] = {}   # user id -> current rank key
+
+    def _prune(self):
+        heap, members = self._heap, self._members
+        while heap and members.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def update(self, uid: str, key: tuple):
+        if uid in self._members:
+            self._members[uid] = key
+            heapq.heappush(self._heap, (key, uid))
+            if len(self._heap) > 2 * self.k:
+                self._heap = [(k, u) for u, k in self._members.items()]
+                heapq.heapify(self._heap)
+        elif len(self._members) < self.k:
+            self._members[uid] = key
+            heapq.heappush(self._heap, (key, uid))
+        else:
+            self._prune()
+            if key > self._heap[0][0]:
+                _, evicted = heapq.heapreplace(self._heap, (key, uid))
+                del self._members[evicted]
+                self._members[uid] = key
+        self._prune()
+
+    def ranking(self) -> List[str]:
+        """User ids, best first"""
+        return [uid for uid, _ in sorted(self._members.items(), key=lambda item: item[1], reverse=True)]
+
+
+# ================= BACKENDS =================
+class SqliteStatsStore:
+    """Compacted stats in a local SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS player_stats (scope TEXT, user_id TEXT, "
+                + ", ".join(f"{name} {'TEXT' if name == 'name' else 'INTEGER'}" for name in STAT_FIELDS)
+                + ", PRIMARY KEY (scope, user_id))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+
+    def save(self, rows: Iterable[Tuple[str, str, PlayerStats]], last_seq: int):
+        placeholders = ", ".join("?" * (len(STAT_FIELDS) + 2))
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO player_stats VALUES ({placeholders})",
+                [(scope, uid, *astuple(stats)) for scope, uid, stats in rows],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_seq', ?)", (last_seq,))
+
+    def load(self) -> Tuple[List[Tuple[str, str, PlayerStats]], int]:
+        with sqlite3.connect(self.path) as conn:
+            rows = [(row[0], row[1], PlayerStats(*row[2:])) for row in conn.execute("SELECT * FROM player_stats")]
+            meta = conn.execute("SELECT value FROM meta WHERE key = 'last_seq'").fetchone()
+        return rows, meta[0] if meta else 0
+
+
+class MongoStatsStore:
+    """Compacted stats in a MongoDB collection"""
+
+    def __init__(self, uri: str, db_name: str = "apex_cricket"):
+        from shared.resources import mongo
+        db = mongo(uri)[db_name]
+        self.col, self.meta = db["player_stats"], db["stats_meta"]
+
+    def save(self, rows: Iterable[Tuple[str, str, PlayerStats]], last_seq: int):
+        from pymongo import ReplaceOne
+        ops = [
+            ReplaceOne({"_id": f"{scope}:{uid}"}, {"_id": f"{scope}:{uid}", "scope": scope, "user_id": uid,
+                                                   **dict(zip(STAT_FIELDS, astuple(stats)))}, upsert=True)
+            for scope, uid, stats in rows
+        ]
+        if ops:
+            self.col.bulk_write(ops, ordered=False)
+        self.meta.update_one({"_id": "last_seq"}, {"$set": {"value": last_seq}}, upsert=True)
+
+    def load(self) -> Tuple[List[Tuple[str, str, PlayerStats]], int]:
+        rows = [(doc["scope"], doc["user_id"], PlayerStats(*(doc[name] for name in STAT_FIELDS)))
+                for doc in self.col.find()]
+        meta = self.meta.find_one({"_id": "last_seq"})
+        return rows, meta["value"] if meta else 0
+
+
+def open_stats_store(target: str):
+    """A mongodb:// URI uses Mongo, anything else is a SQLite path"""
+    if target.startswith("mongodb"):
+        return MongoStatsStore(target)
+    return SqliteStatsStore(target)
+
+
+# ================= STATS BOOK =================
+def match_events(m: Match, winner: Optional[str]) -> List[dict]:
+    """One event per human player of a finished match"""
+    per_player = {uid: {"runs": 0, "balls": 0, "wickets": 0} for uid in m.players}
+    for batter, log in zip(rules.innings_batters(m), m.logs):
+        outs = sum(1 for b in log if b >= rules.WICKET)
+        per_player[batter]["runs"] += sum(b for b in log if b < rules.WICKET)
+        per_player[batter]["balls"] += len(log)
+        per_player[m.opponent(batter)]["wickets"] += outs
+    return [
+        {"chat": m.chat_id, "user": uid, "name": m.name(uid), "won": int(uid == winner), **line}
+        for uid, line in per_player.items() if uid != CPU
+    ]
+
+
+class StatsBook:
+    """In-memory aggregates fed by finished matches, backed by the event log and a compacted store"""
+
+    def __init__(self, log_path: str, store=None):
+        self.log_path = log_path
+        self.store = store
+        self._stats: Dict[Tuple[str, str], PlayerStats] = {}
+        self._boards: Dict[str, TopK] = {}
+        self._pending: List[dict] = []
+        self._dirty = set()
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+
+    def get(self, scope: str, uid: str) -> Optional[PlayerStats]:
+        return self._stats.get((scope, uid))
+
+    def leaderboard(self, scope: str = GLOBAL) -> List[Tuple[str, PlayerStats]]:
+        board = self._boards.get(scope)
+        if board is None:
+            return []
+        return [(uid, self._stats[(scope, uid)]) for uid in board.ranking()]
+
+    def _apply(self, event: dict):
+        for scope in (GLOBAL, event["chat"]):
+            key = (scope, event["user"])
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = PlayerStats()
+            stats.add(event)
+            board = self._boards.get(scope)
+            if board is None:
+                board = self._boards[scope] = TopK()
+            board.update(event["user"], stats.rank_key)
+            self._dirty.add(key)
+
+    def record(self, m: Match, winner: Optional[str]):
+        """Count a finished match; it reaches the event log on the next flush"""
+        for event in match_events(m, winner):
+            self._seq += 1
+            event["seq"], event["t"] = self._seq, int(time.time())
+            self._apply(event)
+            self._pending.append(event)
+
+    # ---------- persistence ----------
+    def _append(self, events: List[dict]):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+
+    def _truncate(self):
+        open(self.log_path, "w").close()
+
+    def _read_log(self) -> List[dict]:
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    async def flush(self):
+        """Append pending events to the log"""
+        if not self._pending:
+            return
+        events, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._append, events)
+        except Exception as e:
+            self._pending[:0] = events
+            logger.error(f"Stats log append failed: {e}")
+
+    async def compact(self):
+        """Fold everything logged so far into the store and truncate the log"""
+        await self.flush()
+        if not self.store or not self._dirty or self._pending:
+            return
+        rows = [(scope, uid, PlayerStats(*astuple(self._stats[(scope, uid)]))) for scope, uid in self._dirty]
+        dirty, self._dirty = self._dirty, set()
+        try:
+            await asyncio.to_thread(self.store.save, rows, self._seq)
+            # Events are only dropped once the store holds them; a crash in between is
+            # harmless because load() skips events at or below the stored last_seq
+            await asyncio.to_thread(self._truncate)
+        except Exception as e:
+            self._dirty |= dirty
+            logger.error(f"Stats compaction failed: {e}")
+
+    async def load(self):
+        """Rebuild aggregates from the store plus events logged since the last compaction"""
+        self._stats.clear()
+        self._boards.clear()
+        self._dirty.clear()
+        last_seq = 0
+        if self.store:
+            rows, last_seq = await asyncio.to_thread(self.store.load)
+            for scope, uid, stats in rows:
+                self._stats[(scope, uid)] = stats
+                board = self._boards.get(scope)
+                if board is None:
+                    board = self._boards[scope] = TopK()
+                board.update(uid, stats.rank_key)
+        self._seq = last_seq
+        for event in await asyncio.to_thread(self._read_log):
+            if event["seq"] > last_seq:
+                self._apply(event)
+                self._seq = max(self._seq, event["seq"])
+        logger.info(f"Loaded stats for {len(self._stats)} player/scope pairs")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the loop, let a write in progress finish, then compact everything left"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+        await self.compact()
+
+    async def _run(self):
+        last_compact = time.monotonic()
+        while True:
+            await asyncio.sleep(FLUSH_SECONDS)
+            if time.monotonic() - last_compact >= COMPACT_SECONDS:
+                last_compact = time.monotonic()
+                self._writing = asyncio.ensure_future(self.compact())
+            else:
+                self._writing = asyncio.ensure_future(self.flush())
+            # Shielded: stop() cancels the loop, never a write halfway through
+            await asyncio.shield(self._writing)
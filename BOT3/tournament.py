@@ -0,0 +1,380 @@
+"""
+APEX CRICKET - TOURNAMENTS
+Knockout brackets and round-robin leagues inside a group. Fixtures run as
+ordinary matches (several at once, each in its own message) and their results
+flow back through report(). Every tournament has its own lock, so any number
+of them can run side by side.
+
+Tournaments are written to the match snapshot backend alongside their
+fixtures, so a restart picks up where they were. A registration nobody
+starts is cancelled after REGISTRATION_TTL idle seconds; the organiser or a
+group admin can cancel any time.
+"""
+
+import asyncio
+import logging
+import random
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable, Container, Dict, List, Optional, Set, Tuple
+
+from BOT3.match import SWEEP_INTERVAL, LockRegistry
+
+logger = logging.getLogger(__name__)
+
+MAX_PLAYERS = 32
+MIN_PLAYERS = 2
+LEAGUE_WIN_POINTS = 2
+LEAGUE_TIE_POINTS = 1
+REGISTRATION_TTL = 30 * 60   # cancel registrations idle for 30 minutes
+
+
+class Kind(IntEnum):
+    KNOCKOUT = 0
+    LEAGUE = 1
+
+
+class Phase(IntEnum):
+    REGISTERING = 0
+    RUNNING = 1
+    FINISHED = 2
+    CANCELLED = 3
+
+
+@dataclass(slots=True)
+class Fixture:
+    index: int
+    round: int
+    home: Optional[str] = None
+    away: Optional[str] = None
+    next_index: int = -1      # knockout: fixture the winner moves on to
+    next_home: bool = True    # ...and on which side
+    match_id: str = ""
+    winner: Optional[str] = None
+    done: bool = False
+    walkover: bool = False    # decided without a result (tie in a knockout, or the match expired)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.home and self.away) and not self.match_id and not self.done
+
+
+@dataclass(slots=True)
+class Tournament:
+    tournament_id: str
+    chat_id: str
+    creator: str
+    kind: Kind = Kind.KNOCKOUT
+    format_name: str = "T1"
+    players: List[str] = field(default_factory=list)
+    names: Dict[str, str] = field(default_factory=dict)
+    phase: Phase = Phase.REGISTERING
+    fixtures: List[Fixture] = field(default_factory=list)
+    round: int = 0
+    points: Dict[str, int] = field(default_factory=dict)
+    champion: Optional[str] = None
+    last_active: float = field(default_factory=time.time)
+
+    def name(self, uid: Optional[str]) -> str:
+        return self.names.get(uid, "?") if uid else "TBD"
+
+    def round_fixtures(self, round_no: int) -> List[Fixture]:
+        return [f for f in self.fixtures if f.round == round_no]
+
+    def standings(self) -> List[Tuple[str, int]]:
+        return sorted(self.points.items(), key=lambda item: item[1], reverse=True)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Tournament":
+        data = dict(data)
+        data["kind"], data["phase"] = Kind(data["kind"]), Phase(data["phase"])
+        data["fixtures"] = [Fixture(**f) for f in data["fixtures"]]
+        return cls(**data)
+
+
+# ================= SCHEDULES =================
+def knockout_fixtures(players: List[str]) -> List[Fixture]:
+    """Single elimination; byes go to the top seeds so no fixture is empty"""
+    size = 1 << (len(players) - 1).bit_length()
+    seeds = players + [None] * (size - len(players))
+    fixtures = [Fixture(i, 0, seeds[i], seeds[size - 1 - i]) for i in range(size // 2)]
+    first, count, round_no = 0, size // 2, 0
+    while count > 1:
+        round_no += 1
+        start = len(fixtures)
+        for p in range(count):
+            fixtures[first + p].next_index = start + p // 2
+            fixtures[first + p].next_home = p % 2 == 0
+        fixtures += [Fixture(start + i, round_no) for i in range(count // 2)]
+        first, count = start, count // 2
+    return fixtures
+
+
+def league_fixtures(players: List[str]) -> List[Fixture]:
+    """Round robin by the circle method, one round per matchday"""
+    slots = players + ([None] if len(players) % 2 else [])
+    n = len(slots)
+    fixtures = []
+    for round_no in range(n - 1):
+        for i in range(n // 2):
+            home, away = slots[i], slots[n - 1 - i]
+            if home and away:
+                fixtures.append(Fixture(len(fixtures), round_no, home, away))
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return fixtures
+
+
+# ================= MANAGER =================
+class TournamentManager:
+    """
+    Registration, scheduling and result handling. Telegram I/O is injected:
+    launch(t, fixture) posts a fixture's match and returns its match id,
+    finish(t) announces the champion, expire(t) a registration that timed out.
+    """
+
+    def __init__(self, ttl: float = REGISTRATION_TTL, snapshot=None):
+        self.launch: Optional[Callable[[Tournament, Fixture], Awaitable[str]]] = None
+        self.finish: Optional[Callable[[Tournament], Awaitable[None]]] = None
+        self.expire: Optional[Callable[[Tournament], Awaitable[None]]] = None
+        self.ttl = ttl
+        self.snapshot = snapshot
+        self.lock = LockRegistry()
+        self._by_id: Dict[str, Tournament] = {}
+        self._by_chat: Dict[str, str] = {}                   # chat id -> its current tournament
+        self._by_match: Dict[str, Tuple[str, int]] = {}      # match id -> (tournament id, fixture index)
+        self._dirty = set()
+        self._removed = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, tournament_id: str) -> Optional[Tournament]:
+        return self._by_id.get(tournament_id)
+
+    def in_chat(self, chat_id: str) -> Optional[Tournament]:
+        tournament_id = self._by_chat.get(chat_id)
+        return self._by_id.get(tournament_id) if tournament_id else None
+
+    def is_tournament_match(self, match_id: str) -> bool:
+        return match_id in self._by_match
+
+    def create(self, chat_id: str, uid: str, name: str, kind: Kind, format_name: str) -> Tournament:
+        while True:
+            tournament_id = secrets.token_hex(3).upper()
+            if tournament_id not in self._by_id:
+                break
+        t = Tournament(tournament_id, chat_id, uid, kind, format_name)
+        self.join(t, uid, name)
+        self._by_id[tournament_id] = t
+        self._by_chat[chat_id] = tournament_id
+        return t
+
+    def join(self, t: Tournament, uid: str, name: str) -> bool:
+        if t.phase != Phase.REGISTERING or uid in t.names or len(t.players) >= MAX_PLAYERS:
+            return False
+        t.players.append(uid)
+        t.names[uid] = name
+        self._touch(t)
+        return True
+
+    def cancel(self, t: Tournament):
+        """Call off a tournament; fixtures already in play finish as friendlies"""
+        t.phase = Phase.CANCELLED
+        self._drop(t)
+        for f in t.fixtures:
+            self._by_match.pop(f.match_id, None)
+
+    def sweep(self, now: Optional[float] = None) -> List[Tournament]:
+        """Cancel registrations idle for longer than the TTL"""
+        cutoff = (now or time.time()) - self.ttl
+        expired = [t for t in self._by_id.values() if t.phase == Phase.REGISTERING and t.last_active < cutoff]
+        for t in expired:
+            self.cancel(t)
+        return expired
+
+    def _touch(self, t: Tournament):
+        t.last_active = time.time()
+        self._dirty.add(t.tournament_id)
+
+    def _drop(self, t: Tournament):
+        self._by_chat.pop(t.chat_id, None)
+        self._by_id.pop(t.tournament_id, None)
+        self._dirty.discard(t.tournament_id)
+        self._removed.add(t.tournament_id)
+
+    def start(self, t: Tournament):
+        """Draw the schedule and launch the first fixtures; call with the tournament lock held"""
+        random.shuffle(t.players)
+        t.fixtures = knockout_fixtures(t.players) if t.kind == Kind.KNOCKOUT else league_fixtures(t.players)
+        t.points = {uid: 0 for uid in t.players}
+        t.phase = Phase.RUNNING
+        self._touch(t)
+        ready = []
+        for f in t.round_fixtures(0):
+            if f.home and f.away:
+                ready.append(f)
+            else:
+                ready += self._decide(t, f, f.home or f.away)  # bye
+        self._dispatch(t, ready)
+
+    # ---------- results ----------
+    def _decide(self, t: Tournament, f: Fixture, winner: Optional[str], walkover: bool = False) -> List[Fixture]:
+        """Record a fixture result, return the fixtures it makes ready"""
+        f.winner, f.done, f.walkover = winner, True, walkover
+        ready = []
+        if t.kind == Kind.KNOCKOUT:
+            if f.next_index < 0:
+                t.champion = winner
+            else:
+                nxt = t.fixtures[f.next_index]
+                if f.next_home:
+                    nxt.home = winner
+                else:
+                    nxt.away = winner
+                if nxt.ready:
+                    ready.append(nxt)
+        else:
+            if winner:
+                t.points[winner] += LEAGUE_WIN_POINTS
+            elif not walkover:
+                t.points[f.home] += LEAGUE_TIE_POINTS
+                t.points[f.away] += LEAGUE_TIE_POINTS
+            if all(g.done for g in t.round_fixtures(f.round)):
+                ready = t.round_fixtures(f.round + 1)
+                if not ready:
+                    t.champion = t.standings()[0][0]
+        if ready:
+            t.round = max(g.round for g in ready)
+        if t.champion is not None or all(g.done for g in t.fixtures):
+            t.phase = Phase.FINISHED
+        return ready
+
+    async def report(self, match_id: str, winner: Optional[str], expired: bool = False):
+        """A fixture's match ended (winner None = tie, expired = timed out without a result)"""
+        entry = self._by_match.pop(match_id, None)
+        if entry is None:
+            return
+        tournament_id, index = entry
+        async with self.lock(tournament_id):
+            t = self._by_id.get(tournament_id)
+            if t is not None:
+                self._resolve(t, t.fixtures[index], winner, expired)
+
+    def _resolve(self, t: Tournament, f: Fixture, winner: Optional[str], walkover: bool):
+        if f.done:
+            return
+        if winner is None and t.kind == Kind.KNOCKOUT:
+            # Knockouts need someone to go through: a coin toss settles ties and timeouts
+            winner, walkover = random.choice((f.home, f.away)), True
+        self._dispatch(t, self._decide(t, f, winner, walkover))
+        self._touch(t)
+        if t.phase == Phase.FINISHED:
+            self._drop(t)
+            self._spawn(self.finish(t))
+
+    def match_removed(self, match_id: str):
+        """MatchStore.on_remove hook: a fixture whose match expired counts as a walkover"""
+        if match_id in self._by_match:
+            self._spawn(self.report(match_id, None, expired=True))
+
+    # ---------- launching ----------
+    def _dispatch(self, t: Tournament, fixtures: List[Fixture]):
+        if fixtures:
+            self._spawn(self._launch_all(t, fixtures))
+
+    async def _launch_all(self, t: Tournament, fixtures: List[Fixture]):
+        # One after another: the outbound scheduler paces them within the group's
+        # rate limit while fixtures already posted are being played
+        for f in fixtures:
+            if t.phase == Phase.CANCELLED:
+                return
+            try:
+                f.match_id = await self.launch(t, f)
+                if t.phase != Phase.CANCELLED:
+                    self._by_match[f.match_id] = (t.tournament_id, f.index)
+                    self._touch(t)
+            except Exception as e:
+                logger.error(f"Tournament {t.tournament_id}: could not launch fixture {f.index}: {e}")
+                async with self.lock(t.tournament_id):
+                    self._resolve(t, f, None, walkover=True)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ---------- snapshots ----------
+    async def save(self):
+        """Write changed and removed tournaments to the snapshot backend"""
+        if not self.snapshot or not (self._dirty or self._removed):
+            return
+        changed = [(k, self._by_id[k].to_dict()) for k in self._dirty if k in self._by_id]
+        removed = list(self._removed)
+        self._dirty, self._removed = set(), set()
+        try:
+            await asyncio.to_thread(self.snapshot.save_tournaments, changed, removed)
+        except Exception as e:
+            self._dirty.update(k for k, _ in changed)
+            self._removed.update(removed)
+            logger.error(f"Tournament snapshot failed: {e}")
+
+    async def load(self, live: Container[str]):
+        """
+        Restore tournaments from the snapshot; call after the matches are
+        restored (live holds their ids) and launch/finish are set. Fixtures
+        whose match did not survive count as walkovers, and fixtures that were
+        due but never posted are launched now.
+        """
+        if not self.snapshot:
+            return
+        for data in await asyncio.to_thread(self.snapshot.load_tournaments):
+            t = Tournament.from_dict(data)
+            if t.tournament_id in self._by_id:
+                continue  # still live: the bot was restarted in-process
+            if t.phase not in (Phase.REGISTERING, Phase.RUNNING):
+                self._removed.add(t.tournament_id)
+                continue
+            self._by_id[t.tournament_id] = t
+            self._by_chat[t.chat_id] = t.tournament_id
+            if t.phase == Phase.REGISTERING:
+                t.last_active = time.time()  # the downtime doesn't count against the registration
+                continue
+            for f in t.fixtures:
+                if f.match_id and not f.done:
+                    self._by_match[f.match_id] = (t.tournament_id, f.index)
+                    if f.match_id not in live:
+                        self._spawn(self.report(f.match_id, None, expired=True))
+            self._dispatch(t, [f for f in t.fixtures if f.ready and f.round <= t.round])
+        logger.info(f"Restored {len(self._by_id)} tournaments")
+
+    def start_sweeper(self, interval: float = SWEEP_INTERVAL):
+        """Start the registration sweeper/snapshot loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop_sweeper(self):
+        """Stop the loop, let a snapshot in progress finish, then write a final one"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+        await self.save()
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            for t in self.sweep():
+                logger.info(f"Tournament {t.tournament_id}: registration expired")
+                self._spawn(self.expire(t))
+            self._writing = asyncio.ensure_future(self.save())
+            await asyncio.shield(self._writing)
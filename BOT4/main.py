@@ -7,8 +7,8 @@ Complete single file with MongoDB integration
 import os
 import logging
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import uuid4
 
 # Load environment variables
@@ -34,9 +34,16 @@ from telegram.ext import (
     filters
 )
 
+# Shared helpers
+from shared import botmeta, metrics, resources, tenants, throttle, webhook
+from shared.botmeta import prebuilt
+from shared.outbound import Lane, OutboundScheduler
+from shared.supervisor import supervisor
+
 # MongoDB imports
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, PyMongoError
 
 # ================= CONFIGURATION =================
 # Load from environment variables
@@ -55,44 +62,83 @@ FSUB_CHANNEL_IDS = [
     -1003541438177
 ]  # Force subscribe channels
 
+# Values above are the defaults; each tenant's own come from its settings in Mongo
+conf = tenants.Settings(LOG_CHANNEL_ID=LOG_CHANNEL_ID, ADMIN_IDS=ADMIN_IDS, FSUB_CHANNEL_IDS=FSUB_CHANNEL_IDS)
+
+# Referral settings
+REFERRAL_REWARD = 1.0  # 💎 per verified join
+REFERRAL_FLUSH_SECONDS = 5
+REFERRAL_BATCH_SIZE = 100
+REFERRAL_CACHE_SIZE = 10000
+
+# Redemption history page size
+HISTORY_PAGE_SIZE = 5
+
+# Audit pipeline settings
+AUDIT_QUEUE_SIZE = 5000
+AUDIT_BATCH_SIZE = 200
+AUDIT_FLUSH_SECONDS = 1
+AUDIT_RETRY_BACKOFF = (1, 2, 5, 10, 30, 60)  # seconds before each further retry of failed writes
+LOG_DIGEST_SECONDS = 10
+LOG_MESSAGE_LIMIT = 4000  # Telegram caps messages at 4096 chars
+
 # Conversation states
 WAITING_CODES = 1
 
-# Logging setup
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Logging (output is set up once for the process by shared/logs.py)
 logger = logging.getLogger(__name__)
+send_logger = logging.getLogger(f"{__name__}.send")  # sampled (LOG_SAMPLE): floods of send failures
 
 # ================= DATABASE SETUP =================
 class Database:
-    def __init__(self):
+    def __init__(self, tenant: tenants.Tenant = tenants.DEFAULT):
+        self.tenant = tenant
         self.client = None
         self.db = None
+        self._referral_cache: Dict[str, int] = {}
+        self._indexing: Optional[asyncio.Task] = None
+        self.indexed = False
+        self.credits_stuck = True  # a batch may have been left half-credited by an earlier run
         self.connect()
     
     def connect(self):
-        """Connect to MongoDB"""
+        """Take the process-wide MongoDB client; it connects in the background, so this doesn't block"""
+        self.client = resources.mongo(MONGO_URI)
+        # A tenant's collections are prefixed with its id: "acme.users"
+        self.db = tenants.database(self.client.shein_bot, self.tenant)
+    
+    def start_indexing(self) -> asyncio.Task:
+        """Create indexes in a worker thread, so startup doesn't wait on MongoDB round trips"""
+        if not self.indexed and (self._indexing is None or self._indexing.done()):
+            self._indexing = asyncio.create_task(asyncio.to_thread(self.ensure_indexes))
+        return self._indexing
+    
+    def ensure_indexes(self):
+        """Create collections and indexes if missing (blocking)"""
         try:
-            self.client = MongoClient(MONGO_URI)
-            self.db = self.client.shein_bot
-            # Create collections if not exists
             self.db.users.create_index("user_id", unique=True)
+            self.db.users.create_index("referral_code", unique=True, sparse=True)
+            self.db.users.create_index("credit_batch", sparse=True)
+            self.db.users.create_index("referral_status", sparse=True)
             self.db.coupons.create_index("code", unique=True)
             self.db.redeemed.create_index([("user_id", 1), ("code", 1)], unique=True)
+            self.db.redeemed.create_index([("user_id", 1), ("redeemed_at", -1), ("_id", -1)])
             self.db.admin_logs.create_index("timestamp")
-            logger.info("✅ Connected to MongoDB")
+            self.indexed = True
+            logger.info("✅ Connected to MongoDB, indexes ready")
         except ConnectionFailure as e:
+            # Not fatal here: handlers fail on their own queries and /health shows the failed ping
             logger.error(f"❌ MongoDB connection failed: {e}")
-            raise
+        except PyMongoError as e:
+            logger.error(f"❌ MongoDB index creation failed: {e}")
     
     # ========== USER MANAGEMENT ==========
     def get_user(self, user_id: int):
         """Get user data"""
         return self.db.users.find_one({"user_id": user_id})
     
-    def create_user(self, user_id: int, username: str, first_name: str, last_name: str = ""):
+    def create_user(self, user_id: int, username: str, first_name: str, last_name: str = "",
+                    referred_by: Optional[int] = None):
         """Create new user"""
         user_data = {
             "user_id": user_id,
@@ -101,12 +147,27 @@ class Database:
             "last_name": last_name,
             "balance": 0.0,
             "referral_count": 0,
+            "redemption_count": 0,
             "referral_code": str(uuid4())[:8],
             "created_at": datetime.now(),
             "last_active": datetime.now(),
             "is_banned": False
         }
-        self.db.users.insert_one(user_data)
+        if referred_by:
+            # Credited later, once the user passes the channel check
+            user_data["referred_by"] = referred_by
+            user_data["referral_status"] = "pending"
+        
+        for _ in range(3):
+            try:
+                self.db.users.insert_one(user_data)
+                break
+            except DuplicateKeyError as e:
+                if "referral_code" not in (e.details or {}).get("keyPattern", {}):
+                    raise
+                user_data.pop("_id", None)
+                user_data["referral_code"] = str(uuid4())[:8]
+        self._cache_referral_code(user_data["referral_code"], user_id)
         return user_data
     
     def update_user_activity(self, user_id: int):
@@ -128,6 +189,81 @@ class Database:
         user = self.get_user(user_id)
         return user.get("balance", 0.0) if user else 0.0
     
+    # ========== REFERRALS ==========
+    def _cache_referral_code(self, code: str, user_id: int):
+        if len(self._referral_cache) >= REFERRAL_CACHE_SIZE:
+            # Codes never change, so evicting the oldest entry is enough
+            self._referral_cache.pop(next(iter(self._referral_cache)))
+        self._referral_cache[code] = user_id
+    
+    def get_referrer_id(self, code: str) -> Optional[int]:
+        """Resolve a referral code to its owner's user id"""
+        user_id = self._referral_cache.get(code)
+        if user_id is None:
+            user = self.db.users.find_one({"referral_code": code}, {"user_id": 1})
+            if not user:
+                return None
+            user_id = user["user_id"]
+            self._cache_referral_code(code, user_id)
+        return user_id
+    
+    def credit_referrals(self, user_ids: List[int], amount: float) -> Dict[int, int]:
+        """
+        Credit the referrers of verified users.
+        Each referred user goes pending -> crediting (tagged with a batch id)
+        -> credited, and a referrer is paid for a batch at most once, so a
+        batch that failed halfway is finished by the next call without ever
+        paying twice. Returns the joins credited per referrer.
+        """
+        counts: Dict[int, int] = {}
+        if self.credits_stuck:
+            for batch_id in self.db.users.distinct("credit_batch", {"referral_status": "crediting"}):
+                for referrer_id, joins in self._apply_credit_batch(batch_id, amount).items():
+                    counts[referrer_id] = counts.get(referrer_id, 0) + joins
+            self.credits_stuck = False
+        
+        if user_ids:
+            batch_id = str(uuid4())
+            self.db.users.update_many(
+                {"user_id": {"$in": user_ids}, "referral_status": "pending"},
+                {"$set": {"referral_status": "crediting", "credit_batch": batch_id}}
+            )
+            for referrer_id, joins in self._apply_credit_batch(batch_id, amount).items():
+                counts[referrer_id] = counts.get(referrer_id, 0) + joins
+        return counts
+    
+    def _apply_credit_batch(self, batch_id: str, amount: float) -> Dict[int, int]:
+        """Pay the referrers of one crediting batch, then mark its users credited"""
+        self.credits_stuck = True  # until this batch is through
+        counts: Dict[int, int] = {}
+        for user in self.db.users.find({"credit_batch": batch_id, "referral_status": "crediting"}, {"referred_by": 1}):
+            referrer_id = user["referred_by"]
+            counts[referrer_id] = counts.get(referrer_id, 0) + 1
+        
+        if counts:
+            # The batch id on the referrer makes a re-run of this step a no-op for them
+            self.db.users.bulk_write([
+                UpdateOne(
+                    {"user_id": referrer_id, "credit_batches": {"$ne": batch_id}},
+                    {"$inc": {"balance": amount * joins, "referral_count": joins},
+                     "$addToSet": {"credit_batches": batch_id}}
+                )
+                for referrer_id, joins in counts.items()
+            ], ordered=False)
+        
+        self.db.users.update_many(
+            {"credit_batch": batch_id, "referral_status": "crediting"},
+            {"$set": {"referral_status": "credited", "credited_at": datetime.now()}}
+        )
+        if counts:
+            # Nothing can re-run the batch now; a failure here only leaves a stale id behind
+            self.db.users.update_many(
+                {"user_id": {"$in": list(counts)}},
+                {"$pull": {"credit_batches": batch_id}}
+            )
+        self.credits_stuck = False
+        return counts
+    
     # ========== COUPON MANAGEMENT ==========
     def get_coupon_stock(self):
         """Get current coupon stock"""
@@ -191,34 +327,93 @@ class Database:
             }
         )
         
-        if result.modified_count > 0:
-            # Record redemption
-            self.db.redeemed.insert_one({
-                "user_id": user_id,
-                "code": code,
-                "redeemed_at": datetime.now()
-            })
-            return True
-        return False
+        # The redemption record itself is written by the audit pipeline
+        return result.modified_count > 0
     
     # ========== REDEMPTION HISTORY ==========
-    def get_user_redemptions(self, user_id: int):
-        """Get user's redemption history"""
-        return list(self.db.redeemed.find({"user_id": user_id}).sort("redeemed_at", -1))
-    
-    def get_redemption_count(self, user_id: int):
-        """Get user's redemption count"""
-        return self.db.redeemed.count_documents({"user_id": user_id})
+    @staticmethod
+    def _insert_new(collection, documents: List[dict]) -> List[dict]:
+        """
+        Insert a batch, skipping documents already stored; returns the ones that failed.
+        insert_many gives each document its _id before sending it, so a retried
+        document that did go in the first time is a duplicate key error (11000),
+        not a second copy.
+        """
+        try:
+            collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            return [documents[error["index"]] for error in e.details.get("writeErrors", [])
+                    if error.get("code") != 11000]
+        return []
+    
+    def record_redemptions(self, redemptions: List[dict]) -> List[dict]:
+        """Insert a batch of redemption records and update the users' counters; returns the records to retry"""
+        retry = self._insert_new(self.db.redeemed, redemptions)
+        retrying = {id(redemption) for redemption in retry}
+        user_ids = {r["user_id"] for r in redemptions if id(r) not in retrying}
+        if user_ids:
+            self._recount_redemptions(user_ids)
+        return retry
+    
+    def _recount_redemptions(self, user_ids: Set[int]):
+        # Counted from the records rather than $inc'd, so a batch that is retried
+        # after any partial failure still leaves every counter exact
+        counts = {
+            doc["_id"]: doc["n"]
+            for doc in self.db.redeemed.aggregate([
+                {"$match": {"user_id": {"$in": list(user_ids)}}},
+                {"$group": {"_id": "$user_id", "n": {"$sum": 1}}},
+            ])
+        }
+        self.db.users.bulk_write([
+            UpdateOne({"user_id": user_id}, {"$set": {"redemption_count": counts.get(user_id, 0)}})
+            for user_id in user_ids
+        ], ordered=False)
+    
+    def get_user_redemptions(self, user_id: int, limit: int = HISTORY_PAGE_SIZE,
+                             before: Optional[Tuple[datetime, Optional[ObjectId]]] = None) -> Tuple[List[dict], bool]:
+        """
+        Get one page of redemption history, newest first, and whether older ones exist.
+        before is the (redeemed_at, _id) of the last row shown: records of one batch can
+        share a timestamp, so the _id breaks the tie and none is skipped at a page boundary.
+        """
+        query = {"user_id": user_id}
+        if before is not None:
+            redeemed_at, last_id = before
+            if last_id is None:
+                query["redeemed_at"] = {"$lt": redeemed_at}  # cursor from before the tie-break
+            else:
+                query["$or"] = [
+                    {"redeemed_at": {"$lt": redeemed_at}},
+                    {"redeemed_at": redeemed_at, "_id": {"$lt": last_id}},
+                ]
+        
+        page = list(
+            self.db.redeemed.find(query, {"code": 1, "redeemed_at": 1})
+            .sort([("redeemed_at", -1), ("_id", -1)])
+            .limit(limit + 1)
+        )
+        return page[:limit], len(page) > limit
+    
+    def get_redemption_count(self, user_id: int, user_data: Optional[dict] = None):
+        """Get user's redemption count from the user document"""
+        if user_data is None:
+            user_data = self.db.users.find_one({"user_id": user_id}, {"redemption_count": 1})
+        if user_data and "redemption_count" in user_data:
+            return user_data["redemption_count"]
+        
+        # Users created before the counter existed, backfill once
+        count = self.db.redeemed.count_documents({"user_id": user_id})
+        self.db.users.update_one(
+            {"user_id": user_id, "redemption_count": {"$exists": False}},
+            {"$set": {"redemption_count": count}}
+        )
+        return count
     
     # ========== ADMIN LOGS ==========
-    def log_admin_action(self, admin_id: int, action: str, details: str = ""):
-        """Log admin actions"""
-        self.db.admin_logs.insert_one({
-            "admin_id": admin_id,
-            "action": action,
-            "details": details,
-            "timestamp": datetime.now()
-        })
+    def record_admin_logs(self, entries: List[dict]) -> List[dict]:
+        """Insert a batch of admin log entries; returns the entries to retry"""
+        return self._insert_new(self.db.admin_logs, entries)
     
     def get_stats(self):
         """Get bot statistics"""
@@ -237,27 +432,245 @@ class Database:
             "available_coupons": total_coupons - used_coupons
         }
 
-# Initialize database
-db = Database()
+# One Database per tenant, picked by the tenant the current update belongs to
+db = tenants.Scoped(Database)
+
+# ================= REFERRAL PIPELINE =================
+class ReferralBatcher:
+    """Collects verified referral joins and credits referrers in batches"""
+    
+    def __init__(self, flush_interval: float = REFERRAL_FLUSH_SECONDS, batch_size: int = REFERRAL_BATCH_SIZE):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pending = set()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._writing = None
+    
+    def add(self, user_id: int):
+        """Queue a user who just passed the channel check"""
+        self.pending.add(user_id)
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+    
+    def start(self, bot):
+        """Start the background flush loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(bot))
+    
+    async def _run(self, bot):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # Shielded: stop() cancels the wait, never a flush halfway through
+            self._writing = asyncio.ensure_future(self._safe_flush(bot))
+            await asyncio.shield(self._writing)
+    
+    async def _safe_flush(self, bot):
+        try:
+            await self.flush(bot)
+        except Exception as e:
+            logger.error(f"Referral flush failed: {e}")
+    
+    async def stop(self, bot):
+        """Stop the flush loop and credit whatever is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+        await self._safe_flush(bot)
+    
+    async def flush(self, bot):
+        """Credit everything queued so far (and any batch left half-done) and notify the referrers"""
+        if not self.pending and not db.credits_stuck:
+            return
+        user_ids, self.pending = list(self.pending), set()
+        try:
+            counts = await asyncio.to_thread(db.credit_referrals, user_ids, REFERRAL_REWARD)
+        except Exception:
+            # Users not yet moved are still pending and go again; a batch that got further
+            # is left "crediting" and finished by the next flush
+            self.pending.update(user_ids)
+            raise
+        
+        for referrer_id, joins in counts.items():
+            try:
+                await bot.send_message(
+                    chat_id=referrer_id,
+                    text=f"🎉 <b>{joins} verified join(s)!</b>\n\n"
+                         f"+{joins * REFERRAL_REWARD:.1f} 💎 added to your balance.",
+                    parse_mode="HTML",
+                    rate_limit_args=Lane.NORMAL
+                )
+            except Exception as e:
+                send_logger.error(f"Failed to notify referrer {referrer_id}: {e}")
+
+referral_batcher = tenants.Scoped(lambda t: ReferralBatcher())
+
+# ================= AUDIT PIPELINE =================
+AUDIT_STOP = object()  # queued by AuditLog.stop() to end the worker
+
+class AuditLog:
+    """
+    Takes redemption records, admin logs and log-channel messages off the
+    request path. A background worker batch-inserts the records and posts
+    the channel messages as one digest every LOG_DIGEST_SECONDS. Records
+    whose write fails are kept and written again after a backoff; only the
+    ones still failing when the bot stops are given up (and logged in full).
+    """
+    
+    def __init__(self, maxsize: int = AUDIT_QUEUE_SIZE):
+        self.queue = asyncio.Queue(maxsize)
+        self.writers = {
+            "redeemed": db.record_redemptions,
+            "admin_logs": db.record_admin_logs,
+        }
+        self.digest: List[str] = []
+        self.stats = {"queued": 0, "written": 0, "sent": 0, "dropped": 0, "retried": 0, "failed": 0}
+        self.retry: Dict[str, List[dict]] = {}   # collection -> records whose write failed
+        self._retry_at = 0.0
+        self._retry_attempts = 0
+        self._task = None
+    
+    async def record(self, collection: str, document: dict):
+        """Queue a database record; waits when the queue is full rather than losing it"""
+        await self.queue.put((collection, document))
+        self.stats["queued"] += 1
+    
+    def log(self, message: str):
+        """Queue a log-channel message; dropped (and counted) when the queue is full"""
+        try:
+            self.queue.put_nowait((None, message))
+            self.stats["queued"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+    
+    def start(self, bot):
+        """Start the background worker"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(bot))
+    
+    async def _run(self, bot):
+        loop = asyncio.get_running_loop()
+        next_digest = loop.time() + LOG_DIGEST_SECONDS
+        while True:
+            timeout = min(AUDIT_FLUSH_SECONDS, max(0, next_digest - loop.time()))
+            batch = await self._next_batch(timeout)
+            stopping = any(collection is AUDIT_STOP for collection, _ in batch)
+            await self._write([item for item in batch if item[0] is not AUDIT_STOP])
+            if stopping:
+                return
+            if loop.time() >= next_digest:
+                await self._send_digest(bot)
+                next_digest = loop.time() + LOG_DIGEST_SECONDS
+    
+    async def _next_batch(self, timeout: float) -> List[tuple]:
+        batch = []
+        try:
+            batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+        except asyncio.TimeoutError:
+            return batch
+        while len(batch) < AUDIT_BATCH_SIZE and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+    
+    async def _write(self, batch: List[tuple], retry_now: bool = False):
+        documents: Dict[str, List[dict]] = {}
+        now = asyncio.get_running_loop().time()
+        retrying = bool(self.retry) and (retry_now or now >= self._retry_at)
+        if retrying:
+            documents, self.retry = self.retry, {}
+        for collection, item in batch:
+            if collection is None:
+                self.digest.append(item)
+            else:
+                documents.setdefault(collection, []).append(item)
+        
+        failed = 0
+        for collection, docs in documents.items():
+            try:
+                retry = await asyncio.to_thread(self.writers[collection], docs)
+            except Exception as e:
+                retry = docs  # nothing known to be written; the duplicate check makes a rewrite safe
+                logger.error(f"Audit write to {collection} failed: {e}")
+            self.stats["written"] += len(docs) - len(retry)
+            if retry:
+                self.retry.setdefault(collection, []).extend(retry)
+                failed += len(retry)
+        
+        if failed:
+            delay = AUDIT_RETRY_BACKOFF[min(self._retry_attempts, len(AUDIT_RETRY_BACKOFF) - 1)]
+            self._retry_attempts += 1
+            self._retry_at = now + delay
+            self.stats["retried"] += failed
+            logger.warning(f"⚠️ {failed} audit record(s) not written, retrying in {delay}s")
+        elif retrying:
+            self._retry_attempts = 0
+    
+    async def _send_digest(self, bot):
+        messages, self.digest = self.digest, []
+        chunk = ""
+        for message in messages:
+            if chunk and len(chunk) + len(message) + 2 > LOG_MESSAGE_LIMIT:
+                await self._send(bot, chunk)
+                chunk = ""
+            chunk = f"{chunk}\n\n{message}" if chunk else message
+        if chunk:
+            await self._send(bot, chunk)
+    
+    async def _send(self, bot, text: str):
+        try:
+            await bot.send_message(chat_id=conf.LOG_CHANNEL_ID, text=text, parse_mode="HTML")
+            self.stats["sent"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Failed to send log digest: {e}")
+    
+    async def stop(self, bot):
+        """Let the worker finish its batch and stop, then write and send everything left"""
+        if self._task is not None and not self._task.done():
+            # Queued behind the pending records, so nothing before it is lost
+            await self.queue.put((AUDIT_STOP, None))
+            await self._task
+        self._task = None
+        await self.flush(bot)
+    
+    async def flush(self, bot):
+        """Write and send everything still buffered, including records waiting for a retry"""
+        batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        await self._write(batch, retry_now=True)
+        for collection, docs in self.retry.items():
+            # Last chance before the process goes: keep them in the log for a manual fix
+            self.stats["failed"] += len(docs)
+            logger.error(f"❌ Gave up on {len(docs)} {collection} record(s): {docs}")
+        self.retry = {}
+        await self._send_digest(bot)
+
+audit_log = tenants.Scoped(lambda t: AuditLog())
+
+async def stop_pipelines(bot):
+    """Drain the referral and audit pipelines before the bot shuts down"""
+    await referral_batcher.stop(bot)
+    await audit_log.stop(bot)
 
 # ================= HELPER FUNCTIONS =================
 async def send_log_message(context: ContextTypes.DEFAULT_TYPE, message: str):
-    """Send message to log channel"""
-    try:
-        await context.bot.send_message(
-            chat_id=LOG_CHANNEL_ID,
-            text=message,
-            parse_mode="HTML"
-        )
-    except Exception as e:
-        logger.error(f"Failed to send log message: {e}")
+    """Queue message for the next log channel digest"""
+    audit_log.log(message)
 
 async def check_user_subscription(user_id: int, context: ContextTypes.DEFAULT_TYPE) -> bool:
     """Check if user is subscribed to all required channels"""
-    if not FSUB_CHANNEL_IDS:
+    if not conf.FSUB_CHANNEL_IDS:
         return True
     
-    for channel_id in FSUB_CHANNEL_IDS:
+    for channel_id in conf.FSUB_CHANNEL_IDS:
         try:
             member = await context.bot.get_chat_member(chat_id=channel_id, user_id=user_id)
             if member.status in ['left', 'kicked']:
@@ -268,6 +681,7 @@ async def check_user_subscription(user_id: int, context: ContextTypes.DEFAULT_TY
     
     return True
 
+@prebuilt
 def get_main_keyboard():
     """Get main reply keyboard"""
     keyboard = [
@@ -276,6 +690,7 @@ def get_main_keyboard():
     ]
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
 
+@prebuilt
 def get_admin_keyboard():
     """Get admin keyboard"""
     keyboard = [
@@ -285,6 +700,76 @@ def get_admin_keyboard():
     ]
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
 
+@prebuilt
+def get_withdraw_keyboard():
+    """Get withdraw amount keyboard"""
+    keyboard = [
+        [
+            InlineKeyboardButton("1 💎 = 500 ₪", callback_data="redeem_500"),
+            InlineKeyboardButton("4 💎 = 1000 ₪", callback_data="redeem_1000")
+        ],
+        [
+            InlineKeyboardButton("15 💎 = 2000 ₪", callback_data="redeem_2000"),
+            InlineKeyboardButton("25 💎 = 4000 ₪", callback_data="redeem_4000")
+        ],
+        [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+@prebuilt
+def get_admin_panel_keyboard():
+    """Get admin panel inline keyboard"""
+    keyboard = [
+        [
+            InlineKeyboardButton("➕ Add 500 Coupons", callback_data="admin_add_500"),
+            InlineKeyboardButton("➕ Add 1000 Coupons", callback_data="admin_add_1000")
+        ],
+        [
+            InlineKeyboardButton("➕ Add 2000 Coupons", callback_data="admin_add_2000"),
+            InlineKeyboardButton("➕ Add 4000 Coupons", callback_data="admin_add_4000")
+        ],
+        [
+            InlineKeyboardButton("📊 Statistics", callback_data="admin_stats"),
+            InlineKeyboardButton("🔄 Reload Data", callback_data="admin_reload")
+        ],
+        [InlineKeyboardButton("🔙 Back to Main", callback_data="back_to_main")]
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+EPOCH = datetime(1970, 1, 1)
+
+def history_cursor(redemption: dict) -> str:
+    """(redeemed_at, _id) of a row as callback data; milliseconds, like MongoDB stores them, fit the 64-byte limit"""
+    millis = (redemption["redeemed_at"] - EPOCH) // timedelta(milliseconds=1)
+    return f"{millis}_{redemption['_id']}"
+
+def parse_history_cursor(cursor: str) -> Tuple[datetime, Optional[ObjectId]]:
+    millis, _, last_id = cursor.partition("_")
+    if not last_id:
+        return datetime.fromisoformat(millis), None  # buttons sent before the _id tie-break
+    return EPOCH + timedelta(milliseconds=int(millis)), ObjectId(last_id)
+
+def get_history_keyboard(redemptions: List[dict], next_offset: int, has_more: bool, is_first_page: bool):
+    """Get redemption history pagination keyboard"""
+    row = []
+    if not is_first_page:
+        row.append(InlineKeyboardButton("🔝 Latest", callback_data="history_top"))
+    if has_more:
+        row.append(InlineKeyboardButton("⬅️ Older", callback_data=f"history_{next_offset}_{history_cursor(redemptions[-1])}"))
+    return InlineKeyboardMarkup([row]) if row else None
+
+def format_redemptions(redemptions: List[dict], offset: int = 0):
+    """Format a page of redemption history"""
+    if not redemptions:
+        return "\nNo redemptions yet."
+    
+    lines = []
+    for i, redemption in enumerate(redemptions, offset + 1):
+        code = redemption.get("code", "N/A")
+        time = redemption.get("redeemed_at", datetime.now()).strftime("%Y-%m-%d %H:%M")
+        lines.append(f"\n{i}. {code} - {time}")
+    return "".join(lines)
+
 def format_stock_message(stock):
     """Format stock message"""
     return (
@@ -304,12 +789,20 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Check if user exists
     user_data = db.get_user(user_id)
     if not user_data:
+        # Resolve /start <referral_code>
+        referred_by = None
+        if context.args:
+            referrer_id = db.get_referrer_id(context.args[0])
+            if referrer_id and referrer_id != user_id:
+                referred_by = referrer_id
+        
         # Create new user
         user_data = db.create_user(
             user_id=user_id,
             username=user.username,
             first_name=user.first_name,
-            last_name=user.last_name or ""
+            last_name=user.last_name or "",
+            referred_by=referred_by
         )
         
         # Send new user notification to log channel
@@ -329,11 +822,11 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if not is_subscribed:
         # Create channel list message
-        channels_text = "\n".join([f"• Channel {i+1}" for i in range(len(FSUB_CHANNEL_IDS))])
+        channels_text = "\n".join([f"• Channel {i+1}" for i in range(len(conf.FSUB_CHANNEL_IDS))])
         
         # Create inline keyboard with channel links
         keyboard = []
-        for i, channel_id in enumerate(FSUB_CHANNEL_IDS):
+        for i, channel_id in enumerate(conf.FSUB_CHANNEL_IDS):
             try:
                 chat = await context.bot.get_chat(channel_id)
                 keyboard.append([InlineKeyboardButton(
@@ -354,8 +847,12 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
+    # Verified join, credit the referrer
+    if user_data.get("referral_status") == "pending":
+        referral_batcher.add(user_id)
+    
     # Send welcome message
-    if user_id in ADMIN_IDS:
+    if user_id in conf.ADMIN_IDS:
         reply_markup = get_admin_keyboard()
     else:
         reply_markup = get_main_keyboard()
@@ -383,7 +880,9 @@ async def check_join_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
     is_subscribed = await check_user_subscription(user_id, context)
     
     if is_subscribed:
-        if user_id in ADMIN_IDS:
+        referral_batcher.add(user_id)
+        
+        if user_id in conf.ADMIN_IDS:
             reply_markup = get_admin_keyboard()
         else:
             reply_markup = get_main_keyboard()
@@ -414,19 +913,19 @@ async def handle_my_link(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     referral_code = user_data.get("referral_code", str(uuid4())[:8])
-    bot_username = (await context.bot.get_me()).username
-    referral_link = f"https://t.me/{bot_username}?start={referral_code}"
+    meta = botmeta.get(context.bot)
+    referral_link = meta.deep_link(referral_code)
     
     message = (
         "🔗 <b>Your Referral Link</b>\n\n"
         f"{referral_link}\n\n"
         "🎉 <b>Invite friends & earn rewards</b>\n"
-        "Get 1 ❤️ for every verified join\n\n"
+        f"Get {REFERRAL_REWARD:g} 💎 for every verified join\n\n"
         "<i>Share this link to start earning!</i>"
     )
     
     keyboard = [
-        [InlineKeyboardButton("📤 Share Link", url=f"https://t.me/share/url?url={referral_link}&text=Get%20FREE%20SHEIN%20Coupons%20🎁")],
+        [InlineKeyboardButton("📤 Share Link", url=meta.share_url(referral_link, "Get FREE SHEIN Coupons 🎁"))],
         [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
     ]
     
@@ -447,7 +946,7 @@ async def handle_balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     balance = user_data.get("balance", 0.0)
-    redemption_count = db.get_redemption_count(user_id)
+    redemption_count = db.get_redemption_count(user_id, user_data)
     
     message = (
         "💎 <b>Balance</b>\n\n"
@@ -457,17 +956,37 @@ async def handle_balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     
     # Get recent redemptions
-    redemptions = db.get_user_redemptions(user_id)[:5]  # Last 5 redemptions
+    redemptions, has_more = db.get_user_redemptions(user_id)
+    message += format_redemptions(redemptions)
+    
+    await update.message.reply_text(
+        message,
+        parse_mode="HTML",
+        reply_markup=get_history_keyboard(redemptions, HISTORY_PAGE_SIZE, has_more, True)
+    )
+
+async def handle_history_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle redemption history pagination callback"""
+    query = update.callback_query
+    await query.answer()
+    
+    user_id = query.from_user.id
     
-    if redemptions:
-        for i, redemption in enumerate(redemptions, 1):
-            code = redemption.get("code", "N/A")
-            time = redemption.get("redeemed_at", datetime.now()).strftime("%Y-%m-%d %H:%M")
-            message += f"\n{i}. {code} - {time}"
+    # history_top or history_<offset>_<redeemed_at ms>_<_id> of the last shown row
+    if query.data == "history_top":
+        offset, before = 0, None
     else:
-        message += "\nNo redemptions yet."
+        _, offset, cursor = query.data.split("_", 2)
+        offset, before = int(offset), parse_history_cursor(cursor)
     
-    await update.message.reply_text(message, parse_mode="HTML")
+    redemptions, has_more = db.get_user_redemptions(user_id, before=before)
+    
+    message = "💎 <b>Redeem History</b>\n" + format_redemptions(redemptions, offset)
+    await query.edit_message_text(
+        message,
+        parse_mode="HTML",
+        reply_markup=get_history_keyboard(redemptions, offset + HISTORY_PAGE_SIZE, has_more, offset == 0)
+    )
 
 async def handle_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Coupon Stock button"""
@@ -490,19 +1009,6 @@ async def handle_withdraw(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    # Show withdrawal options
-    keyboard = [
-        [
-            InlineKeyboardButton("1 💎 = 500 ₪", callback_data="redeem_500"),
-            InlineKeyboardButton("4 💎 = 1000 ₪", callback_data="redeem_1000")
-        ],
-        [
-            InlineKeyboardButton("15 💎 = 2000 ₪", callback_data="redeem_2000"),
-            InlineKeyboardButton("25 💎 = 4000 ₪", callback_data="redeem_4000")
-        ],
-        [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
-    ]
-    
     message = (
         "💸 <b>Withdraw</b>\n\n"
         f"<b>Total Balance:</b> {balance:.1f} 💎\n"
@@ -512,7 +1018,7 @@ async def handle_withdraw(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         message,
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=get_withdraw_keyboard()
     )
 
 async def handle_redeem(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -563,6 +1069,11 @@ async def handle_redeem(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Mark coupon as used and deduct balance
     if db.mark_coupon_used(coupon["code"], user_id):
         db.increment_balance(user_id, -cost)
+        await audit_log.record("redeemed", {
+            "user_id": user_id,
+            "code": coupon["code"],
+            "redeemed_at": datetime.now()
+        })
         
         # Send success message
         await query.edit_message_text(
@@ -598,7 +1109,7 @@ async def back_to_main_callback(update: Update, context: ContextTypes.DEFAULT_TY
     
     user_id = query.from_user.id
     
-    if user_id in ADMIN_IDS:
+    if user_id in conf.ADMIN_IDS:
         reply_markup = get_admin_keyboard()
     else:
         reply_markup = get_main_keyboard()
@@ -621,27 +1132,10 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /admin command"""
     user_id = update.effective_user.id
     
-    if user_id not in ADMIN_IDS:
+    if user_id not in conf.ADMIN_IDS:
         await update.message.reply_text("❌ Access denied!")
         return
     
-    # Admin panel keyboard
-    keyboard = [
-        [
-            InlineKeyboardButton("➕ Add 500 Coupons", callback_data="admin_add_500"),
-            InlineKeyboardButton("➕ Add 1000 Coupons", callback_data="admin_add_1000")
-        ],
-        [
-            InlineKeyboardButton("➕ Add 2000 Coupons", callback_data="admin_add_2000"),
-            InlineKeyboardButton("➕ Add 4000 Coupons", callback_data="admin_add_4000")
-        ],
-        [
-            InlineKeyboardButton("📊 Statistics", callback_data="admin_stats"),
-            InlineKeyboardButton("🔄 Reload Data", callback_data="admin_reload")
-        ],
-        [InlineKeyboardButton("🔙 Back to Main", callback_data="back_to_main")]
-    ]
-    
     stats = db.get_stats()
     
     message = (
@@ -657,7 +1151,7 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         message,
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+        reply_markup=get_admin_panel_keyboard()
     )
 
 async def admin_add_coupons(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -666,7 +1160,7 @@ async def admin_add_coupons(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     user_id = query.from_user.id
-    if user_id not in ADMIN_IDS:
+    if user_id not in conf.ADMIN_IDS:
         await query.edit_message_text("❌ Access denied!")
         return
     
@@ -697,7 +1191,7 @@ async def admin_add_coupons(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def admin_receive_codes(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Receive coupon codes from admin"""
     user_id = update.effective_user.id
-    if user_id not in ADMIN_IDS:
+    if user_id not in conf.ADMIN_IDS:
         return ConversationHandler.END
     
     amount = context.user_data.get("admin_coupon_amount", 500)
@@ -710,7 +1204,12 @@ async def admin_receive_codes(update: Update, context: ContextTypes.DEFAULT_TYPE
     added_count = db.add_coupons(amount, codes)
     
     # Log admin action
-    db.log_admin_action(user_id, f"add_coupons_{amount}", f"Added {added_count} coupons")
+    await audit_log.record("admin_logs", {
+        "admin_id": user_id,
+        "action": f"add_coupons_{amount}",
+        "details": f"Added {added_count} coupons",
+        "timestamp": datetime.now()
+    })
     
     # Send confirmation
     await update.message.reply_text(
@@ -744,7 +1243,7 @@ async def admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     user_id = query.from_user.id
-    if user_id not in ADMIN_IDS:
+    if user_id not in conf.ADMIN_IDS:
         await query.edit_message_text("❌ Access denied!")
         return
     
@@ -811,13 +1310,19 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await admin_command(update, context)
 
 # ================= MAIN FUNCTION =================
-async def start_bot4():
-    """Start Bot 4 with python-telegram-bot"""
+async def start_bot4(tenant_id: str = ""):
+    """Start Bot 4 with python-telegram-bot, as the default bot or as one tenant's copy"""
+    tenant = await tenants.start_as("bot4", tenant_id)
     # Build application
     app = Application.builder() \
-        .token(BOT4_TOKEN) \
+        .token(tenant.token or BOT4_TOKEN) \
+        .rate_limiter(OutboundScheduler(tenant.name, background_chats=[conf.LOG_CHANNEL_ID])) \
+        .request(resources.telegram_request()) \
         .build()
     
+    # Indexes build while the bot initializes instead of at import
+    db.start_indexing()
+    
     # Add conversation handlers for admin
     admin_conv_handler = ConversationHandler(
         entry_points=[
@@ -840,6 +1345,7 @@ async def start_bot4():
     # Callback query handlers
     app.add_handler(CallbackQueryHandler(check_join_callback, pattern="^check_join$"))
     app.add_handler(CallbackQueryHandler(handle_redeem, pattern="^redeem_"))
+    app.add_handler(CallbackQueryHandler(handle_history_page, pattern="^history_"))
     app.add_handler(CallbackQueryHandler(admin_stats, pattern="^admin_stats$"))
     app.add_handler(CallbackQueryHandler(admin_reload_callback, pattern="^admin_reload$"))
     app.add_handler(CallbackQueryHandler(back_to_main_callback, pattern="^back_to_main$"))
@@ -851,30 +1357,48 @@ async def start_bot4():
     # Message handlers for buttons
     app.add_handler(MessageHandler(filters.Regex("^(🔗 My Link|💎 Balance|🎟 Coupon Stock|💸 Withdraw|👑 Admin Panel)$"), handle_message))
     
+    # Rate limits: a join check asks every force-sub channel, a withdrawal or redemption hits the coupon stock
+    throttle.install(app, tenant.name, [
+        throttle.Rule("withdraw", 3, 60, text=r"^💸 Withdraw$"),
+        throttle.Rule("redeem", 5, 60, callback=r"^redeem_"),
+        throttle.Rule("check_join", 5, 60, callback=r"^check_join$"),
+    ])
+    
     # Initialize and start
     await app.initialize()
+    meta = await botmeta.load(app)
+    metrics.instrument(app, tenant.name)
+    supervisor.attach(
+        tenant.name, app,
+        ping=lambda: asyncio.to_thread(db.get(tenant).client.admin.command, "ping"),
+        # The supervisor calls this from its own task, outside the tenant's context
+        on_stop=tenants.within(tenant, lambda: stop_pipelines(app.bot)),
+    )
     await app.start()
     
-    logger.info("🤖 Bot 4 Started Successfully")
-    logger.info(f"👑 Admins: {len(ADMIN_IDS)} users")
-    logger.info(f"📢 Force Sub Channels: {len(FSUB_CHANNEL_IDS)} channels")
+    logger.info(f"🤖 Bot 4 Started Successfully ({tenant.name})")
+    logger.info(f"👑 Admins: {len(conf.ADMIN_IDS)} users")
+    logger.info(f"📢 Force Sub Channels: {len(conf.FSUB_CHANNEL_IDS)} channels")
     
-    # Get bot info
-    bot_info = await app.bot.get_me()
-    logger.info(f"🤖 Bot Username: @{bot_info.username}")
+    # Bot info was fetched by initialize()
+    logger.info(f"🤖 Bot Username: @{meta.username}")
     
     # Send startup message to log channel
     startup_message = (
         "🚀 <b>Bot Started Successfully!</b>\n\n"
-        f"🤖 Bot: @{bot_info.username}\n"
-        f"👑 Admins: {len(ADMIN_IDS)}\n"
-        f"📢 Channels: {len(FSUB_CHANNEL_IDS)}\n"
+        f"🤖 Bot: @{meta.username}\n"
+        f"👑 Admins: {len(conf.ADMIN_IDS)}\n"
+        f"📢 Channels: {len(conf.FSUB_CHANNEL_IDS)}\n"
         f"🕒 Time: {datetime.now().strftime('%Y-%m-%d %I:%M:%S %p')}"
     )
     await send_log_message(app, startup_message)
     
-    # Start polling
-    await app.updater.start_polling()
+    # Start referral crediting and the audit writer
+    referral_batcher.start(app.bot)
+    audit_log.start(app.bot)
+    
+    # Start receiving updates (webhook, or polling as a fallback)
+    await webhook.start_updates(tenant.name, app)
 
 async def post_init(application: Application):
     """Post initialization"""
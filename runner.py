@@ -1,33 +1,40 @@
+import time
+PROCESS_STARTED = time.time()  # before any heavy import, for the startup report
+
 import asyncio
+import logging
 import os
+import signal
 import threading
-import sys
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from flask import Flask, jsonify
-
-# Add bot directories to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'BOT'))
-sys.path.append(os.path.join(os.path.dirname(__file__), 'BOT1'))
-sys.path.append(os.path.join(os.path.dirname(__file__), 'BOT3'))
-sys.path.append(os.path.join(os.path.dirname(__file__), 'BOT4'))
-
-# Import bot functions
-try:
-    from BOT.main import start_bot1
-    from BOT1.main import start_bot2
-    from BOT3.main import start_bot3
-    from BOT4.main import start_bot4
-    BOTS_AVAILABLE = True
-except ImportError as e:
-    print(f"❌ Import Error: {e}")
-    BOTS_AVAILABLE = False
+from flask import Flask, Response, jsonify, request
+
+from shared import logs, metrics, registry, webhook
+from shared.supervisor import supervisor
+from shared.workers import WORKERS, WorkerPool
+
+# Before any bot module is imported: they only get loggers, this sets the output
+logs.setup()
+logger = logging.getLogger("runner")
+
+# Bots come from the registry (this repo's, installed entry points, BOTS_CONFIG)
+# and are imported when they start: a module that fails to import (missing
+# dependency, bad config) only takes down its own bot
+BOT_SPECS = registry.enabled(registry.load_specs())
+BOT_STARTERS = {name: registry.starter(spec) for name, spec in BOT_SPECS.items()}
+BOTS_AVAILABLE = bool(BOT_SPECS)
+supervisor.process_started = PROCESS_STARTED
 
 SECRET_KEY = os.getenv("RESTART_KEY", "mysecret")
 PORT = int(os.getenv("PORT", 10000))
+STOP_DEADLINE = float(os.getenv("STOP_DEADLINE_SECONDS", 10))
+LIFECYCLE_TIMEOUT = STOP_DEADLINE + 120  # drain, flush and (for restarts) a fresh start
+
+# WORKERS > 1: the bots run in worker processes, this one only serves HTTP
+pool = WorkerPool(list(BOT_SPECS.values()), WORKERS, STOP_DEADLINE, LIFECYCLE_TIMEOUT) if WORKERS > 1 else None
 
 # Global variables
 bots_running = False
-bot_tasks = []
 bot_thread = None
 
 # ================= FLASK APP =================
@@ -40,31 +47,57 @@ def home():
     <p>Bots running via Flask + Runner.py</p>
     <p>Endpoints:</p>
     <ul>
-        <li><a href="/health">/health</a> - Check bot status</li>
+        <li><a href="/health">/health</a> - Per-bot health</li>
+        <li><a href="/health/live">/health/live</a> - Liveness probe</li>
+        <li><a href="/health/ready">/health/ready</a> - Readiness probe</li>
+        <li><a href="/metrics">/metrics</a> - Prometheus metrics</li>
         <li><a href="/start">/start</a> - Start all bots</li>
-        <li><a href="/stop">/stop</a> - Stop all bots</li>
-        <li><a href="/restart">/restart</a> - Restart all bots</li>
-        <li><a href="/restart?key=mysecret">/restart?key=mysecret</a> - Force restart</li>
+        <li><a href="/stop">/stop</a> - Stop all bots (drains and flushes)</li>
+        <li><a href="/restart">/restart</a> - Restart all bots in-process</li>
+        <li><a href="/restart?bot=bot3">/restart?bot=bot3</a> - Restart one bot</li>
+        <li><a href="/restart?key=mysecret&exit=1">/restart?key=mysecret&amp;exit=1</a> - Restart the process</li>
     </ul>
     '''
 
+def bots_report():
+    return pool.report() if pool else supervisor.report()
+
 @flask_app.route('/health')
 def health_check():
+    report = bots_report()
     status = {
-        'status': 'healthy' if bots_running else 'sleeping',
+        **report,
         'bots_running': bots_running,
         'bots_available': BOTS_AVAILABLE,
+        'bots_enabled': list(BOT_SPECS),
+        'workers': report.get('workers', WORKERS),
         'port': PORT,
-        'message': 'All bots running' if bots_running else 'Bots not started'
     }
     return jsonify(status)
 
+@flask_app.route('/health/live')
+def liveness_check():
+    """503 when restarting the process would help (crashed bot, stuck or stopped loop)"""
+    report = bots_report()
+    return jsonify({'live': report['live'], 'status': report['status']}), 200 if report['live'] else 503
+
+@flask_app.route('/health/ready')
+def readiness_check():
+    """503 until every bot is started, receiving updates and reaching its database"""
+    report = bots_report()
+    not_ready = [name for name, bot in report['bots'].items() if not bot['ready']]
+    body = {'ready': report['ready'], 'status': report['status'], 'not_ready': not_ready}
+    return jsonify(body), 200 if report['ready'] else 503
+
+@flask_app.route('/metrics')
+def metrics_endpoint():
+    text = pool.render_metrics() if pool else metrics.registry.render()
+    return Response(text, mimetype=metrics.CONTENT_TYPE)
+
 @flask_app.route('/start')
 def start_bots_route():
-    global bots_running
-    
     if not BOTS_AVAILABLE:
-        return jsonify({'error': 'Bot modules not found'}), 500
+        return jsonify({'error': 'No bots enabled (check ENABLED_BOTS)'}), 500
     
     if bots_running:
         return jsonify({'message': 'Bots already running'})
@@ -75,78 +108,103 @@ def start_bots_route():
 
 @flask_app.route('/stop')
 def stop_bots_route():
-    global bots_running, bot_tasks
-    
     if not bots_running:
         return jsonify({'message': 'Bots not running'})
     
-    # Cancel all bot tasks
-    for task in bot_tasks:
-        if not task.done():
-            task.cancel()
-    
-    bots_running = False
-    bot_tasks = []
-    
-    return jsonify({'message': 'Stopping all bots...'})
+    drained = stop_bots()
+    return jsonify({'message': 'All bots stopped', 'drained': drained})
 
 @flask_app.route('/restart')
 def restart_bots_route():
-    # Check for secret key
-    from flask import request
     key = request.args.get('key', '')
+    name = request.args.get('bot')
     
-    if key == SECRET_KEY:
-        print("🔄 Force restart requested via secret key")
-        os._exit(0)  # Force restart for Render/Koyeb
+    if key == SECRET_KEY and request.args.get('exit'):
+        logger.info("🔄 Process restart requested via secret key")
+        shutdown_and_exit()  # Stops the bots gracefully first; Render/Koyeb start a new process
     
-    # Normal restart
-    stop_bots_route()
-    start_bots_route()
-    return jsonify({'message': 'Restarting all bots...'})
+    if name and name not in BOT_SPECS:
+        return jsonify({'error': f'Unknown bot {name}', 'bots': list(BOT_SPECS)}), 404
+    
+    if not bots_running:
+        return start_bots_route()
+    
+    # In-process restart: drain, flush and start again without losing the process
+    names = [name] if name else list(BOT_SPECS)
+    logger.info(f"🔄 Restarting {', '.join(names)}")
+    if pool:
+        errors = pool.restart(names)
+    else:
+        errors = supervisor.submit(supervisor.restart_all(STOP_DEADLINE, names)).result(LIFECYCLE_TIMEOUT)
+    errors = {bot: error for bot, error in errors.items() if error}
+    if errors:
+        return jsonify({'message': 'Restart failed', 'errors': errors}), 500
+    return jsonify({'message': f"Restarted {', '.join(names)}"})
 
 # ================= BOT MANAGEMENT =================
+async def run_all_bots():
+    logger.info("🚀 Starting all bots...")
+    # The supervisor tracks every start; a failing bot is logged and kept, not swallowed
+    errors = await supervisor.start_all(BOT_STARTERS)
+    failed = [name for name, error in errors.items() if error]
+    logger.info(f"✅ {len(errors) - len(failed)}/{len(errors)} bots started" + (f", failed: {', '.join(failed)} (see /health)" if failed else ""))
+    # Import and start time per bot; each bot's first update is logged when it arrives
+    logger.info(supervisor.startup_report(BOT_STARTERS))
+
 def start_bots_background():
-    """Start all bots in background thread"""
-    global bots_running, bot_thread, bot_tasks
+    """Start all bots on the background event loop (created on first use)"""
+    global bots_running, bot_thread
     
     if not BOTS_AVAILABLE or bots_running:
         return
     
     bots_running = True
     
+    if pool:
+        if webhook.ingress.forward is None:
+            # One listener for the whole pool; the workers only take updates from it
+            webhook.serve_forwarding(pool.names, pool.forward)
+        pool.start()
+        logger.info(f"✅ All bots starting in {len(pool.workers)} worker processes")
+        return
+    
+    # Loop already up (bots were stopped): start them again on it
+    if bot_thread is not None and bot_thread.is_alive():
+        supervisor.submit(run_all_bots())
+        return
+    
     def run_all_bots_sync():
-        async def run_all_bots():
-            try:
-                print("🚀 Starting all bots...")
-                
-                # Store tasks globally
-                global bot_tasks
-                tasks = [
-                    asyncio.create_task(start_bot1()),
-                    asyncio.create_task(start_bot2()),
-                    asyncio.create_task(start_bot3()),
-                    asyncio.create_task(start_bot4())
-                ]
-                bot_tasks = tasks
-                
-                # Run all tasks
-                await asyncio.gather(*tasks, return_exceptions=True)
-                
-            except asyncio.CancelledError:
-                print("⏹️ Bots stopped")
-            except Exception as e:
-                print(f"❌ Bot Error: {e}")
-        
-        # Run in new event loop
+        # Run in new event loop; start_botN return once updates are flowing,
+        # so the loop keeps running afterwards for the bots (and for restarts)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         loop.run_until_complete(run_all_bots())
+        loop.run_forever()
     
     # Start in separate thread
     bot_thread = threading.Thread(target=run_all_bots_sync, daemon=True)
     bot_thread.start()
-    print("✅ All bots started in background")
+    logger.info("✅ All bots started in background")
+
+def stop_bots():
+    """Stop every bot gracefully from this thread; returns whether each drained in time"""
+    global bots_running
+    
+    bots_running = False
+    if pool:
+        return pool.stop()
+    try:
+        return supervisor.submit(supervisor.stop_all(STOP_DEADLINE)).result(LIFECYCLE_TIMEOUT)
+    except Exception as e:
+        logger.error(f"❌ Stop failed: {e}")
+        return {}
+
+def shutdown_and_exit(code=0):
+    """Drain and flush every bot, then exit so the host starts a fresh process"""
+    if bots_running:
+        stop_bots()
+    logs.stop()  # os._exit skips atexit: write out the queued records first
+    os._exit(code)
 
 # ================= OLD HTTP HANDLER (for compatibility) =================
 class RestartHandler(BaseHTTPRequestHandler):
@@ -155,8 +213,8 @@ class RestartHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.end_headers()
             self.wfile.write(b"Restarting bot...")
-            print("🔄 Force restart via old HTTP handler")
-            os._exit(0)
+            logger.info("🔄 Process restart via old HTTP handler")
+            shutdown_and_exit()
         else:
             self.send_response(403)
             self.end_headers()
@@ -170,26 +228,29 @@ def run_old_server():
     """Run old HTTP server for compatibility"""
     try:
         server = HTTPServer(("", 10001), RestartHandler)
-        print("🌐 Old HTTP server running on port 10001")
+        logger.info("🌐 Old HTTP server running on port 10001")
         server.serve_forever()
     except Exception as e:
-        print(f"❌ Old server error: {e}")
+        logger.error(f"❌ Old server error: {e}")
 
 # ================= MAIN FUNCTION =================
 def run_flask_server():
     """Run Flask server with waitress"""
     import waitress
-    print(f"🌐 Flask server starting on port {PORT}...")
+    logger.info(f"🌐 Flask server starting on port {PORT}...")
     waitress.serve(flask_app, host='0.0.0.0', port=PORT)
 
 def main():
-    print("=" * 50)
-    print("🤖 Telegram Multi-Bots Runner")
-    print("=" * 50)
-    print(f"📡 Port: {PORT}")
-    print(f"🔑 Restart Key: {SECRET_KEY}")
-    print(f"🤖 Bots Available: {BOTS_AVAILABLE}")
-    print("=" * 50)
+    logger.info("🤖 Telegram Multi-Bots Runner")
+    logger.info(f"📡 Port: {PORT}")
+    logger.info(f"🔑 Restart Key: {SECRET_KEY}")
+    logger.info(f"🤖 Bots Enabled: {', '.join(BOT_SPECS) or 'none'}")
+    if pool:
+        for worker in pool.workers:
+            logger.info(f"🧩 Worker {worker.index}: {', '.join(worker.names)}")
+    
+    # Hosts send SIGTERM before replacing the process: drain and flush first
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown_and_exit(0))
     
     # Start old HTTP server in background (for compatibility)
     old_server_thread = threading.Thread(target=run_old_server, daemon=True)
@@ -197,10 +258,10 @@ def main():
     
     # Auto-start bots if configured
     if os.getenv('AUTO_START_BOTS', 'true').lower() == 'true':
-        print("⚡ Auto-starting bots...")
+        logger.info("⚡ Auto-starting bots...")
         start_bots_background()
     else:
-        print("⏸️  Auto-start disabled, use /start endpoint")
+        logger.info("⏸️  Auto-start disabled, use /start endpoint")
     
     # Run Flask app (blocking)
     run_flask_server()
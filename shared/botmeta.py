@@ -0,0 +1,86 @@
+"""
+BOT METADATA CACHE
+Bot identity, deep-link bases and prebuilt keyboards served from memory
+"""
+
+import functools
+from typing import Callable, Dict
+from urllib.parse import quote
+
+from telegram import Bot
+from telegram.ext import Application
+
+from shared import tenants
+
+# ================= BOT IDENTITY =================
+class BotMeta:
+    """Identity of one bot, filled from the getMe done by Application.initialize"""
+
+    def __init__(self, bot_id: int, username: str, first_name: str):
+        self.id = bot_id
+        self.username = username
+        self.first_name = first_name
+        self.base_url = f"https://t.me/{username}"
+        self.start_url = f"{self.base_url}?start="
+        self.startgroup_url = f"{self.base_url}?startgroup="
+
+    def deep_link(self, payload: str) -> str:
+        """Private-chat deep link, e.g. a referral link"""
+        return f"{self.start_url}{payload}"
+
+    def group_link(self, payload: str = "") -> str:
+        """Add-to-group deep link"""
+        return f"{self.startgroup_url}{payload}"
+
+    @staticmethod
+    def share_url(url: str, text: str = "") -> str:
+        """t.me share dialog for a link"""
+        share = f"https://t.me/share/url?url={quote(url, safe='')}"
+        if text:
+            share += f"&text={quote(text, safe='')}"
+        return share
+
+
+_metas: Dict[str, BotMeta] = {}
+
+
+def _key(bot: Bot) -> str:
+    # The token is available before initialize(), unlike bot.id
+    return bot.token
+
+
+async def load(app: Application) -> BotMeta:
+    """Cache the bot identity; call once after app.initialize()"""
+    me = app.bot.bot  # already fetched by initialize(), no API call
+    meta = BotMeta(me.id, me.username, me.first_name)
+    _metas[_key(app.bot)] = meta
+    return meta
+
+
+def get(bot: Bot) -> BotMeta:
+    """Cached identity for a bot (falls back to the bot's own getMe cache)"""
+    meta = _metas.get(_key(bot))
+    if meta is None:
+        me = bot.bot
+        meta = _metas[_key(bot)] = BotMeta(me.id, me.username, me.first_name)
+    return meta
+
+
+# ================= PREBUILT KEYBOARDS =================
+_keyboards: Dict[tuple, object] = {}
+
+
+def prebuilt(factory: Callable) -> Callable:
+    """
+    Build a keyboard once per argument shape and reuse it.
+    Telegram objects are immutable, so one markup can be shared by every reply.
+    Cached per tenant, since a keyboard may show tenant settings (categories).
+    """
+    @functools.wraps(factory)
+    def wrapper(*args):
+        key = (tenants.current().id, factory.__module__, factory.__qualname__) + args
+        markup = _keyboards.get(key)
+        if markup is None:
+            markup = _keyboards[key] = factory(*args)
+        return markup
+    return wrapper
@@ -0,0 +1,33 @@
+"""
+CONSISTENT HASHING
+Maps keys (tenant ids, bot names) onto nodes so that adding or removing a node
+only moves the keys on that node's arcs, about 1/N of them, instead of
+reshuffling everything like hash(key) % N would.
+"""
+
+import bisect
+import hashlib
+from typing import Iterable, List, Tuple
+
+REPLICAS = 64  # points per node on the ring; more points, more even spread
+
+
+def _hash(key: str) -> int:
+    # Stable across processes and restarts, unlike hash()
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str], replicas: int = REPLICAS):
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{node}#{i}"), node) for node in dict.fromkeys(nodes) for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node(self, key: str) -> str:
+        """The node that owns this key"""
+        if not self._nodes:
+            raise ValueError("the ring has no nodes")
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[i]
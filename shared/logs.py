@@ -0,0 +1,216 @@
+"""
+LOGGING
+One logging setup for the whole process, called by the runner (and by each
+worker process) before any bot starts; the bot modules only get loggers.
+
+Log calls on the event loop only stamp the record and put it on a bounded
+queue; a listener thread formats it and writes it out, so a slow stderr or
+log drain never stalls the bots. When the queue is full, records are
+dropped and counted instead of blocking.
+
+Each line is a JSON object:
+
+    {"ts": "2026-01-01T12:00:00.123Z", "level": "ERROR", "logger": "BOT4.main",
+     "msg": "...", "bot": "bot4.acme", "handler": "handle_redeem", "user": 42, "chat": 42}
+
+bot/handler/user/chat come from the update being handled (set by the metrics
+wrapper around every handler) or, in background tasks, the bot's tenant.
+
+Noisy loggers are sampled: LOG_SAMPLE="*.send=0.1" keeps the first record of
+every 10 from loggers matching *.send (send failures during a flood or an
+outage), marked "sampled": 10. The time log calls take on the loop is counted
+per bot in bot_log_seconds_total.
+
+    LOG_LEVEL=INFO
+    LOG_FORMAT=json             or text, the old "time - logger - level - message" lines
+    LOG_SAMPLE=*.send=0.1,httpx=0.01
+    LOG_QUEUE_SIZE=10000
+"""
+
+import atexit
+import fnmatch
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from shared import tenants
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_SAMPLE = os.getenv("LOG_SAMPLE", "*.send=0.1,httpx=0.01")  # httpx logs every Bot API request at INFO
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+# ================= UPDATE SCOPE =================
+class Scope:
+    """The update a handler is processing, and what logging cost it"""
+    __slots__ = ("bot", "handler", "update", "seconds", "records")
+
+    def __init__(self, bot: str, handler: str, update):
+        self.bot = bot
+        self.handler = handler
+        self.update = update
+        self.seconds = 0.0
+        self.records = 0
+
+
+scope: ContextVar[Optional[Scope]] = ContextVar("log_scope", default=None)
+
+
+def _ids(update) -> Tuple[Optional[int], Optional[int]]:
+    # Only looked up when something is logged; handlers of non-Update types have neither
+    user = getattr(update, "effective_user", None)
+    chat = getattr(update, "effective_chat", None)
+    return (user.id if user else None), (chat.id if chat else None)
+
+
+# ================= SAMPLING =================
+def _rules(spec: str) -> List[Tuple[str, int]]:
+    rules = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        pattern, _, rate = item.partition("=")
+        try:
+            every = round(1 / float(rate))
+        except (ValueError, ZeroDivisionError):
+            print(f"LOG_SAMPLE: ignoring {item!r}, expected logger=rate with 0 < rate <= 1", file=sys.stderr)
+            continue
+        if every > 1:
+            rules.append((pattern.strip(), every))
+    return rules
+
+
+class Sampler(logging.Filter):
+    """Keeps one record in every N from loggers matching a rule, counting the rest"""
+
+    def __init__(self, spec: str = LOG_SAMPLE):
+        super().__init__()
+        self.rules = _rules(spec)
+        self._every: Dict[str, int] = {}     # logger name -> N (1 = not sampled), matched once per name
+        self._seen: Dict[str, int] = {}
+        self.dropped: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.name
+        every = self._every.get(name)
+        if every is None:
+            every = self._every[name] = next((n for pattern, n in self.rules if fnmatch.fnmatchcase(name, pattern)), 1)
+        if every == 1:
+            return True
+        seen = self._seen.get(name, 0)
+        self._seen[name] = seen + 1
+        if seen % every:
+            self.dropped[name] = self.dropped.get(name, 0) + 1
+            return False
+        record.sampled = every
+        return True
+
+
+# ================= HANDLER AND LISTENER =================
+class LoopHandler(logging.handlers.QueueHandler):
+    """The only handler on the root logger: stamps the record with its context and queues it, nothing else"""
+
+    def __init__(self, queue_: queue.SimpleQueue, limit: int = LOG_QUEUE_SIZE):
+        super().__init__(queue_)
+        self.limit = limit
+        self.dropped = 0
+        self.queued = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        started = time.perf_counter()
+        try:
+            return super().handle(record)
+        finally:
+            current = scope.get()
+            if current is not None:
+                current.seconds += time.perf_counter() - started
+                current.records += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener is in this process, so the record needs no pickling: formatting
+        # (message, traceback) waits for the listener thread
+        current = scope.get()
+        if current is not None:
+            record.bot, record.handler = current.bot, current.handler
+            record.user, record.chat = _ids(current.update)
+        else:
+            record.bot = tenants.current().name
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # SimpleQueue is a fraction of Queue's cost per put; the bound is checked by hand
+        if self.queue.qsize() >= self.limit:
+            self.dropped += 1
+            return
+        self.queue.put(record)
+        self.queued += 1
+
+
+class JsonFormatter(logging.Formatter):
+    FIELDS = ("bot", "handler", "user", "chat", "sampled")
+
+    def __init__(self, **static):
+        super().__init__()
+        self.static = static
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds")[:-6] + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **self.static,
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value:
+                line[field] = value
+        if record.exc_info:
+            line["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            line["exc"] = record.exc_text
+        return json.dumps(line, ensure_ascii=False, default=str)
+
+
+handler: Optional[LoopHandler] = None
+sampler: Optional[Sampler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+def setup(stream=None, **fields):
+    """Route all logging through the queue (once per process); fields are added to every JSON line, e.g. worker=2"""
+    global handler, sampler, _listener
+    with _lock:
+        if handler is not None:
+            return
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter(**fields) if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+        queue_ = queue.SimpleQueue()
+        handler, sampler = LoopHandler(queue_, LOG_QUEUE_SIZE), Sampler()
+        handler.addFilter(sampler)
+        root = logging.getLogger()
+        for old in root.handlers[:]:
+            root.removeHandler(old)
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        _listener = logging.handlers.QueueListener(queue_, output)
+        _listener.start()
+    atexit.register(stop)
+
+
+def stop():
+    """Write out everything queued and stop the listener thread"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -0,0 +1,351 @@
+"""
+METRICS
+Prometheus text-format metrics for every bot: handler latency and errors,
+Telegram API calls (read from the outbound schedulers), MongoDB command
+latency, connection pool use (MongoDB and the shared Bot API pool),
+event-loop lag and the cost of logging.
+
+Counters live in per-thread shards and are only summed when /metrics is
+scraped, so recording takes no lock. Mongo command events arrive on pymongo's
+own threads, handler timings on the bots' loop thread.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from telegram.ext import Application, ApplicationHandlerStop, BaseHandler, ConversationHandler
+
+from shared import logs, resources, webhook
+from shared.outbound import SCHEDULERS
+from shared.supervisor import supervisor
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Labels, float]
+
+
+class _Shard:
+    """One thread's counters and histograms"""
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}   # bucket counts..., +Inf, sum
+
+
+class Registry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()           # taken once per thread, never when recording
+        self._meta: Dict[str, Tuple[str, str]] = {}     # name -> (type, help)
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def describe(self, name: str, kind: str, text: str):
+        self._meta[name] = (kind, text)
+
+    def collector(self, fn: Callable[[], Iterable[Sample]]):
+        """Samples computed at scrape time (gauges, counters kept elsewhere)"""
+        self._collectors.append(fn)
+        return fn
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _row(self, key: Tuple[str, Labels]) -> List[float]:
+        histograms = self._shard().histograms
+        row = histograms.get(key)
+        if row is None:
+            row = histograms[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+        return row
+
+    # ---------- recording ----------
+    def inc(self, name: str, labels: Labels = (), value: float = 1.0):
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Labels, value: float):
+        row = self._row((name, labels))
+        row[bisect_left(BUCKETS, value)] += 1
+        row[-1] += value
+
+    # ---------- exposition ----------
+    def _merged(self):
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # dict() copies in one step under the GIL, so a concurrent insert can't break iteration
+            for key, value in dict(shard.counters).items():
+                counters[key] = counters.get(key, 0.0) + value
+            for key, row in dict(shard.histograms).items():
+                total = histograms.get(key)
+                if total is None:
+                    histograms[key] = list(row)
+                else:
+                    for i, v in enumerate(row):
+                        total[i] += v
+        return counters, histograms
+
+    def snapshot(self):
+        """Everything render() shows, as plain picklable data (worker processes send it to the runner)"""
+        counters, histograms = self._merged()
+        return counters, histograms, [sample for fn in self._collectors for sample in fn()]
+
+    def render(self, snapshots: Optional[Dict[Labels, tuple]] = None) -> str:
+        """This process's metrics, or other processes' snapshots keyed by the labels that tell them apart"""
+        if snapshots is None:
+            snapshots = {(): self.snapshot()}
+        lines: Dict[str, List[str]] = {}
+
+        def add(name, labels, value, suffix=""):
+            lines.setdefault(name, []).append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+
+        for extra, (counters, histograms, samples) in snapshots.items():
+            for (name, labels), value in sorted(counters.items()):
+                add(name, extra + labels, value)
+            for (name, labels), row in sorted(histograms.items()):
+                labels = extra + labels
+                cumulative = 0
+                for bound, count in zip(BUCKETS, row):
+                    cumulative += count
+                    add(name, labels + (("le", _number(bound)),), cumulative, "_bucket")
+                count = cumulative + row[len(BUCKETS)]
+                add(name, labels + (("le", "+Inf"),), count, "_bucket")
+                add(name, labels, row[-1], "_sum")
+                add(name, labels, count, "_count")
+            for name, labels, value in samples:
+                add(name, extra + labels, value)
+
+        out = []
+        for name in sorted(lines):
+            kind, text = self._meta.get(name, ("untyped", ""))
+            out.append(f"# HELP {name} {text}")
+            out.append(f"# TYPE {name} {kind}")
+            out += lines[name]
+        return "\n".join(out) + "\n"
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+registry = Registry()
+
+registry.describe("bot_handler_seconds", "histogram", "Handler latency in seconds (_count is the number of calls)")
+registry.describe("bot_handler_errors_total", "counter", "Handler calls that raised")
+registry.describe("telegram_api_requests_total", "counter", "Bot API requests by endpoint")
+registry.describe("telegram_api_errors_total", "counter", "Bot API requests that failed")
+registry.describe("telegram_api_retry_after_total", "counter", "Flood waits received from the Bot API")
+registry.describe("telegram_api_wait_seconds_total", "counter", "Time requests spent waiting in the outbound scheduler")
+registry.describe("telegram_api_queued", "gauge", "Requests waiting in the outbound scheduler")
+registry.describe("mongo_command_seconds", "histogram", "MongoDB command latency in seconds")
+registry.describe("mongo_command_failures_total", "counter", "MongoDB commands that failed")
+registry.describe("mongo_pool_connections", "gauge", "Open MongoDB connections by server")
+registry.describe("mongo_pool_checked_out", "gauge", "MongoDB connections in use by server")
+registry.describe("mongo_pool_max_size", "gauge", "MongoDB connections allowed per server")
+registry.describe("mongo_pool_checkout_failures_total", "counter", "MongoDB connection checkouts that failed")
+registry.describe("telegram_http_pool_size", "gauge", "Connections in the shared Bot API pool")
+registry.describe("telegram_http_in_flight", "gauge", "Bot API requests using the shared pool right now")
+registry.describe("telegram_http_pool_bots", "gauge", "Bots using the shared Bot API pool")
+registry.describe("telegram_http_requests_total", "counter", "Bot API requests sent through the shared pool")
+registry.describe("telegram_http_pool_timeouts_total", "counter", "Bot API requests that found the shared pool full")
+registry.describe("event_loop_lag_seconds", "gauge", "Recent peak event-loop lag of the bots' loop")
+registry.describe("webhook_requests_total", "counter", "Webhook ingress requests by outcome")
+registry.describe("bot_log_seconds_total", "counter", "Time handlers spent in log calls (divide by bot_handler_seconds_count for per update)")
+registry.describe("bot_log_records_total", "counter", "Records logged by handlers")
+registry.describe("log_records_queued_total", "counter", "Log records handed to the log writer thread")
+registry.describe("log_records_dropped_total", "counter", "Log records dropped because the log queue was full")
+registry.describe("log_records_sampled_out_total", "counter", "Log records skipped by LOG_SAMPLE sampling")
+registry.describe("log_queue_size", "gauge", "Log records waiting for the log writer thread")
+
+
+# ================= HANDLERS =================
+def _callable_name(callback) -> str:
+    while isinstance(callback, functools.partial):
+        callback = callback.func
+    return getattr(callback, "__qualname__", None) or type(callback).__name__
+
+
+def timed(callback, bot: str, kind: str):
+    """Wrap a handler callback to record its latency and errors, and give its log records the update's context"""
+    name = _callable_name(callback)
+    labels = (("bot", bot), ("handler", name), ("type", kind))
+    key = ("bot_handler_seconds", labels)
+    bot_labels = (("bot", bot),)
+    local = threading.local()
+    clock = time.perf_counter
+
+    async def wrapper(update, context):
+        started = clock()
+        scope = logs.Scope(bot, name, update)
+        token = logs.scope.set(scope)
+        try:
+            return await callback(update, context)
+        except ApplicationHandlerStop:
+            raise  # flow control, not a failure
+        except Exception:
+            registry.inc("bot_handler_errors_total", labels)
+            raise
+        finally:
+            # observe() inlined with this thread's row cached: this runs on every update
+            elapsed = clock() - started
+            try:
+                row = local.row
+            except AttributeError:
+                row = local.row = registry._row(key)
+            row[bisect_left(BUCKETS, elapsed)] += 1
+            row[-1] += elapsed
+            logs.scope.reset(token)
+            if scope.records:
+                registry.inc("bot_log_seconds_total", bot_labels, scope.seconds)
+                registry.inc("bot_log_records_total", bot_labels, scope.records)
+
+    functools.update_wrapper(wrapper, callback)
+    wrapper.timed = True
+    return wrapper
+
+
+def _instrument(handler: BaseHandler, bot: str) -> int:
+    if isinstance(handler, ConversationHandler):
+        inner = [*handler.entry_points, *(h for hs in handler.states.values() for h in hs), *handler.fallbacks]
+        return sum(_instrument(h, bot) for h in inner)
+    if getattr(handler.callback, "timed", False):
+        return 0
+    handler.callback = timed(handler.callback, bot, type(handler).__name__)
+    return 1
+
+
+def instrument(app: Application, bot: str) -> int:
+    """Time every handler registered so far (call once all handlers are added); returns how many"""
+    return sum(_instrument(h, bot) for handlers in app.handlers.values() for h in handlers)
+
+
+# ================= COLLECTORS =================
+@registry.collector
+def _telegram_api():
+    for name, scheduler in list(SCHEDULERS.items()):
+        bot = (("bot", name),)
+        for endpoint, count in dict(scheduler.endpoint_counts).items():
+            yield "telegram_api_requests_total", bot + (("endpoint", endpoint),), count
+        yield "telegram_api_errors_total", bot, scheduler.stats["errors"]
+        yield "telegram_api_retry_after_total", bot, scheduler.stats["retry_after"]
+        yield "telegram_api_wait_seconds_total", bot, scheduler.stats["wait_seconds"]
+        yield "telegram_api_queued", bot, len(scheduler._waiting)
+
+
+@registry.collector
+def _pools():
+    pool = resources.http_pool
+    yield "telegram_http_pool_size", (), pool.size
+    yield "telegram_http_in_flight", (), pool.in_flight
+    yield "telegram_http_pool_bots", (), pool.users
+    yield "telegram_http_requests_total", (), pool.requests
+    yield "telegram_http_pool_timeouts_total", (), pool.pool_timeouts
+    yield "mongo_pool_max_size", (), resources.MONGO_MAX_POOL_SIZE
+
+
+@registry.collector
+def _runtime():
+    yield "event_loop_lag_seconds", (), supervisor.lag
+    for outcome, count in dict(webhook.ingress.stats).items():
+        yield "webhook_requests_total", (("outcome", outcome),), count
+
+
+@registry.collector
+def _logging():
+    if logs.handler is None:
+        return
+    yield "log_records_queued_total", (), logs.handler.queued
+    yield "log_records_dropped_total", (), logs.handler.dropped
+    yield "log_queue_size", (), logs.handler.queue.qsize()
+    for logger, count in dict(logs.sampler.dropped).items():
+        yield "log_records_sampled_out_total", (("logger", logger),), count
+
+
+# ================= MONGODB =================
+try:
+    from pymongo import monitoring
+except ImportError:  # no Mongo in this deployment
+    monitoring = None
+
+if monitoring is not None:
+    class MongoCommandListener(monitoring.CommandListener):
+        """Registered globally, so it sees every client created afterwards (motor included)"""
+
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            registry.observe("mongo_command_seconds", (("command", event.command_name),), event.duration_micros / 1e6)
+
+        def failed(self, event):
+            labels = (("command", event.command_name),)
+            registry.observe("mongo_command_seconds", labels, event.duration_micros / 1e6)
+            registry.inc("mongo_command_failures_total", labels)
+
+    class MongoPoolListener(monitoring.ConnectionPoolListener):
+        """Pool gauges kept as +1/-1 counters: shards are per thread and only summed at scrape time"""
+
+        @staticmethod
+        def _server(event) -> Labels:
+            return (("server", "%s:%s" % event.address),)
+
+        def connection_created(self, event):
+            registry.inc("mongo_pool_connections", self._server(event))
+
+        def connection_closed(self, event):
+            registry.inc("mongo_pool_connections", self._server(event), -1.0)
+
+        def connection_checked_out(self, event):
+            registry.inc("mongo_pool_checked_out", self._server(event))
+
+        def connection_checked_in(self, event):
+            registry.inc("mongo_pool_checked_out", self._server(event), -1.0)
+
+        def connection_check_out_failed(self, event):
+            registry.inc("mongo_pool_checkout_failures_total", self._server(event))
+
+        def pool_created(self, event):
+            pass
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            pass
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_check_out_started(self, event):
+            pass
+
+    monitoring.register(MongoCommandListener())
+    monitoring.register(MongoPoolListener())
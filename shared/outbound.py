@@ -0,0 +1,243 @@
+"""
+OUTBOUND MESSAGE SCHEDULER
+One paced send path for every bot, plugged in through python-telegram-bot's
+rate limiter hook: ApplicationBuilder().rate_limiter(OutboundScheduler(...))
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from enum import IntEnum
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Tuple, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# ================= LIMITS =================
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+OVERALL_RATE = 30          # messages per second per bot
+PRIVATE_RATE = 1           # messages per second per private chat
+GROUP_RATE = 20 / 60       # messages per second per group
+PRIVATE_BURST = 3
+GROUP_BURST = 5
+EDIT_RATE = 2              # edits and deletes per second per chat, outside the posting budget
+EDIT_BURST = 10
+MAX_RETRIES = 3
+IDLE_BUCKET_SECONDS = 300
+
+# Endpoints that change existing messages: they don't count against the 20/min
+# posting limit of a group, so they get a chat bucket of their own
+EDIT_ENDPOINTS = frozenset({
+    "editMessageText", "editMessageCaption", "editMessageMedia", "editMessageReplyMarkup",
+    "deleteMessage",
+})
+
+# Endpoints that post or change chat messages; everything else is not paced
+PACED_ENDPOINTS = frozenset({
+    "sendMessage", "sendPhoto", "sendVideo", "sendDocument", "sendAudio",
+    "sendAnimation", "sendVoice", "sendVideoNote", "sendSticker", "sendMediaGroup",
+    "sendLocation", "sendVenue", "sendContact", "sendPoll", "sendDice",
+    "copyMessage", "forwardMessage",
+}) | EDIT_ENDPOINTS
+
+
+class Lane(IntEnum):
+    """Priority lanes, lower goes first. Pass as rate_limit_args=Lane.X on a bot call."""
+    REPLY = 0        # direct answers to a user action
+    NORMAL = 1
+    BACKGROUND = 2   # log channels, auto-deletes, broadcasts
+
+
+# ================= TOKEN BUCKET =================
+class TokenBucket:
+    """Reservation-style token bucket: a caller takes a token and sleeps off the debt"""
+    __slots__ = ("rate", "capacity", "tokens", "stamp", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = now
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take one token, return the seconds to wait before using it"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, now: float, seconds: float):
+        """Stop handing out usable tokens for a while (flood wait)"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def idle(self, now: float) -> bool:
+        return self.tokens >= self.capacity - 1 and now - self.stamp > IDLE_BUCKET_SECONDS
+
+
+# ================= SCHEDULER =================
+class OutboundScheduler(BaseRateLimiter[int]):
+    """
+    Per-bot and per-chat token buckets with priority lanes (a chat has one
+    bucket for new messages and one for edits/deletes).
+    Requests wait for their chat's bucket, then queue for the bot-wide bucket,
+    which always releases the lowest lane first. RetryAfter is honoured by
+    blocking the chat (or the whole bot) and retrying.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        background_chats: Iterable[Union[int, str]] = (),
+        overall_rate: float = OVERALL_RATE,
+        private_rate: float = PRIVATE_RATE,
+        group_rate: float = GROUP_RATE,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.name = name
+        self.background_chats = {str(c) for c in background_chats if c}
+        self.overall_rate = overall_rate
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+
+        self._global: Optional[TokenBucket] = None
+        self._chats: Dict[Tuple[str, bool], TokenBucket] = {}   # (chat id, edit) -> bucket
+        self._waiting: List[tuple] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self.stats: Dict[str, float] = {
+            "requests": 0, "paced": 0, "wait_seconds": 0.0,
+            "retry_after": 0, "retry_after_seconds": 0.0, "errors": 0,
+        }
+        self.lane_counts = {lane.name: 0 for lane in Lane}
+        self.endpoint_counts: Dict[str, int] = {}
+        SCHEDULERS[name] = self
+
+    async def initialize(self) -> None:
+        now = asyncio.get_running_loop().time()
+        self._global = TokenBucket(self.overall_rate, self.overall_rate, now)
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def shutdown(self) -> None:
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for *_, fut in self._waiting:
+            if not fut.done():
+                fut.cancel()
+        self._waiting.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot for health/metrics endpoints"""
+        return {
+            **self.stats,
+            "queued": len(self._waiting),
+            "chats_tracked": len(self._chats),
+            "lanes": dict(self.lane_counts),
+            "endpoints": dict(self.endpoint_counts),
+        }
+
+    # ---------- internals ----------
+    def _lane(self, chat_id: Optional[str], rate_limit_args: Optional[int]) -> Lane:
+        if rate_limit_args is not None:
+            return Lane(rate_limit_args)
+        if chat_id in self.background_chats:
+            return Lane.BACKGROUND
+        return Lane.REPLY
+
+    def _chat_bucket(self, chat_id: str, now: float, edit: bool = False) -> TokenBucket:
+        bucket = self._chats.get((chat_id, edit))
+        if bucket is None:
+            if len(self._chats) > 10000:
+                self._chats = {k: b for k, b in self._chats.items() if not b.idle(now)}
+            is_group = chat_id.startswith("-") or chat_id.startswith("@")
+            if edit:
+                rate, burst = EDIT_RATE, EDIT_BURST
+            else:
+                rate, burst = (self.group_rate, GROUP_BURST) if is_group else (self.private_rate, PRIVATE_BURST)
+            bucket = self._chats[(chat_id, edit)] = TokenBucket(rate, burst, now)
+        return bucket
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._waiting:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            delay = self._global.reserve(loop.time())
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Pick after sleeping so a reply that arrived meanwhile overtakes background work
+            while self._waiting:
+                *_, fut = heapq.heappop(self._waiting)
+                if not fut.done():
+                    fut.set_result(None)
+                    break
+
+    async def _acquire(self, chat_id: Optional[str], lane: Lane, edit: bool = False):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if chat_id is not None:
+            wait = self._chat_bucket(chat_id, started, edit).reserve(started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        fut = loop.create_future()
+        heapq.heappush(self._waiting, (lane, next(self._seq), fut))
+        self._wakeup.set()
+        await fut
+
+        waited = loop.time() - started
+        if waited > 0.01:
+            self.stats["paced"] += 1
+            self.stats["wait_seconds"] += waited
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict, List[Dict]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ) -> Union[bool, Dict, List[Dict]]:
+        self.stats["requests"] += 1
+        self.endpoint_counts[endpoint] = self.endpoint_counts.get(endpoint, 0) + 1
+        if endpoint not in PACED_ENDPOINTS:
+            return await callback(*args, **kwargs)
+
+        chat_id = data.get("chat_id")
+        chat_id = str(chat_id) if chat_id is not None else None
+        lane = self._lane(chat_id, rate_limit_args)
+        edit = endpoint in EDIT_ENDPOINTS
+        self.lane_counts[lane.name] += 1
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(chat_id, lane, edit)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                seconds = float(e.retry_after)
+                self.stats["retry_after"] += 1
+                self.stats["retry_after_seconds"] += seconds
+                if attempt == self.max_retries:
+                    self.stats["errors"] += 1
+                    raise
+                logger.warning(f"[{self.name}] {endpoint} flood-waited {seconds}s (chat {chat_id})")
+                bucket = self._chats.get((chat_id, edit)) if chat_id is not None else self._global
+                bucket.block(loop.time(), seconds)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+
+
+SCHEDULERS: Dict[str, OutboundScheduler] = {}
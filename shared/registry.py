@@ -0,0 +1,170 @@
+"""
+BOT REGISTRY
+Which bots this deployment can host and how to start them. Each bot is a
+BotSpec: its start function as "module:function" (imported only when the bot
+starts), the shared resources it needs and a concurrency budget, which the
+worker pool uses to spread bots across processes.
+
+Specs are read from, later sources overriding earlier ones by name:
+  1. the bots in this repo (BUILTIN)
+  2. installed packages in the "telegram_multi_bots.bots" entry point group: a
+     BotSpec, or a start function (either way its module is imported at
+     startup, so point it at a light module)
+  3. BOTS_CONFIG, a JSON file: [{"name": ..., "entry": "pkg.mod:start", "needs": [...], "concurrency": 2}]
+  4. with TENANTS=true, one spec per tenant of a multi-tenant bot that this
+     deployment owns (shared/tenants.py), named "<bot>.<tenant id>"
+
+    ENABLED_BOTS=bot1,bot3    which of them run (default: all); naming a bot includes its
+                              tenants, "bot4.*" means only the tenants (no env-configured copy)
+"""
+
+import importlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from shared import resources, tenants
+from shared.supervisor import supervisor
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "telegram_multi_bots.bots"
+BOTS_CONFIG = os.getenv("BOTS_CONFIG", "")
+RESOURCES = ("mongo", "telegram_http")
+
+
+@dataclass(frozen=True, slots=True)
+class BotSpec:
+    name: str
+    entry: str                                  # "module:function", an async start function
+    needs: Tuple[str, ...] = ("telegram_http",)
+    concurrency: int = 1                        # relative load, balanced across workers
+    multi_tenant: bool = False                  # the start function takes a tenant id
+    tenant: str = ""                            # set on the spec of one tenant's copy
+
+    @property
+    def base(self) -> str:
+        """The bot this spec runs a copy of (its own name unless it is a tenant's)"""
+        return self.name.rsplit(".", 1)[0] if self.tenant else self.name
+
+    def problem(self) -> str:
+        """Why this bot can't start in this environment ("" when it can), checked before importing it"""
+        module, _, function = self.entry.partition(":")
+        if not module or not function:
+            return f"entry {self.entry!r} is not 'module:function'"
+        unknown = sorted(set(self.needs) - set(RESOURCES))
+        if unknown:
+            return f"unknown resources {', '.join(unknown)}"
+        if "mongo" in self.needs and not resources.MONGO_URI:
+            return "needs MongoDB but MONGO_URI is not set"
+        return ""
+
+    def load(self) -> Callable[[], Awaitable[Any]]:
+        module, _, function = self.entry.partition(":")
+        return getattr(importlib.import_module(module), function)
+
+
+BUILTIN = (
+    BotSpec("bot1", "BOT.main:start_bot1"),
+    BotSpec("bot2", "BOT1.main:start_bot2", needs=("mongo", "telegram_http"), multi_tenant=True),
+    BotSpec("bot3", "BOT3.main:start_bot3", concurrency=4),   # in-memory matches, concurrent updates
+    BotSpec("bot4", "BOT4.main:start_bot4", needs=("mongo", "telegram_http"), concurrency=2, multi_tenant=True),
+)
+
+
+# ================= SOURCES =================
+def _from_entry_points() -> List[BotSpec]:
+    specs = []
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            target = ep.load()
+        except Exception as e:
+            logger.error(f"❌ Bot entry point {ep.name} ({ep.value}) failed to load: {e}")
+            continue
+        if isinstance(target, BotSpec):
+            specs.append(target)
+        elif callable(target):
+            specs.append(BotSpec(ep.name, ep.value))
+        else:
+            logger.error(f"❌ Bot entry point {ep.name} is neither a BotSpec nor a start function")
+    return specs
+
+
+def _from_config(path: str) -> List[BotSpec]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ BOTS_CONFIG {path}: {e}")
+        return []
+    specs = []
+    for entry in entries:
+        try:
+            specs.append(BotSpec(
+                name=entry["name"],
+                entry=entry["entry"],
+                needs=tuple(entry.get("needs", ("telegram_http",))),
+                concurrency=int(entry.get("concurrency", 1)),
+                multi_tenant=bool(entry.get("multi_tenant", False)),
+            ))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"❌ BOTS_CONFIG {path}: bad entry {entry!r} ({e})")
+    return specs
+
+
+def _from_tenants(specs: Dict[str, BotSpec]) -> List[BotSpec]:
+    bases = {name: spec for name, spec in specs.items() if spec.multi_tenant}
+    try:
+        found = tenants.load_enabled(bases)
+    except Exception as e:
+        logger.error(f"❌ Loading tenants failed, starting without them: {e}")
+        return []
+    owned = [tenant for tenant in found if tenants.owned(tenant.id)]
+    logger.info(f"🏢 {len(owned)}/{len(found)} tenants run on {tenants.NODE_NAME}")
+    return [
+        BotSpec(tenants.bot_name(tenant.bot, tenant.id), bases[tenant.bot].entry, bases[tenant.bot].needs,
+                bases[tenant.bot].concurrency, multi_tenant=True, tenant=tenant.id)
+        for tenant in owned
+    ]
+
+
+def load_specs(config: str = BOTS_CONFIG) -> Dict[str, BotSpec]:
+    specs = {spec.name: spec for spec in BUILTIN}
+    specs.update((spec.name, spec) for spec in _from_entry_points())
+    if config:
+        specs.update((spec.name, spec) for spec in _from_config(config))
+    if tenants.TENANTS_ENABLED:
+        specs.update((spec.name, spec) for spec in _from_tenants(specs))
+    return specs
+
+
+def enabled(specs: Dict[str, BotSpec], names: str = os.getenv("ENABLED_BOTS", "")) -> Dict[str, BotSpec]:
+    """The specs named in ENABLED_BOTS, in that order, each bot followed by its tenants (all when it is empty)"""
+    wanted = [name.strip() for name in names.split(",") if name.strip()] or [n for n, s in specs.items() if not s.tenant]
+    chosen = {}
+    for name in wanted:
+        base, only_tenants = (name[:-2], True) if name.endswith(".*") else (name, False)
+        if base not in specs:
+            logger.warning(f"⚠️ ENABLED_BOTS: unknown bot {name!r} ignored (known: {', '.join(specs)})")
+        for spec in specs.values():
+            if (spec.name == base and not only_tenants) or (spec.tenant and spec.base == base):
+                chosen[spec.name] = spec
+    return chosen
+
+
+# ================= STARTING =================
+def starter(spec: BotSpec) -> Callable[[], Awaitable[Any]]:
+    """The bot's start function, importing its module on first use; for Supervisor.watch"""
+
+    async def start():
+        problem = spec.problem()
+        if problem:
+            raise RuntimeError(problem)
+        function = spec.load()  # cached after the first start
+        supervisor.mark(spec.name, "imported")
+        await (function(spec.tenant) if spec.tenant else function())
+
+    return start
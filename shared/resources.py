@@ -0,0 +1,159 @@
+"""
+SHARED RESOURCES
+Process-wide clients handed to every bot, so sockets and memory stay flat as
+bots are added:
+
+  mongo / motor      one MongoDB client per URI. Motor wraps a pymongo client,
+                     so pymongo code gets that same client and both share one
+                     connection pool
+  telegram_request   a handle on one HTTP connection pool for all Bot API calls
+                     (long polling keeps PTB's own one-connection pool per bot)
+
+    MONGO_MAX_POOL_SIZE=50     connections per MongoDB server, for all bots together
+    MONGO_MAX_IDLE_MS=60000    close connections idle this long
+    MONGO_COMPRESSORS=zlib     wire compression when the server supports it ("" = off)
+    MONGO_TLS=                 "true"/"false" overrides the URI (mongodb+srv:// implies TLS)
+    TELEGRAM_POOL_SIZE=64      Bot API connections shared by all bots
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+import httpx
+from telegram.error import TimedOut
+from telegram.request import BaseRequest, HTTPXRequest, RequestData
+
+logger = logging.getLogger(__name__)
+
+MONGO_URI = os.getenv("MONGO_URI", "")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", 60000))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zlib")
+MONGO_TLS = os.getenv("MONGO_TLS", "").lower()
+TELEGRAM_POOL_SIZE = int(os.getenv("TELEGRAM_POOL_SIZE", 64))
+TELEGRAM_POOL_TIMEOUT = 5.0   # shared by every bot, so allow for some queueing
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:  # pymongo only
+    AsyncIOMotorClient = None
+
+
+# ================= MONGODB =================
+_clients: Dict[str, object] = {}
+
+
+def mongo_options() -> dict:
+    options = {"maxPoolSize": MONGO_MAX_POOL_SIZE, "maxIdleTimeMS": MONGO_MAX_IDLE_MS}
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    if MONGO_TLS in ("true", "false"):
+        options["tls"] = MONGO_TLS == "true"
+    return options
+
+
+def motor(uri: str = MONGO_URI):
+    """The process's motor client for this URI"""
+    if AsyncIOMotorClient is None:
+        raise RuntimeError("motor is not installed")
+    client = _clients.get(uri)
+    if client is None:
+        client = _clients[uri] = AsyncIOMotorClient(uri, **mongo_options())
+    return client
+
+
+def mongo(uri: str = MONGO_URI):
+    """The process's pymongo client for this URI (the one under the motor client when motor is installed)"""
+    if AsyncIOMotorClient is not None:
+        return motor(uri).delegate
+    client = _clients.get(uri)
+    if client is None:
+        from pymongo import MongoClient
+        client = _clients[uri] = MongoClient(uri, **mongo_options())
+    return client
+
+
+# ================= TELEGRAM HTTP =================
+class HttpPool:
+    """One HTTPXRequest for every bot; closed when the last bot using it shuts down"""
+
+    def __init__(self, size: int = TELEGRAM_POOL_SIZE):
+        self.size = size
+        self.users = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.pool_timeouts = 0
+        self.request = HTTPXRequest(connection_pool_size=size, pool_timeout=TELEGRAM_POOL_TIMEOUT)
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _guard(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def acquire(self):
+        async with self._guard():
+            self.users += 1
+            await self.request.initialize()  # reopens the client after a full shutdown
+
+    async def release(self):
+        async with self._guard():
+            self.users -= 1
+            if self.users == 0:
+                await self.request.shutdown()
+
+
+class SharedRequest(BaseRequest):
+    """One bot's handle on the shared pool; what Bot.initialize/shutdown open and close"""
+
+    def __init__(self, pool: HttpPool):
+        self.pool = pool
+        self._open = False
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return self.pool.request.read_timeout
+
+    async def initialize(self):
+        if not self._open:
+            self._open = True
+            await self.pool.acquire()
+
+    async def shutdown(self):
+        if self._open:
+            self._open = False
+            await self.pool.release()
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=BaseRequest.DEFAULT_NONE,
+        write_timeout=BaseRequest.DEFAULT_NONE,
+        connect_timeout=BaseRequest.DEFAULT_NONE,
+        pool_timeout=BaseRequest.DEFAULT_NONE,
+    ):
+        pool = self.pool
+        pool.in_flight += 1
+        pool.requests += 1
+        try:
+            return await pool.request.do_request(
+                url, method, request_data, read_timeout, write_timeout, connect_timeout, pool_timeout
+            )
+        except TimedOut as e:
+            if isinstance(e.__cause__, httpx.PoolTimeout):
+                pool.pool_timeouts += 1
+            raise
+        finally:
+            pool.in_flight -= 1
+
+
+http_pool = HttpPool()
+
+
+def telegram_request() -> SharedRequest:
+    """For ApplicationBuilder.request(): Bot API calls go through the shared pool"""
+    return SharedRequest(http_pool)
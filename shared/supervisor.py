@@ -0,0 +1,308 @@
+"""
+BOT SUPERVISOR
+Tracks every bot's start task, Application and last update so the runner can
+answer health probes: liveness (restarting would help) and readiness (the bot
+is actually receiving updates), with per-bot detail and startup timings
+(import, start, first update).
+Also owns the bots' lifecycle: graceful stop (drain in-flight updates, flush
+buffers, shut down) and per-bot restart, callable from other threads.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from telegram import Update
+from telegram.ext import Application, TypeHandler
+
+from shared import webhook
+
+logger = logging.getLogger(__name__)
+
+CACHE_SECONDS = float(os.getenv("HEALTH_CACHE_SECONDS", 2))
+PROBE_TIMEOUT = 3.0        # the bot loop must answer a probe within this
+PING_TIMEOUT = 1.5
+LAG_INTERVAL = 0.5
+LAG_DECAY = 0.8            # reported lag is a decaying peak, so short stalls stay visible
+READY_MAX_LAG = 1.0
+LIVE_MAX_LAG = 10.0
+TOUCH_GROUP = -100         # runs before every other handler group
+STOP_DEADLINE = float(os.getenv("STOP_DEADLINE_SECONDS", 10))   # for in-flight updates to finish
+FLUSH_DEADLINE = 15.0      # for a bot's on_stop hook to write out its buffers
+
+
+@dataclass(slots=True)
+class BotHealth:
+    name: str
+    task: Optional[asyncio.Task] = None
+    app: Optional[Application] = None
+    ping: Optional[Callable[[], Awaitable[Any]]] = None
+    started_at: Optional[float] = None
+    last_update: Optional[float] = None
+    error: Optional[str] = None
+    start: Optional[Callable[[], Awaitable[Any]]] = None     # the bot's start_botN
+    on_stop: Optional[Callable[[], Awaitable[Any]]] = None   # flushes the bot's buffers
+    stopped: bool = False
+    marks: Dict[str, float] = field(default_factory=dict)    # startup phase -> time.time()
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # one stop/restart at a time
+
+
+class Supervisor:
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.bots: Dict[str, BotHealth] = {}
+        self.lag = 0.0
+        self.process_started = time.time()   # the runner sets its own, earlier, start time
+        self._lag_task: Optional[asyncio.Task] = None
+        self._cache: Optional[dict] = None
+        self._cache_at = 0.0
+        self._cache_lock = threading.Lock()
+
+    # ---------- bot side (event loop thread) ----------
+    def watch(self, name: str, start: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Run a bot's start function as a tracked task; a failure is logged and kept, not swallowed"""
+        self._bind()
+        bot = self.bots.setdefault(name, BotHealth(name))
+        bot.start, bot.error, bot.stopped, bot.started_at = start, None, False, time.time()
+        bot.marks = {}
+        bot.task = asyncio.create_task(start(), name=name)
+        bot.task.add_done_callback(functools.partial(self._task_done, bot))
+        self._cache = None
+        return bot.task
+
+    def attach(
+        self,
+        name: str,
+        app: Application,
+        ping: Optional[Callable[[], Awaitable[Any]]] = None,
+        on_stop: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """Called by start_botN: register the Application, an optional database ping and flush hook"""
+        self._bind()
+        bot = self.bots.setdefault(name, BotHealth(name))
+        bot.app, bot.ping, bot.on_stop = app, ping, on_stop
+        app.add_handler(TypeHandler(Update, functools.partial(self._touch, bot)), group=TOUCH_GROUP)
+
+    def mark(self, name: str, phase: str):
+        """Record when a bot reached a startup phase (first time only, until its next start)"""
+        bot = self.bots.setdefault(name, BotHealth(name))
+        bot.marks.setdefault(phase, time.time())
+
+    def _bind(self):
+        self.loop = asyncio.get_running_loop()
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.create_task(self._measure_lag())
+
+    @staticmethod
+    def _task_done(bot: BotHealth, task: asyncio.Task):
+        if task.cancelled():
+            bot.error = "cancelled"
+        elif task.exception() is not None:
+            e = task.exception()
+            bot.error = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ {bot.name} failed: {bot.error}", exc_info=e)
+        else:
+            bot.marks.setdefault("started", time.time())
+
+    async def _touch(self, bot: BotHealth, update: Update, context):
+        bot.last_update = time.time()
+        if "first_update" not in bot.marks:
+            bot.marks["first_update"] = bot.last_update
+            since_start = f"{bot.last_update - bot.started_at:.2f}s after start, " if bot.started_at else ""
+            logger.info(f"⏱️ {bot.name}: first update {since_start}{bot.last_update - self.process_started:.2f}s after process start")
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lag = max(loop.time() - started - LAG_INTERVAL, self.lag * LAG_DECAY)
+
+    # ---------- lifecycle ----------
+    async def start_all(self, starters: Dict[str, Callable[[], Awaitable[Any]]]) -> Dict[str, Optional[str]]:
+        """Start bots side by side; returns each bot's error (None when it started)"""
+        tasks = {name: self.watch(name, start) for name, start in starters.items()}
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return {name: self.bots[name].error for name in tasks}
+
+    async def stop(self, name: str, deadline: float = STOP_DEADLINE) -> bool:
+        """
+        Stop one bot gracefully: stop taking updates, let queued and in-flight ones
+        finish within the deadline, flush the bot's buffers, then shut down.
+        Returns False when the deadline cut in-flight work short.
+        """
+        bot = self.bots[name]
+        async with bot.lock:
+            return await self._stop(bot, deadline)
+
+    async def _stop(self, bot: BotHealth, deadline: float) -> bool:
+        if bot.task is not None and not bot.task.done():
+            bot.task.cancel()  # still starting
+        bot.stopped, self._cache = True, None
+        app, bot.app = bot.app, None
+        if app is None:
+            return True
+
+        # Unanswered webhook deliveries are retried by Telegram, unfetched ones stay queued there
+        webhook.ingress.unregister(bot.name)
+        if app.updater and app.updater.running:
+            await app.updater.stop()
+
+        drained = True
+        if app.running:
+            # Application.stop() handles what is already queued and waits for create_task() work
+            stopping = asyncio.ensure_future(app.stop())
+            done, _ = await asyncio.wait({stopping}, timeout=deadline)
+            if not done:
+                drained = False
+                stopping.cancel()
+                logger.warning(f"⚠️ {bot.name}: in-flight updates still running after {deadline}s, stopping anyway")
+
+        if bot.on_stop is not None:
+            try:
+                await asyncio.wait_for(bot.on_stop(), FLUSH_DEADLINE)
+            except Exception as e:
+                logger.error(f"❌ {bot.name}: flush on stop failed: {e}")
+        try:
+            await app.shutdown()
+        except Exception as e:
+            logger.error(f"❌ {bot.name}: shutdown failed: {e}")
+        logger.info(f"⏹️ {bot.name} stopped" + ("" if drained else " (deadline hit)"))
+        return drained
+
+    async def restart(self, name: str, deadline: float = STOP_DEADLINE):
+        """Stop one bot gracefully and start it again in this process"""
+        bot = self.bots[name]
+        async with bot.lock:
+            await self._stop(bot, deadline)
+            await self.watch(name, bot.start)
+
+    async def stop_all(self, deadline: float = STOP_DEADLINE, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        names = list(self.bots if names is None else names)
+        results = await asyncio.gather(*(self.stop(n, deadline) for n in names))
+        return dict(zip(names, results))
+
+    async def restart_all(self, deadline: float = STOP_DEADLINE, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        names = list(self.bots if names is None else names)
+        results = await asyncio.gather(*(self.restart(n, deadline) for n in names), return_exceptions=True)
+        return {n: f"{type(r).__name__}: {r}" if isinstance(r, BaseException) else None for n, r in zip(names, results)}
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the bots' loop from another thread (e.g. a Flask route)"""
+        if self.loop is None or not self.loop.is_running():
+            coro.close()
+            raise RuntimeError("the bots' event loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    # ---------- health ----------
+    async def _check(self, bot: BotHealth) -> dict:
+        task = bot.task
+        if bot.stopped:
+            state = "stopped"
+        elif task is None:
+            state = "unmanaged"
+        elif not task.done():
+            state = "starting"
+        else:
+            state = "failed" if bot.error else "started"
+
+        app = bot.app
+        running = bool(app and app.running)
+        if app is None:
+            updates = "none"
+        elif bot.name in webhook.ingress:
+            updates = "webhook"
+        elif app.updater and app.updater.running:
+            updates = "polling"
+        else:
+            updates = "none"
+
+        db = None
+        if bot.ping is not None:
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(bot.ping(), PING_TIMEOUT)
+                db = {"ok": True, "ping_ms": round((time.perf_counter() - started) * 1000, 1)}
+            except Exception as e:
+                db = {"ok": False, "error": (f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)[:200]}
+
+        now = time.time()
+        # Restarting helps when the start task died or a started bot stopped receiving
+        # (a bot stopped on purpose is neither)
+        live = state != "failed" and not (state == "started" and (not running or updates == "none"))
+        ready = state in ("started", "unmanaged") and running and updates != "none" and (db is None or db["ok"])
+        return {
+            "live": live,
+            "ready": ready,
+            "task": state,
+            "error": bot.error,
+            "running": running,
+            "updates": updates,
+            "uptime_s": round(now - bot.started_at) if bot.started_at else None,
+            "last_update_age_s": round(now - bot.last_update, 1) if bot.last_update else None,
+            "startup_s": self.startup(bot),
+            "mongo": db,
+        }
+
+    def startup(self, bot: BotHealth) -> dict:
+        """Seconds from the bot's start to each phase it reached, and from process start to its first update"""
+        timings = {phase: round(at - bot.started_at, 3) for phase, at in bot.marks.items()} if bot.started_at else {}
+        if "first_update" in bot.marks:
+            timings["first_update_since_process"] = round(bot.marks["first_update"] - self.process_started, 3)
+        return timings
+
+    def startup_report(self, names: Iterable[str]) -> str:
+        """One line per bot with its startup phases, for the log once start_all returns"""
+        lines = []
+        for name in names:
+            bot = self.bots[name]
+            phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.startup(bot).items())
+            lines.append(f"⏱️ {name}: {phases or 'no phase reached'}" + (f" ({bot.error})" if bot.error else ""))
+        lines.append(f"⏱️ process start to all bots started: {time.time() - self.process_started:.2f}s")
+        return "\n".join(lines)
+
+    async def _probe(self) -> dict:
+        names = list(self.bots)
+        results = await asyncio.gather(*(self._check(self.bots[n]) for n in names))
+        return dict(zip(names, results))
+
+    # ---------- runner side (any thread) ----------
+    def report(self) -> dict:
+        """Health of every bot; cached for CACHE_SECONDS so frequent probes stay cheap"""
+        with self._cache_lock:
+            now = time.monotonic()
+            if self._cache is None or now - self._cache_at >= CACHE_SECONDS:
+                self._cache = self._collect()
+                self._cache_at = now
+            return self._cache
+
+    def _collect(self) -> dict:
+        report = {"checked_at": round(time.time(), 3), "loop_lag_ms": round(self.lag * 1000, 1), "bots": {}}
+        loop = self.loop
+        if loop is None:
+            return {**report, "status": "sleeping", "live": True, "ready": False}
+        if loop.is_closed() or not loop.is_running():
+            return {**report, "status": "down", "live": False, "ready": False, "error": "event loop stopped"}
+
+        started = time.perf_counter()
+        try:
+            bots = asyncio.run_coroutine_threadsafe(self._probe(), loop).result(PROBE_TIMEOUT)
+        except Exception as e:
+            return {**report, "status": "down", "live": False, "ready": False,
+                    "error": f"event loop unresponsive ({type(e).__name__})"}
+        report["probe_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        report["bots"] = bots
+
+        live = self.lag < LIVE_MAX_LAG and all(b["live"] for b in bots.values())
+        ready = bool(bots) and self.lag < READY_MAX_LAG and all(b["ready"] for b in bots.values())
+        status = "ready" if ready else "degraded" if live else "down"
+        return {**report, "status": status, "live": live, "ready": ready}
+
+
+supervisor = Supervisor()
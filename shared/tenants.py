@@ -0,0 +1,211 @@
+"""
+TENANTS
+Many owners' copies of one bot in a single deployment. A tenant is one bot
+token with its own settings (channels, admins, ...) and its own MongoDB
+collections, prefixed with the tenant id; the handler code is shared. Tenant
+configs live in MongoDB:
+
+    <TENANTS_DB>.tenants: {"_id": "acme", "bot": "bot4", "token": "123:ABC", "enabled": true,
+                           "settings": {"ADMIN_IDS": [1, 2], "FSUB_CHANNEL_IDS": [-1001234]}}
+
+Settings keys are the bot module's constant names; whatever a tenant leaves
+out falls back to the module's value. The bot configured by environment
+variables is the default tenant "" (unprefixed collections, as before).
+
+The current tenant is a ContextVar entered when a bot starts: PTB creates its
+update tasks from the start task, so every handler and background task of
+that Application sees it. Code called from elsewhere (stop hooks) enters it
+with within().
+
+Tenants are spread over the fleet's deployments with consistent hashing, so
+adding a node only moves the tenants that now land on it:
+
+    TENANTS=true                load tenants from MongoDB at startup
+    TENANTS_DB=multibots        database holding the tenants collection
+    FLEET_NODES=node-a,node-b   every deployment in the fleet
+    NODE_NAME=node-a            this deployment (default: the only node)
+"""
+
+import asyncio
+import logging
+import os
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+from shared import resources
+from shared.hashring import HashRing
+
+logger = logging.getLogger(__name__)
+
+TENANTS_ENABLED = os.getenv("TENANTS", "").lower() in ("1", "true", "yes")
+TENANTS_DB = os.getenv("TENANTS_DB", "multibots")
+FLEET_NODES = [node.strip() for node in os.getenv("FLEET_NODES", "").split(",") if node.strip()]
+NODE_NAME = os.getenv("NODE_NAME", "") or (FLEET_NODES[0] if FLEET_NODES else "node-0")
+TENANT_ID = re.compile(r"^[A-Za-z0-9_-]{1,40}$")  # ends up in collection names, bot names and URLs
+
+
+@dataclass(slots=True)
+class Tenant:
+    id: str                                    # "" = the default tenant, configured by env vars
+    bot: str                                   # registry name of the bot it runs, e.g. "bot4"
+    token: str = ""
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return bot_name(self.bot, self.id)
+
+    def collection(self, name: str) -> str:
+        return f"{self.id}.{name}" if self.id else name
+
+
+def bot_name(bot: str, tenant_id: str) -> str:
+    """Name of a tenant's bot in the registry, supervisor, metrics and webhook paths"""
+    return f"{bot}.{tenant_id}" if tenant_id else bot
+
+
+DEFAULT = Tenant("", "")
+_current: ContextVar[Tenant] = ContextVar("tenant", default=DEFAULT)
+
+
+def current() -> Tenant:
+    return _current.get()
+
+
+def within(tenant: Tenant, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """An async callable run as the tenant, for hooks called from outside its tasks"""
+
+    async def run(*args, **kwargs):
+        token = _current.set(tenant)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
+
+
+async def start_as(bot: str, tenant_id: str = "") -> Tenant:
+    """First thing in a bot's start function: load the tenant and make it current for this task and its children"""
+    if not tenant_id:
+        tenant = Tenant("", bot)
+    else:
+        tenant = await asyncio.to_thread(load, tenant_id)
+        if tenant.bot != bot:
+            raise ValueError(f"tenant {tenant_id} runs {tenant.bot}, not {bot}")
+    _current.set(tenant)
+    return tenant
+
+
+# ================= PER-TENANT STATE =================
+class Settings:
+    """Module constants a tenant may override: settings.ADMIN_IDS is the current tenant's value or the default"""
+
+    def __init__(self, **defaults):
+        self._defaults = defaults
+
+    def __getattr__(self, name: str):
+        try:
+            default = self._defaults[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return _current.get().settings.get(name, default)
+
+
+class Scoped:
+    """One object per tenant, made by factory(tenant) on first use; attribute access goes to the current tenant's"""
+    __slots__ = ("_factory", "_instances")
+
+    def __init__(self, factory: Callable[[Tenant], Any]):
+        self._factory = factory
+        self._instances: Dict[str, Any] = {}
+
+    def get(self, tenant: Tenant = None):
+        tenant = tenant or _current.get()
+        obj = self._instances.get(tenant.id)
+        if obj is None:
+            token = _current.set(tenant)  # so the factory's own lookups see the same tenant
+            try:
+                obj = self._instances[tenant.id] = self._factory(tenant)
+            finally:
+                _current.reset(token)
+        return obj
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+
+class PrefixedDatabase:
+    """A pymongo/motor database whose collections carry the tenant's prefix: db.users is db["acme.users"]"""
+    __slots__ = ("_db", "_prefix")
+
+    def __init__(self, db, prefix: str):
+        self._db = db
+        self._prefix = prefix
+
+    def __getitem__(self, name: str):
+        return self._db[self._prefix + name]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._db[self._prefix + name]
+
+
+def database(db, tenant: Tenant):
+    return PrefixedDatabase(db, f"{tenant.id}.") if tenant.id else db
+
+
+# ================= STORE =================
+def store():
+    """The tenants collection"""
+    return resources.mongo()[TENANTS_DB]["tenants"]
+
+
+def _from_doc(doc: dict) -> Tenant:
+    return Tenant(id=doc["_id"], bot=doc["bot"], token=doc.get("token", ""), settings=doc.get("settings") or {})
+
+
+def load(tenant_id: str) -> Tenant:
+    """One tenant's config (blocking)"""
+    doc = store().find_one({"_id": tenant_id})
+    if doc is None:
+        raise KeyError(f"unknown tenant {tenant_id!r}")
+    if not doc.get("enabled", True):
+        raise ValueError(f"tenant {tenant_id} is disabled")
+    return _from_doc(doc)
+
+
+def load_enabled(bots: Iterable[str]) -> List[Tenant]:
+    """Enabled tenants of these bots (blocking)"""
+    tenants = []
+    for doc in store().find({"bot": {"$in": list(bots)}, "enabled": {"$ne": False}}):
+        if TENANT_ID.match(str(doc["_id"])):
+            tenants.append(_from_doc(doc))
+        else:
+            logger.error(f"❌ Tenant id {doc['_id']!r} ignored: use letters, digits, _ and -")
+    return tenants
+
+
+def save(tenant: Tenant, enabled: bool = True):
+    if not TENANT_ID.match(tenant.id):
+        raise ValueError(f"bad tenant id {tenant.id!r}: use letters, digits, _ and -")
+    store().replace_one(
+        {"_id": tenant.id},
+        {"_id": tenant.id, "bot": tenant.bot, "token": tenant.token, "enabled": enabled, "settings": tenant.settings},
+        upsert=True,
+    )
+
+
+# ================= FLEET =================
+ring = HashRing(FLEET_NODES or [NODE_NAME])
+
+if FLEET_NODES and NODE_NAME not in FLEET_NODES:
+    logger.warning(f"⚠️ NODE_NAME {NODE_NAME!r} is not in FLEET_NODES, so it owns no tenants")
+
+
+def owned(tenant_id: str) -> bool:
+    """Whether this deployment runs the tenant"""
+    return ring.node(tenant_id) == NODE_NAME
@@ -0,0 +1,267 @@
+"""
+THROTTLE
+Per-user rate limits in front of every handler. install() adds a TypeHandler
+in group -1, so it sees each update before any bot handler. An update over
+budget ends there (ApplicationHandlerStop) and costs no database query:
+
+  callback query  answered with the rule's notice, so the button stops spinning
+  message         one notice per window, later ones are dropped silently
+
+Every user has the default budget over all their updates, and rules add
+tighter budgets for expensive actions, matched on callback data, message
+text or command:
+
+    throttle.install(app, "bot4", [
+        throttle.Rule("withdraw", 3, 60, text=r"^💸 Withdraw$"),
+        throttle.Rule("redeem", 5, 60, callback=r"^redeem_"),
+    ])
+
+Counts are sliding windows (the current and previous fixed window, the
+previous one weighted by how much of it still overlaps), two integers per
+user and action. With THROTTLE_SHARED=true they are also summed across
+every process and deployment through MongoDB, synced in the background,
+so a user spread over instances gets one budget, a sync interval late.
+
+    THROTTLE=true                  off: install() does nothing
+    THROTTLE_DEFAULT=30/10         updates per seconds, per user and bot
+    THROTTLE_SHARED=false          mirror counts to <THROTTLE_DB>.throttle
+    THROTTLE_DB=multibots
+    THROTTLE_SYNC_SECONDS=1
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import Application, ApplicationHandlerStop, TypeHandler
+
+from shared import metrics, resources
+from shared.outbound import Lane
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_ENABLED = os.getenv("THROTTLE", "true").lower() not in ("0", "false", "no")
+THROTTLE_DEFAULT = os.getenv("THROTTLE_DEFAULT", "30/10")
+THROTTLE_SHARED = os.getenv("THROTTLE_SHARED", "").lower() in ("1", "true", "yes")
+THROTTLE_DB = os.getenv("THROTTLE_DB", "multibots")
+SYNC_SECONDS = float(os.getenv("THROTTLE_SYNC_SECONDS", 1))
+PRUNE_SECONDS = 60
+NOTICE = "⏳ Slow down a little and try again in a moment."
+
+metrics.registry.describe("bot_throttled_total", "counter", "Updates stopped by the per-user rate limit, by action")
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    action: str                      # metric label and part of the counter key
+    limit: int                       # updates allowed...
+    per: float                       # ...per this many seconds
+    callback: Optional[str] = None   # regex on callback data
+    text: Optional[str] = None       # regex on message text
+    command: Optional[str] = None    # e.g. "start"
+    notice: str = NOTICE
+
+    def matches(self, update: Update) -> bool:
+        query = update.callback_query
+        if query is not None:
+            return self.callback is not None and re.search(self.callback, query.data or "") is not None
+        text = update.message.text if update.message else None
+        if not text:
+            return False
+        if self.command is not None and text.split(maxsplit=1)[0].split("@")[0] == f"/{self.command}":
+            return True
+        return self.text is not None and re.search(self.text, text) is not None
+
+
+def _default() -> Rule:
+    limit, _, per = THROTTLE_DEFAULT.partition("/")
+    return Rule("all", int(limit), float(per or 1))
+
+
+# ================= SLIDING WINDOWS =================
+class Window:
+    """One user's count for one action: this fixed window, the previous one, and the other instances' share"""
+    __slots__ = ("per", "start", "current", "previous", "remote_current", "remote_previous", "noticed")
+
+    def __init__(self, per: float, now: float):
+        self.per = per
+        self.start = now - now % per  # aligned to the epoch, so every instance has the same windows
+        self.current = self.previous = 0
+        self.remote_current = self.remote_previous = 0
+        self.noticed = False
+
+    def roll(self, now: float):
+        elapsed = int((now - self.start) // self.per)
+        if elapsed <= 0:
+            return
+        single = elapsed == 1
+        self.previous = self.current if single else 0
+        self.remote_previous = self.remote_current if single else 0
+        self.current = self.remote_current = 0
+        self.start += elapsed * self.per
+        self.noticed = False
+
+    @property
+    def previous_start(self) -> float:
+        return self.start - self.per
+
+    def estimate(self, now: float) -> float:
+        overlap = 1 - (now - self.start) / self.per
+        return (self.previous + self.remote_previous) * overlap + self.current + self.remote_current
+
+
+class Throttle:
+    """The group -1 handler of one bot"""
+
+    def __init__(self, bot: str, rules: Sequence[Rule] = (), default: Optional[Rule] = None):
+        self.bot = bot
+        self.rules = list(rules)
+        self.default = default or _default()
+        self.windows: Dict[Tuple[str, int], Window] = {}
+        self.per = {rule.action: rule.per for rule in (self.default, *self.rules)}  # for the mirror's expiry
+        self._next_prune = 0.0
+
+    def _hit(self, rule: Rule, user_id: int, now: float) -> Tuple[bool, Window]:
+        """Count the update against the rule; False when it is over budget"""
+        key = (rule.action, user_id)
+        window = self.windows.get(key)
+        if window is None:
+            window = self.windows[key] = Window(rule.per, now)
+        else:
+            window.roll(now)
+        if window.estimate(now) >= rule.limit:
+            return False, window
+        window.current += 1
+        if mirror is not None:
+            mirror.add(self, key, window.start)
+        return True, window
+
+    def _prune(self, now: float):
+        # Windows untouched for two periods count nothing any more
+        stale = [key for key, w in self.windows.items() if now - w.start >= 2 * w.per]
+        for key in stale:
+            del self.windows[key]
+        self._next_prune = now + PRUNE_SECONDS
+
+    async def __call__(self, update: Update, context):
+        user = update.effective_user
+        if user is None:
+            return  # channel posts, polls: not a person tapping
+        now = time.time()
+        if now >= self._next_prune:
+            self._prune(now)
+        rule = self.default
+        allowed, window = self._hit(rule, user.id, now)
+        if allowed:
+            rule = next((r for r in self.rules if r.matches(update)), None)
+            if rule is None:
+                return
+            allowed, window = self._hit(rule, user.id, now)
+            if allowed:
+                return
+        metrics.registry.inc("bot_throttled_total", (("bot", self.bot), ("action", rule.action)))
+        await self._refuse(update, context, rule, window)
+        raise ApplicationHandlerStop
+
+    async def _refuse(self, update: Update, context, rule: Rule, window: Window):
+        try:
+            if update.callback_query is not None:
+                await update.callback_query.answer(rule.notice)
+            elif update.effective_message is not None and not window.noticed:
+                window.noticed = True
+                await update.effective_message.reply_text(rule.notice, rate_limit_args=Lane.BACKGROUND)
+        except TelegramError as e:
+            logger.debug(f"[{self.bot}] throttle notice failed: {e}")
+
+
+def install(app: Application, bot: str, rules: Sequence[Rule] = ()) -> Optional[Throttle]:
+    """Put the rate limit in front of the bot's handlers (call before metrics.instrument, so it's timed too)"""
+    if not THROTTLE_ENABLED:
+        return None
+    throttle = Throttle(bot, rules)
+    app.add_handler(TypeHandler(Update, throttle), group=-1)
+    return throttle
+
+
+# ================= SHARED COUNTS =================
+class Mirror:
+    """
+    Sums counts across instances in MongoDB: every SYNC_SECONDS, adds this
+    instance's new hits to one document per user, action and window, and
+    reads back the totals of the windows in use here. Documents expire with
+    their window (TTL index).
+    """
+
+    def __init__(self):
+        self.pending: Dict[Tuple[str, str, int, float], int] = {}   # (bot, action, user, window start) -> hits
+        self.throttles: Dict[str, Throttle] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._indexed = False
+
+    def add(self, throttle: Throttle, key: Tuple[str, int], start: float):
+        pending_key = (throttle.bot, *key, start)
+        self.pending[pending_key] = self.pending.get(pending_key, 0) + 1
+        self.throttles[throttle.bot] = throttle
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @staticmethod
+    def _id(bot: str, action: str, user_id: int, start: float) -> str:
+        return f"{bot}:{action}:{user_id}:{int(start)}"
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(SYNC_SECONDS)
+            pending, self.pending = self.pending, {}
+            # Every window in use here, with this instance's own count, as of now
+            local = {}
+            for bot, throttle in list(self.throttles.items()):
+                for (action, user_id), w in throttle.windows.items():
+                    local[self._id(bot, action, user_id, w.start)] = (w, w.start, w.current, True)
+                    local[self._id(bot, action, user_id, w.previous_start)] = (w, w.previous_start, w.previous, False)
+            try:
+                totals = await asyncio.to_thread(self._sync, pending, list(local))
+            except Exception as e:
+                for key, hits in pending.items():
+                    self.pending[key] = self.pending.get(key, 0) + hits
+                logger.error(f"❌ Throttle sync failed: {e}")
+                continue
+            for doc_id, (w, start, own, current) in local.items():
+                remote = max(0, totals.get(doc_id, own) - own)
+                if current and w.start == start:
+                    w.remote_current = remote
+                elif not current and w.previous_start == start:
+                    w.remote_previous = remote
+
+    def _sync(self, pending, ids: List[str]) -> Dict[str, int]:
+        """Blocking: push our hits, read everyone's totals"""
+        from pymongo import ASCENDING, UpdateOne
+        collection = resources.mongo()[THROTTLE_DB]["throttle"]
+        if not self._indexed:
+            collection.create_index([("expires", ASCENDING)], expireAfterSeconds=0)
+            self._indexed = True
+        if pending:
+            operations = []
+            for (bot, action, user_id, start), hits in pending.items():
+                expires = datetime.fromtimestamp(start + 2 * self.throttles[bot].per[action], timezone.utc)
+                operations.append(UpdateOne(
+                    {"_id": self._id(bot, action, user_id, start)},
+                    {"$inc": {"n": hits}, "$setOnInsert": {"expires": expires}},
+                    upsert=True,
+                ))
+            collection.bulk_write(operations, ordered=False)
+        totals = {}
+        for i in range(0, len(ids), 1000):
+            for doc in collection.find({"_id": {"$in": ids[i:i + 1000]}}, {"n": 1}):
+                totals[doc["_id"]] = doc["n"]
+        return totals
+
+
+mirror = Mirror() if THROTTLE_SHARED else None
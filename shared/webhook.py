@@ -0,0 +1,200 @@
+"""
+WEBHOOK INGRESS
+One aiohttp server for every bot: Telegram posts to /tg/<bot> and the update
+goes straight onto that bot's Application.update_queue. Bots fall back to
+long polling when WEBHOOK_URL is unset or the webhook can't be set up.
+
+With WORKERS > 1 only the runner listens: its ingress checks the secret and
+hands the body to the worker process running the bot (WorkerPool.forward),
+which puts it on the bot's queue. Workers never bind WEBHOOK_PORT.
+
+    WEBHOOK_URL=https://example.com  public base URL (enables webhook mode)
+    WEBHOOK_PORT=8443                local port of the ingress
+    WEBHOOK_SECRET=...               base secret; each bot gets its own token derived from it.
+                                     Required with WEBHOOK_URL: every replica and restart must
+                                     derive the same tokens, or Telegram's posts get 403s
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip("/")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", 8443))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", 100))
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+PATH = "/tg/{bot}"
+
+
+def secret_for(name: str, base: str = WEBHOOK_SECRET) -> str:
+    """Per-bot secret token (Telegram allows A-Z, a-z, 0-9, _ and -)"""
+    return hmac.new(base.encode(), name.encode(), hashlib.sha256).hexdigest()
+
+
+# ================= INGRESS =================
+class WebhookIngress:
+    """Routes POST /tg/<bot> to the registered Application's update queue"""
+
+    def __init__(self, host: str = WEBHOOK_HOST, port: int = WEBHOOK_PORT):
+        self.host = host
+        self.port = port
+        self._apps: Dict[str, Application] = {}
+        self._secrets: Dict[str, bytes] = {}
+        self._serving: Optional[asyncio.Future] = None
+        self._runner: Optional[web.AppRunner] = None
+        self.listen = True      # False in worker processes: the runner's ingress forwards to them
+        self.forward: Optional[Callable[[str, bytes], bool]] = None  # runner with workers: body -> bot's process
+        self.stats = {"accepted": 0, "forbidden": 0, "unknown": 0, "invalid": 0, "forwarded": 0, "unavailable": 0}
+
+    def register(self, name: str, app: Application, secret: str):
+        self._apps[name] = app
+        self._secrets[name] = secret.encode()
+
+    def unregister(self, name: str):
+        self._apps.pop(name, None)
+        self._secrets.pop(name, None)
+
+    def route(self, name: str, secret: str):
+        """Accept updates for a bot that runs in another process (see forward)"""
+        self._secrets[name] = secret.encode()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._apps
+
+    async def handle(self, request: web.Request) -> web.Response:
+        name = request.match_info["bot"]
+        secret = self._secrets.get(name)
+        if secret is None:
+            self.stats["unknown"] += 1
+            return web.Response(status=404)
+        token = request.headers.get(SECRET_HEADER, "").encode("utf-8", "replace")
+        if not hmac.compare_digest(token, secret):
+            self.stats["forbidden"] += 1
+            return web.Response(status=403)
+        body = await request.read()
+        if self.forward is not None:
+            if not self.forward(name, body):
+                self.stats["unavailable"] += 1
+                return web.Response(status=503)  # worker down or restarting: Telegram retries
+            self.stats["forwarded"] += 1
+            return web.Response()
+        return web.Response(status=self.accept(name, body))
+
+    def accept(self, name: str, body: bytes) -> int:
+        """Put one update on the bot's queue; returns the HTTP status for it"""
+        app = self._apps.get(name)
+        if app is None:
+            self.stats["unknown"] += 1
+            return 404
+        try:
+            update = Update.de_json(json.loads(body), app.bot)
+        except (ValueError, TypeError, KeyError) as e:
+            self.stats["invalid"] += 1
+            logger.warning(f"Webhook {name}: bad update ({e})")
+            return 400
+        # Answer right away: handlers run from the queue, like polled updates
+        app.update_queue.put_nowait(update)
+        self.stats["accepted"] += 1
+        return 200
+
+    def make_app(self) -> web.Application:
+        server = web.Application()
+        server.router.add_post(PATH, self.handle)
+        server.router.add_get("/tg", lambda r: web.json_response({"bots": sorted(self._apps), **self.stats}))
+        return server
+
+    async def serve(self):
+        """Start the server once, however many bots ask for it"""
+        if not self.listen:
+            return
+        if self._serving is None:
+            self._serving = asyncio.ensure_future(self._start())
+        try:
+            await asyncio.shield(self._serving)
+        except Exception:
+            self._serving = None  # let the next bot try again
+            raise
+
+    async def _start(self):
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except Exception:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        logger.info(f"🌐 Webhook ingress listening on {self.host}:{self.port}")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+        self._runner = self._serving = None
+
+
+ingress = WebhookIngress()
+
+
+def serve_forwarding(names: Iterable[str], forward: Callable[[str, bytes], bool]) -> Optional[threading.Thread]:
+    """
+    WORKERS > 1: run the ingress on its own thread in the runner, for every
+    bot of the pool; forward(name, body) hands an update to the bot's worker
+    and returns False when that worker can't take it.
+    """
+    if not WEBHOOK_URL or not WEBHOOK_SECRET:
+        return None  # the workers poll (and log why)
+    for name in names:
+        ingress.route(name, secret_for(name))
+    ingress.forward = forward
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(ingress.serve())
+        except Exception as e:
+            logger.error(f"❌ Webhook ingress failed to start: {e}")
+            return
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="webhook-ingress", daemon=True)
+    thread.start()
+    return thread
+
+
+# ================= STARTUP =================
+async def start_updates(name: str, app: Application, **polling_kwargs):
+    """Receive updates for an already started Application: webhook if configured, else polling"""
+    if WEBHOOK_URL and not WEBHOOK_SECRET:
+        logger.error(f"{name}: WEBHOOK_URL is set but WEBHOOK_SECRET is not, falling back to polling")
+    elif WEBHOOK_URL:
+        secret = secret_for(name)
+        try:
+            await ingress.serve()
+            ingress.register(name, app, secret)
+            await app.bot.set_webhook(
+                f"{WEBHOOK_URL}/tg/{name}",
+                secret_token=secret,
+                max_connections=MAX_CONNECTIONS,
+                allowed_updates=polling_kwargs.get("allowed_updates"),
+            )
+            logger.info(f"{name}: receiving updates by webhook")
+            return
+        except Exception as e:
+            ingress.unregister(name)
+            logger.error(f"{name}: webhook setup failed ({e}), falling back to polling")
+    # start_polling deletes any webhook left over from an earlier run
+    await app.updater.start_polling(**polling_kwargs)
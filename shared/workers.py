@@ -0,0 +1,353 @@
+"""
+WORKER POOL
+Runs the bots in WORKERS child processes instead of the runner's own event
+loop, so a crash, a memory blowup or a stuck loop only takes down the bots of
+one worker. Tenants' copies of a bot go to workers by consistent hashing (so
+adding tenants or workers moves few of them), other bots by concurrency budget
+(largest first, onto the least loaded worker). A worker that dies is started
+again with the same bots after a growing backoff.
+
+Each worker has its own event loop, Supervisor and shared resources. The runner
+talks to it over a pipe: health report, metrics snapshot, restart and stop. In
+webhook mode the runner alone serves WEBHOOK_PORT and sends each update down a
+second, one-way pipe to the worker running its bot (see shared/webhook.py).
+
+    WORKERS=4    worker processes (1 = run the bots in the runner process)
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from shared import metrics
+from shared.hashring import HashRing
+from shared.registry import BotSpec
+
+logger = logging.getLogger(__name__)
+
+WORKERS = max(1, int(os.getenv("WORKERS", 1)))
+CALL_TIMEOUT = 5.0                       # for a health report or metrics snapshot
+MONITOR_INTERVAL = 1.0
+RESTART_BACKOFF = (1, 2, 5, 10, 30, 60)  # seconds before each further restart of a crashing worker
+STABLE_SECONDS = 300                     # a worker up this long starts over at the first step
+
+metrics.registry.describe("bot_worker_up", "gauge", "Whether the worker process is running")
+metrics.registry.describe("bot_worker_restarts_total", "counter", "Times the worker process was restarted after exiting")
+
+
+def assign(specs: Sequence[BotSpec], workers: int) -> List[List[BotSpec]]:
+    """Spread bots over workers: tenants by consistent hash, the rest by budget, largest first onto the least loaded"""
+    groups: List[List[BotSpec]] = [[] for _ in range(max(1, min(workers, len(specs))))]
+    load = [0] * len(groups)
+    ring = HashRing(str(i) for i in range(len(groups)))
+    for spec in specs:
+        if spec.tenant:
+            i = int(ring.node(spec.name))
+            groups[i].append(spec)
+            load[i] += spec.concurrency
+    for spec in sorted((s for s in specs if not s.tenant), key=lambda s: -s.concurrency):
+        i = load.index(min(load))
+        groups[i].append(spec)
+        load[i] += spec.concurrency
+    return groups
+
+
+# ================= WORKER PROCESS =================
+def _worker_main(index: int, specs: List[BotSpec], conn, updates, stop_deadline: float, call_timeout: float):
+    """Child process: start this worker's bots on a fresh loop and answer the runner over the pipe"""
+    from shared import logs, registry, webhook
+    from shared.supervisor import supervisor
+
+    logs.setup(worker=index)
+    webhook.ingress.listen = False  # the runner's ingress forwards our bots' updates
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C reaches the whole group; the runner stops us
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    def answer(command, arg):
+        if command == "report":
+            return supervisor.report()
+        if command == "metrics":
+            return metrics.registry.snapshot()
+        if command == "restart":
+            return supervisor.submit(supervisor.restart_all(stop_deadline, arg)).result(call_timeout)
+        if command == "stop":
+            return supervisor.submit(supervisor.stop_all(stop_deadline)).result(call_timeout)
+        raise ValueError(f"unknown command {command!r}")
+
+    def serve():
+        while True:
+            try:
+                seq, command, arg = conn.recv()
+            except (EOFError, OSError):
+                seq, command, arg = None, "stop", None  # the runner is gone: stop cleanly anyway
+            try:
+                reply = answer(command, arg)
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            if seq is not None:
+                try:
+                    conn.send((seq, reply))
+                except OSError:
+                    pass
+            if command == "stop":
+                loop.call_soon_threadsafe(loop.stop)
+                return
+
+    def deliver():
+        # Updates forwarded by the runner: "<bot>\n<body>", queued on the bot's loop
+        while True:
+            try:
+                data = updates.recv_bytes()
+            except (EOFError, OSError):
+                return
+            name, _, body = data.partition(b"\n")
+            loop.call_soon_threadsafe(webhook.ingress.accept, name.decode(), body)
+
+    async def start():
+        await supervisor.start_all({spec.name: registry.starter(spec) for spec in specs})
+        logger.info(f"worker {index}: " + supervisor.startup_report(spec.name for spec in specs))
+
+    threading.Thread(target=serve, name=f"worker-{index}-pipe", daemon=True).start()
+    threading.Thread(target=deliver, name=f"worker-{index}-updates", daemon=True).start()
+    loop.run_until_complete(start())
+    loop.run_forever()
+    logs.stop()  # multiprocessing ends the child with os._exit, so atexit won't
+
+
+# ================= RUNNER SIDE =================
+class Worker:
+    """The runner's handle on one worker process"""
+
+    def __init__(self, index: int, specs: List[BotSpec]):
+        self.index = index
+        self.specs = specs
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.updates = None                   # send end of the forwarded-updates pipe
+        self.started_at = 0.0
+        self.restarts = 0
+        self.crashes = 0                      # in a row, for the backoff
+        self.retry_at: Optional[float] = None
+        self._lock = threading.Lock()         # one request on the pipe at a time
+        self._seq = itertools.count()
+
+    @property
+    def names(self) -> List[str]:
+        return [spec.name for spec in self.specs]
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, context, stop_deadline: float, call_timeout: float):
+        parent, child = context.Pipe()
+        receive, send = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.index, self.specs, child, receive, stop_deadline, call_timeout),
+            name=f"bots-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        receive.close()
+        self.conn, self.updates, self.started_at = parent, send, time.time()
+
+    def forward(self, name: str, body: bytes) -> bool:
+        """Hand a webhook update to the worker; False when it is down"""
+        if not self.alive:
+            return False
+        try:
+            # The worker's reader thread drains the pipe however busy its loop is
+            self.updates.send_bytes(name.encode() + b"\n" + body)
+        except OSError:
+            return False
+        return True
+
+    def call(self, command: str, arg=None, timeout: float = CALL_TIMEOUT):
+        with self._lock:
+            seq = next(self._seq)
+            self.conn.send((seq, command, arg))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    raise TimeoutError(f"worker {self.index} did not answer {command!r} within {timeout}s")
+                got, reply = self.conn.recv()
+                if got == seq:  # anything older answers a call that already timed out
+                    return reply
+
+
+class WorkerPool:
+    def __init__(self, specs: Sequence[BotSpec], workers: int, stop_deadline: float, lifecycle_timeout: float):
+        self.workers = [Worker(i, group) for i, group in enumerate(assign(specs, workers))]
+        self.context = multiprocessing.get_context("spawn")  # fork would copy the runner's threads and locks
+        self.stop_deadline = stop_deadline
+        self.lifecycle_timeout = lifecycle_timeout
+        self.running = False
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+
+    def owner(self, name: str) -> Optional[Worker]:
+        return next((w for w in self.workers if name in w.names), None)
+
+    @property
+    def names(self) -> List[str]:
+        return [name for worker in self.workers for name in worker.names]
+
+    def forward(self, name: str, body: bytes) -> bool:
+        """The runner's webhook ingress: pass an update to the worker running the bot"""
+        worker = self.owner(name)
+        return worker is not None and worker.forward(name, body)
+
+    # ---------- lifecycle ----------
+    def start(self):
+        with self._lock:
+            self.running = True
+            for worker in self.workers:
+                if not worker.alive:
+                    worker.retry_at = None
+                    worker.start(self.context, self.stop_deadline, self.lifecycle_timeout)
+                    logger.info(f"🧩 worker {worker.index} (pid {worker.process.pid}): {', '.join(worker.names)}")
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self._watch, name="worker-monitor", daemon=True)
+            self._monitor.start()
+
+    def _watch(self):
+        while self.running:
+            for worker in self.workers:
+                with self._lock:
+                    if self.running and not worker.alive:
+                        self._revive(worker)
+            time.sleep(MONITOR_INTERVAL)
+
+    def _revive(self, worker: Worker):
+        now = time.time()
+        if worker.retry_at is None:
+            if now - worker.started_at >= STABLE_SECONDS:
+                worker.crashes = 0
+            delay = RESTART_BACKOFF[min(worker.crashes, len(RESTART_BACKOFF) - 1)]
+            worker.retry_at = now + delay
+            logger.error(f"❌ worker {worker.index} ({', '.join(worker.names)}) exited with code "
+                         f"{worker.process.exitcode}, restarting in {delay}s")
+        elif now >= worker.retry_at:
+            worker.retry_at = None
+            worker.crashes += 1
+            worker.restarts += 1
+            worker.start(self.context, self.stop_deadline, self.lifecycle_timeout)
+
+    def _each(self, fn, workers: Sequence[Worker]) -> list:
+        if not workers:
+            return []
+        with ThreadPoolExecutor(len(workers)) as pool:
+            return list(pool.map(fn, workers))
+
+    def stop(self) -> Dict[str, bool]:
+        """Stop every worker's bots gracefully, then the processes; returns whether each bot drained"""
+        with self._lock:
+            self.running = False
+
+        def stop_one(worker: Worker) -> Dict[str, bool]:
+            drained = {name: False for name in worker.names}
+            if worker.alive:
+                try:
+                    reply = worker.call("stop", timeout=self.lifecycle_timeout)
+                    if "error" not in reply:
+                        drained = reply
+                except Exception as e:
+                    logger.error(f"❌ worker {worker.index}: stop failed: {e}")
+                worker.process.join(5)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            return drained
+
+        results = {}
+        for drained in self._each(stop_one, self.workers):
+            results.update(drained)
+        return results
+
+    def restart(self, names: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Restart bots in place in their workers; returns each bot's error (None when it restarted)"""
+        by_worker = {}
+        for name in names:
+            by_worker.setdefault(self.owner(name).index, []).append(name)
+
+        def restart_in(worker: Worker) -> Dict[str, Optional[str]]:
+            wanted = by_worker[worker.index]
+            try:
+                reply = worker.call("restart", wanted, timeout=self.lifecycle_timeout)
+            except Exception as e:
+                return {name: f"worker {worker.index}: {type(e).__name__}: {e}" for name in wanted}
+            return {name: reply["error"] for name in wanted} if "error" in reply else reply
+
+        errors = {}
+        for result in self._each(restart_in, [w for w in self.workers if w.index in by_worker]):
+            errors.update(result)
+        return errors
+
+    # ---------- health and metrics ----------
+    def report(self) -> dict:
+        """Same shape as Supervisor.report(), merged over workers, plus a per-worker section"""
+
+        def check(worker: Worker) -> dict:
+            info = {"worker": worker.index, "pid": worker.process.pid if worker.process else None,
+                    "alive": worker.alive, "bots": worker.names, "restarts": worker.restarts}
+            if not worker.alive:
+                exitcode = worker.process.exitcode if worker.process else None
+                return {**info, "status": "down", "live": True, "ready": False, "exitcode": exitcode}
+            try:
+                health = worker.call("report")
+                if "status" not in health:
+                    raise RuntimeError(health.get("error"))
+                return {**info, "health": health}
+            except Exception as e:
+                return {**info, "status": "down", "live": False, "ready": False, "error": f"{type(e).__name__}: {e}"}
+
+        workers, bots = [], {}
+        for info in self._each(check, self.workers):
+            health = info.pop("health", None)
+            if health is None:
+                # A dead worker is restarted by the pool, so its bots are down but not stuck
+                state = "worker restarting" if info["alive"] is False else "worker unresponsive"
+                for name in info["bots"]:
+                    bots[name] = {"live": info["live"], "ready": False, "task": state, "worker": info["worker"]}
+            else:
+                info.update(status=health["status"], live=health["live"], ready=health["ready"],
+                            loop_lag_ms=health["loop_lag_ms"])
+                for name, bot in health["bots"].items():
+                    bots[name] = {**bot, "worker": info["worker"]}
+            workers.append(info)
+
+        live = all(w["live"] for w in workers)
+        ready = bool(bots) and all(w["ready"] for w in workers)
+        status = "ready" if ready else "degraded" if live else "down"
+        return {"checked_at": round(time.time(), 3), "status": status, "live": live, "ready": ready,
+                "bots": bots, "workers": workers}
+
+    def render_metrics(self) -> str:
+        """Every worker's metrics, labelled by worker, plus the pool's own"""
+
+        def snapshot(worker: Worker):
+            try:
+                return worker.call("metrics") if worker.alive else None
+            except Exception:
+                return None
+
+        snapshots = {}
+        for worker, snap in zip(self.workers, self._each(snapshot, self.workers)):
+            if snap is not None and not isinstance(snap, dict):
+                snapshots[(("worker", str(worker.index)),)] = snap
+        samples = []
+        for worker in self.workers:
+            labels = (("worker", str(worker.index)),)
+            samples += [("bot_worker_up", labels, int(worker.alive)), ("bot_worker_restarts_total", labels, worker.restarts)]
+        snapshots[()] = ({}, {}, samples)
+        return metrics.registry.render(snapshots)
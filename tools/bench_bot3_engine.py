@@ -0,0 +1,83 @@
+"""
+Throughput benchmarks for BOT3's game logic.
+
+  engine     engine.play_match with uniform picks, no Telegram layer at all
+  handlers   CPU matches one after another through handle_callback with fake
+             queries (callback decoding, locks, CPU picks, rendering)
+  parallel   the same handler path with many matches in flight at once
+
+    python tools/bench_bot3_engine.py [matches]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from bot3_harness import FakeApplication, bot3, settle, tap  # also puts the repo on sys.path
+from BOT3 import engine
+from BOT3.callbacks import Action
+from BOT3.match import Match
+
+balls_played = 0
+_apply_ball = bot3.apply_ball
+
+
+async def counting_apply_ball(query, m, b1, b2):
+    global balls_played
+    balls_played += 1
+    await _apply_ball(query, m, b1, b2)
+
+
+def bench_engine(count):
+    balls = 0
+    started = time.perf_counter()
+    for n in range(count):
+        m = Match(f"{n & 0xFFFFFF:06X}", "-1", players=["1", "2"], names=["A", "B"])
+        m.start_innings("1")
+        engine.play_match(m, lambda m, uid: random.randint(1, 6))
+        balls += sum(len(log) for log in m.logs)
+    return balls, time.perf_counter() - started
+
+
+async def play_cpu(app, n):
+    uid, chat_id = n + 1, n + 1
+    match_id = bot3.matches.new_id()
+    await tap(app, uid, chat_id, Action.MODE_CPU, match_id, 0)
+    m = bot3.matches.get(match_id)
+    await tap(app, uid, chat_id, Action.HEADS, match_id, m.seq)
+    await tap(app, uid, chat_id, random.choice((Action.BAT, Action.BOWL)), match_id, m.seq)
+    while bot3.matches.get(match_id) is not None:
+        await tap(app, uid, chat_id, Action.N1 + random.randint(0, 5), match_id, m.seq)
+        await settle(m)
+
+
+async def bench_handlers(count, parallel):
+    global balls_played
+    app = FakeApplication()
+    balls_played = 0
+    started = time.perf_counter()
+    if parallel:
+        await asyncio.gather(*(play_cpu(app, n) for n in range(count)))
+    else:
+        for n in range(count):
+            await play_cpu(app, n)
+    return balls_played, time.perf_counter() - started
+
+
+def report(label, balls, elapsed):
+    print(f"{label:>9}: {balls:8,} balls in {elapsed:6.2f}s  {balls / elapsed:12,.0f} balls/s  {elapsed / balls * 1e6:8.1f} µs/ball")
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bot3.BALL_SUSPENSE = 0
+    bot3.apply_ball = counting_apply_ball
+    report("engine", *bench_engine(count * 10))
+    report("handlers", *await bench_handlers(count, parallel=False))
+    report("parallel", *await bench_handlers(count, parallel=True))
+    print(f"renderer: {bot3.renderer.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
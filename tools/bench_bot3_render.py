@@ -0,0 +1,85 @@
+"""
+Render cost per ball in BOT3.
+Each ball renders the scorecard twice (after the first pick and after the
+result) with a fresh ball sequence in between. Compares rebuilding the number
+pad and concatenating f-strings every time with the cached Renderer.
+
+    python tools/bench_bot3_render.py [balls]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup  # noqa: E402
+
+from BOT3 import callbacks  # noqa: E402
+from BOT3.callbacks import Action  # noqa: E402
+from BOT3.match import Match  # noqa: E402
+from BOT3.render import Renderer  # noqa: E402
+
+DIVIDER = "✨━━━━━━━━━━━━━━━━━━✨"
+FOOTER = "\n\n───\n🌟 **Powered by APEX**"
+LEGACY_HISTORY = ["`4`", "🔴", "`6`"]  # the Markdown list matches used to keep
+
+
+def make_match():
+    m = Match("A1B2C3", "-1001", players=["1", "2"], names=["Alice", "Bob"])
+    m.start_innings("1")
+    m.score, m.wickets, m.balls = 12, 1, 3
+    m.logs[-1].extend(b"\x04\x82\x06")
+    return m
+
+
+def legacy_keyboard(m):
+    def button(text, action):
+        return InlineKeyboardButton(text, callback_data=callbacks.encode(action, m.match_id, m.seq))
+    return InlineKeyboardMarkup([
+        [button("1️⃣", Action.N1), button("2️⃣", Action.N2), button("3️⃣", Action.N3)],
+        [button("4️⃣", Action.N4), button("5️⃣", Action.N5), button("6️⃣", Action.N6)],
+        [button("🏳️ SURRENDER", Action.SURRENDER)]
+    ])
+
+
+def legacy_scorecard(m, last_ball=None, comm=None, waiting_for=None):
+    hist_str = " ".join(LEGACY_HISTORY)
+    status = (f"🏟️ **APEX ARENA** | ID: `{m.match_id}`\n"
+              f"{DIVIDER}\n")
+    if last_ball: status += f"{last_ball}\n"
+    if comm: status += f"🎤 _{comm}_\n\n"
+    status += (f"🏏 **BAT:** {m.name(m.batsman)}\n"
+               f"🎯 **BOWL:** {m.name(m.bowler)}\n\n"
+               f"📊 **SCORE: {m.score}/{m.wickets}**\n"
+               f"⏳ **OVERS: {m.overs}.{m.balls} / 1.0**\n"
+               f"📝 **BALLS:** [ {hist_str} ]\n")
+    if waiting_for:
+        status += f"\n⏳ _Waiting for {waiting_for}..._"
+    return status + FOOTER
+
+
+def legacy_ball(m):
+    legacy_scorecard(m, waiting_for="Bob"), legacy_keyboard(m)
+    m.advance()
+    legacy_scorecard(m, last_ball="✨ **4 RUNS! ( 4 vs 2 )**", comm="⚡ Bullet Shot! Boundary!"), legacy_keyboard(m)
+
+
+def cached_ball(renderer, m):
+    renderer.render_scorecard(m, waiting_for="Bob"), renderer.number_pad(m)
+    m.advance()
+    renderer.render_scorecard(m, last_ball="✨ **4 RUNS! ( 4 vs 2 )**", comm="⚡ Bullet Shot! Boundary!"), renderer.number_pad(m)
+
+
+def main():
+    balls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    m = make_match()
+    renderer = Renderer(DIVIDER, FOOTER)
+    for label, fn in (("legacy", lambda: legacy_ball(m)), ("cached", lambda: cached_ball(renderer, m))):
+        best = min(timeit.repeat(fn, number=balls, repeat=5))
+        print(f"{label:>6}: {best / balls * 1e6:7.2f} µs/ball")
+    print(f"renderer: {renderer.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Memory, threads and sockets per hosted bot.
+
+Starts bots one batch at a time in this process, each a PTB Application built
+the way the repo's bots are (outbound scheduler, a dozen handlers, supervisor,
+metrics, long polling), against a fake Bot API running in a child process, and
+reports the growth per bot after every batch. The bots' own state (matches,
+caches) comes on top; this is the fixed cost of hosting one more token.
+
+  shared   Bot API calls through shared/resources.py's one pool (what the bots use)
+  private  every Application with PTB's own connection pool, for comparison
+
+    python tools/bench_bot_memory.py [shared|private] [batches, e.g. 1,10,50,100]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web  # noqa: E402
+from telegram.ext import ApplicationBuilder, CallbackQueryHandler, CommandHandler, MessageHandler, filters  # noqa: E402
+
+from shared import metrics, resources  # noqa: E402
+from shared.outbound import OutboundScheduler  # noqa: E402
+from shared.supervisor import supervisor  # noqa: E402
+
+PORT = 18998
+POLL_SECONDS = 1.0
+
+
+def fake_api(ready):
+    """Child process: answers getMe, long-polls getUpdates with nothing, says ok to the rest"""
+
+    async def api(request):
+        method = request.match_info["method"]
+        if method == "getMe":
+            return web.json_response({"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}})
+        if method == "getUpdates":
+            await asyncio.sleep(POLL_SECONDS)
+            return web.json_response({"ok": True, "result": []})
+        return web.json_response({"ok": True, "result": True})
+
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", api)
+    web.run_app(app, host="127.0.0.1", port=PORT, print=lambda *_: ready.set(), access_log=None)
+
+
+def usage():
+    """RSS in MB, threads and open file descriptors of this process"""
+    with open("/proc/self/status") as f:
+        status = dict(line.split(":", 1) for line in f)
+    rss = int(status["VmRSS"].split()[0]) / 1024
+    return rss, int(status["Threads"]), len(os.listdir("/proc/self/fd"))
+
+
+async def noop(update, context):
+    return None
+
+
+async def start_bot(n: int, shared: bool):
+    builder = ApplicationBuilder().token(f"{n}:bench").base_url(f"http://127.0.0.1:{PORT}/bot") \
+        .rate_limiter(OutboundScheduler(f"bench{n}"))
+    if shared:
+        builder = builder.request(resources.telegram_request())
+    app = builder.build()
+    for command in ("start", "help", "stats", "cancel", "admin", "settings"):
+        app.add_handler(CommandHandler(command, noop))
+    for pattern in ("^a_", "^b_", "^c_", "^d_"):
+        app.add_handler(CallbackQueryHandler(noop, pattern=pattern))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, noop))
+    app.add_handler(MessageHandler(filters.PHOTO, noop))
+    await app.initialize()
+    metrics.instrument(app, f"bench{n}")
+    supervisor.attach(f"bench{n}", app)
+    await app.start()
+    await app.updater.start_polling(poll_interval=0, timeout=POLL_SECONDS)
+    return app
+
+
+async def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else "shared"
+    batches = [int(x) for x in (sys.argv[2] if len(sys.argv) > 2 else "1,10,50,100").split(",")]
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=fake_api, args=(ready,), daemon=True)
+    server.start()
+    if not await asyncio.to_thread(ready.wait, 30):
+        sys.exit("fake Bot API did not start")
+
+    apps = []
+    await asyncio.sleep(1)
+    base = last = usage()
+    print(f"{mode}: baseline {base[0]:.1f} MB, {base[1]} threads, {base[2]} fds")
+    print(f"{'bots':>5} {'RSS MB':>8} {'MB/bot':>7} {'threads':>8} {'fds':>5} {'fds/bot':>8}")
+    for total in batches:
+        count = len(apps)
+        apps += await asyncio.gather(*(start_bot(n, mode == "shared") for n in range(count, total)))
+        await asyncio.sleep(POLL_SECONDS * 3)  # a few polling rounds, so pools and buffers are warm
+        now = usage()
+        added = total - count
+        print(f"{total:>5} {now[0]:>8.1f} {(now[0] - last[0]) / added:>7.2f} {now[1]:>8} {now[2]:>5} "
+              f"{(now[2] - last[2]) / added:>8.2f}")
+        last = now
+    print(f"overall: {(last[0] - base[0]) / len(apps):.2f} MB and {(last[2] - base[2]) / len(apps):.2f} fds per bot, "
+          f"{last[1] - base[1]} extra threads")
+
+    for app in apps:
+        await app.updater.stop()
+        await app.stop()
+        await app.shutdown()
+    await asyncio.sleep(0.1)  # let the cancelled scheduler tasks finish
+    server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
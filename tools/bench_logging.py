@@ -0,0 +1,83 @@
+"""
+Time a log call costs the calling thread (the bots' event loop), with the old
+per-bot basicConfig (format and write inline) and with shared/logs.py (stamp
+and queue; a listener thread formats and writes).
+
+  fast    output to a file
+  slow    output that takes 1ms per write, like a congested pipe or log drain
+
+Each simulated update logs RECORDS_PER_UPDATE lines from inside a handler
+scope, as bot_log_seconds_total counts them.
+
+    python tools/bench_logging.py [updates]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared import logs  # noqa: E402
+
+RECORDS_PER_UPDATE = 3
+
+
+class SlowStream:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        time.sleep(0.001)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run(updates: int) -> float:
+    """Seconds of log calls per update, as seen by the caller"""
+    logger = logging.getLogger("bench.handler")
+    spent = 0.0
+    for n in range(updates):
+        scope = logs.Scope("bench", "handler", None)
+        token = logs.scope.set(scope)
+        started = time.perf_counter()
+        for i in range(RECORDS_PER_UPDATE):
+            logger.info(f"update {n}: step {i} done")
+        spent += time.perf_counter() - started
+        logs.scope.reset(token)
+    return spent / updates
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = logging.getLogger()
+    with tempfile.TemporaryFile("w") as out:
+        for sink in ("fast", "slow"):
+            stream = out if sink == "fast" else SlowStream(out)
+
+            # Before: what basicConfig(format=..., level=INFO) installs
+            inline = logging.StreamHandler(stream)
+            inline.setFormatter(logging.Formatter(logs.TEXT_FORMAT))
+            root.handlers[:] = [inline]
+            root.setLevel(logging.INFO)
+            before = run(updates if sink == "fast" else updates // 10)
+
+            # After: queue handler; the listener writes behind the caller's back
+            root.handlers[:] = []
+            logs.LOG_QUEUE_SIZE = updates * RECORDS_PER_UPDATE
+            logs.setup(stream)
+            after = run(updates)
+            queued = logs.handler.queued
+            logs.stop()
+            logs.handler = None
+
+            print(f"{sink:5} inline {before * 1e6:8.1f} µs/update   queued {after * 1e6:6.1f} µs/update "
+                  f"({queued} records)")
+
+
+if __name__ == "__main__":
+    main()
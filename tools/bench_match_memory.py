@@ -0,0 +1,57 @@
+"""
+Memory footprint of BOT3 match state at 100k concurrent matches.
+Compares the old per-chat dict with the slotted Match dataclass.
+
+    python tools/bench_match_memory.py [count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BOT3.match import CPU, Match, Mode  # noqa: E402
+
+
+def legacy_match(i):
+    uid = str(5000000000 + i)
+    return {
+        "match_id": f"{i:06X}", "players": [uid, "cpu"],
+        "names": {uid: "Player", "cpu": "APEX AI 🤖"},
+        "score": 12, "wickets": 1, "overs": 0, "balls": 3, "choices": {},
+        "state": "inning1", "cpu_mode": True, "total_overs": 1, "max_wickets": 2,
+        "history": ["`4`", "🔴", "`6`"], "toss_caller": uid, "toss_winner": uid,
+        "bat_f": uid, "bowl_f": "cpu", "current_batsman": uid, "current_bowler": "cpu",
+    }
+
+
+def slotted_match(i):
+    uid = str(5000000000 + i)
+    m = Match(f"{i:06X}", str(-1000000000000 - i), players=[uid], names=["Player"], mode=Mode.CPU)
+    m.add_player(CPU, "APEX AI 🤖")
+    m.toss_caller = m.toss_winner = uid
+    m.start_innings(uid)
+    m.score, m.wickets, m.balls = 12, 1, 3
+    m.logs[-1].extend(b"\x04\x82\x06")
+    return m
+
+
+def measure(build, count):
+    tracemalloc.start()
+    store = {str(i): build(i) for i in range(count)}
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for label, build in (("dict", legacy_match), ("Match", slotted_match)):
+        size = measure(build, count)
+        print(f"{label:>6}: {size / 2**20:8.1f} MiB total, {size / count:6.0f} B/match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Overhead of the handler instrumentation in shared/metrics.py.
+
+  wrapper   a no-op handler awaited directly and through metrics.timed
+  bot3      BOT3 CPU matches through handle_callback with fake queries, timed.
+            With no network this is about the cheapest real handler there is,
+            so the share it reports is an upper bound: a handler that waits on
+            one Bot API round trip takes milliseconds, not microseconds
+
+    python tools/bench_metrics.py [matches]
+"""
+
+import asyncio
+import sys
+import time
+
+from bench_bot3_engine import play_cpu  # also puts the repo on sys.path
+from bot3_harness import FakeApplication, bot3
+from shared import metrics
+
+CALLS = 200_000
+
+
+async def noop(update, context):
+    return None
+
+
+async def per_call(handler, calls=CALLS):
+    started = time.perf_counter()
+    for _ in range(calls):
+        await handler(None, None)
+    return (time.perf_counter() - started) / calls
+
+
+async def bench_wrapper():
+    wrapped = metrics.timed(noop, "bench", "Noop")
+    raw, timed = [], []
+    for _ in range(5):  # interleaved so load changes hit both sides alike
+        raw.append(await per_call(noop))
+        timed.append(await per_call(wrapped))
+    return min(timed) - min(raw)
+
+
+async def bench_bot3(count):
+    bot3.BALL_SUSPENSE = 0
+    bot3.handle_callback = metrics.timed(bot3.handle_callback, "bot3", "CallbackQueryHandler")
+    app = FakeApplication()
+    for n in range(count):
+        await play_cpu(app, n)
+    _, histograms = metrics.registry._merged()
+    row = next(row for (name, labels), row in histograms.items() if ("bot", "bot3") in labels)
+    calls = sum(row[:-1])
+    return calls, row[-1] / calls
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    overhead = await bench_wrapper()
+    print(f" wrapper: {overhead * 1e9:,.0f} ns per handler call")
+    calls, mean = await bench_bot3(count)
+    share = overhead / mean
+    print(f"    bot3: {calls:,} handle_callback calls, mean {mean * 1e6:,.1f} µs offline "
+          f"-> overhead at most {share:.2%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Startup cost of each bot, measured the way the runner now pays it: every bot's
+module is imported in a fresh interpreter, on its own, so one module's cost or
+failure doesn't hide another's.
+
+  import    wall time of `import BOT4.main` etc. in a cold process
+  eager     all enabled modules imported one after another in one process,
+            as runner.py used to do before starting anything (stops at the
+            first failure, like the old all-or-nothing import did)
+
+MONGO_URI defaults to an address nothing listens on, the free-tier worst case
+of a database that is slow or down: imports must not wait on it.
+
+    python tools/bench_startup.py [bot ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from shared import registry  # noqa: E402
+
+CHILD = """
+import importlib, json, sys, time
+sys.path[:0] = {paths!r}
+results = []
+for module in {modules!r}:
+    started = time.perf_counter()
+    try:
+        importlib.import_module(module)
+        error = None
+    except BaseException as e:
+        error = f"{{type(e).__name__}}: {{e}}"
+    results.append((module, time.perf_counter() - started, error))
+    if error:
+        break
+print(json.dumps(results))
+"""
+
+
+def cold_import(modules):
+    env = {**os.environ, "MONGO_URI": os.getenv("MONGO_URI") or "mongodb://127.0.0.1:9/?serverSelectionTimeoutMS=5000"}
+    out = subprocess.run([sys.executable, "-c", CHILD.format(paths=[ROOT], modules=modules)],
+                         capture_output=True, text=True, env=env, cwd=ROOT, timeout=300)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    specs = registry.load_specs()
+    names = sys.argv[1:] or list(registry.enabled(specs))
+    modules = {name: specs[name].entry.partition(":")[0] for name in names}
+    print("per bot, cold process:")
+    for name in names:
+        (module, seconds, error), = cold_import([modules[name]])
+        print(f"  {name:5} {module:10} {seconds:6.2f}s" + (f"  ❌ {error[:100]}" if error else ""))
+
+    results = cold_import(list(modules.values()))
+    total = sum(seconds for _, seconds, _ in results)
+    failed = [module for module, _, error in results if error]
+    print(f"eager, one process: {total:.2f}s before the first bot could start"
+          + (f"; {failed[0]} failed, so no bot would have started" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Telegram stand-ins for driving BOT3's handlers offline.
+Only what the handlers touch is implemented; a query records the last text it
+was edited to.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep offline runs out of the real stats files
+os.environ.setdefault("BOT3_STATS_LOG", os.path.join(tempfile.gettempdir(), "bot3_harness_stats.jsonl"))
+os.environ.setdefault("BOT3_STATS_DB", os.path.join(tempfile.gettempdir(), "bot3_harness_stats.db"))
+
+import BOT3.main as bot3  # noqa: E402
+from BOT3 import callbacks  # noqa: E402
+
+
+class FakeUser:
+    def __init__(self, uid):
+        self.id = uid
+        self.first_name = f"P{uid}"
+
+
+class FakeQuery:
+    # Yields per edit, drawn at random, to interleave concurrent taps like a real round-trip
+    max_yields = 0
+
+    def __init__(self, data, user):
+        self.data = data
+        self.from_user = user
+        self.text = None
+
+    async def answer(self, *args, **kwargs):
+        await asyncio.sleep(0)
+
+    async def edit_message_text(self, text, *args, **kwargs):
+        self.text = text
+        for _ in range(random.randint(0, self.max_yields)):
+            await asyncio.sleep(0)
+
+
+class FakeChat:
+    def __init__(self, chat_id):
+        self.id = chat_id
+        self.type = "private" if chat_id > 0 else "group"
+
+
+class FakeUpdate:
+    def __init__(self, uid, data, chat_id):
+        self.effective_user = FakeUser(uid)
+        self.callback_query = FakeQuery(data, self.effective_user)
+        self.effective_chat = FakeChat(chat_id)
+
+
+class FakeApplication:
+    def __init__(self):
+        self.tasks = set()
+
+    def create_task(self, coro, update=None):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+
+class FakeContext:
+    def __init__(self, app):
+        self.application = app
+        self.args = []
+
+
+async def tap(app, uid, chat_id, action, match_id, seq):
+    """Press a button as uid in chat_id"""
+    data = callbacks.encode(action, match_id, seq)
+    await bot3.handle_callback(FakeUpdate(uid, data, chat_id), FakeContext(app))
+
+
+async def settle(m):
+    """Wait until the ball in the air (if any) has landed"""
+    while m.resolving:
+        await asyncio.sleep(0)
@@ -0,0 +1,153 @@
+"""
+Generates BOT3/ai_tables.py, the CPU's mixed-strategy tables.
+
+Every situation (balls left, runs needed, wickets left) is a 6x6 zero-sum
+game between batsman and bowler. Situations are solved backwards from the
+last ball: each game's payoffs are the already-solved values of the
+situations it leads to, and the game itself is solved by simulating repeated
+play with regret matching until the average strategies settle.
+
+Chases are valued by win probability (a tie counts as half, the super
+over), first innings by expected runs.
+
+    python tools/gen_bot3_ai_tables.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from BOT3.ai import MAX_BALLS, MAX_NEED, MAX_WICKETS  # noqa: E402
+
+NUMBERS = range(1, 7)
+OUTPUT = os.path.join(ROOT, "BOT3", "ai_tables.py")
+
+
+def solve(payoff, iterations):
+    """Approximate equilibrium of a 6x6 zero-sum game (row player maximizes)"""
+    row_regret, col_regret = [0.0] * 6, [0.0] * 6
+    row_sum, col_sum = [0.0] * 6, [0.0] * 6
+    uniform = [1 / 6] * 6
+
+    def strategy(regret):
+        total = sum(regret)
+        return [r / total for r in regret] if total > 0 else uniform
+
+    for t in range(1, iterations + 1):
+        row, col = strategy(row_regret), strategy(col_regret)
+        row_value = [sum(payoff[i][j] * col[j] for j in range(6)) for i in range(6)]
+        col_value = [sum(row[i] * payoff[i][j] for i in range(6)) for j in range(6)]
+        value = sum(row[i] * row_value[i] for i in range(6))
+        # Regret matching+: clip at zero, weight later rounds more
+        row_regret = [max(row_regret[i] + row_value[i] - value, 0.0) for i in range(6)]
+        col_regret = [max(col_regret[j] + value - col_value[j], 0.0) for j in range(6)]
+        for k in range(6):
+            row_sum[k] += t * row[k]
+            col_sum[k] += t * col[k]
+
+    row_total, col_total = sum(row_sum), sum(col_sum)
+    row = [x / row_total for x in row_sum]
+    col = [x / col_total for x in col_sum]
+    value = sum(row[i] * payoff[i][j] * col[j] for i in range(6) for j in range(6))
+    return row, col, value
+
+
+def quantize(weights):
+    """Probabilities -> 6 bytes, every number keeps at least weight 1"""
+    return bytes(max(1, min(255, round(w * 255))) for w in weights)
+
+
+def chase_tables(iterations):
+    """Win probability and strategies for the side batting second"""
+    win = {}
+
+    def value(balls, need, wickets):
+        if need <= 0:
+            return 1.0
+        if balls == 0 or wickets == 0:
+            return 0.5 if need == 1 else 0.0
+        if need > 6 * balls:
+            return 0.0
+        return win[balls, min(need, MAX_NEED), wickets]
+
+    strategies, probs = bytearray(), bytearray()
+    for balls in range(1, MAX_BALLS + 1):
+        for need in range(1, MAX_NEED + 1):
+            for wickets in range(1, MAX_WICKETS + 1):
+                payoff = [[value(balls - 1, need, wickets - 1) if i == j else value(balls - 1, need - i, wickets)
+                           for j in NUMBERS] for i in NUMBERS]
+                bat, bowl, v = solve(payoff, iterations)
+                win[balls, need, wickets] = v
+                strategies += quantize(bat) + quantize(bowl)
+                probs.append(round(v * 255))
+    return strategies, probs
+
+
+def first_innings_tables(iterations):
+    """Expected runs and strategies for the side batting first"""
+    runs = {}
+
+    def value(balls, wickets):
+        return 0.0 if balls == 0 or wickets == 0 else runs[balls, wickets]
+
+    strategies, expected = bytearray(), []
+    for balls in range(1, MAX_BALLS + 1):
+        for wickets in range(1, MAX_WICKETS + 1):
+            payoff = [[value(balls - 1, wickets - 1) if i == j else i + value(balls - 1, wickets)
+                       for j in NUMBERS] for i in NUMBERS]
+            bat, bowl, v = solve(payoff, iterations)
+            runs[balls, wickets] = v
+            strategies += quantize(bat) + quantize(bowl)
+            expected.append(round(v, 2))
+    return strategies, expected
+
+
+def hex_lines(data, width=96):
+    text = data.hex()
+    return "\n".join(f'    "{text[i:i + width]}"' for i in range(0, len(text), width))
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    started = time.perf_counter()
+    chase, win = chase_tables(iterations)
+    first, expected = first_innings_tables(iterations)
+
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write(f'''"""
+APEX CRICKET - CPU STRATEGY TABLES
+Generated by tools/gen_bot3_ai_tables.py ({iterations} iterations per situation), do not edit.
+Each situation holds 12 bytes: batsman weights for 1-6, then bowler weights for 1-6.
+"""
+
+MAX_BALLS = {MAX_BALLS}
+MAX_NEED = {MAX_NEED}
+MAX_WICKETS = {MAX_WICKETS}
+
+# index ((balls - 1) * MAX_NEED + need - 1) * MAX_WICKETS + wickets - 1
+CHASE = bytes.fromhex(
+{hex_lines(chase)}
+)
+
+# batting side's win probability * 255, same index as CHASE
+WIN_PROBABILITY = bytes.fromhex(
+{hex_lines(win)}
+)
+
+# index (balls - 1) * MAX_WICKETS + wickets - 1
+FIRST_INNINGS = bytes.fromhex(
+{hex_lines(first)}
+)
+
+# expected first-innings runs, same index as FIRST_INNINGS
+EXPECTED_RUNS = {expected}
+''')
+    print(f"wrote {OUTPUT}: {len(chase) // 12} chase + {len(first) // 12} first-innings situations "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
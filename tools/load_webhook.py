@@ -0,0 +1,172 @@
+"""
+Load test for the webhook ingress (shared/webhook.py).
+
+Posts synthetic message updates at a fixed rate and reports throughput and
+latency. Latency is measured from each request's scheduled send time, so a
+backed-up server shows up as latency instead of silently slowing the test.
+
+With no URL it starts a local ingress (in a child process, with a throwaway
+Application) and checks that every accepted update reached the update queue.
+With a URL (e.g. http://127.0.0.1:8443/tg/bot3) it targets a running instance, signing
+requests with WEBHOOK_SECRET from the environment.
+
+    python tools/load_webhook.py [rate] [seconds] [url]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram.ext import ApplicationBuilder  # noqa: E402
+
+from shared import webhook  # noqa: E402
+
+TICK = 0.005
+CONNECTIONS = 256
+LOCAL_PORT = 18443
+LOCAL_BOT = "load"
+
+
+def synthetic_update(update_id: int) -> bytes:
+    chat = 100_000 + update_id % 5000
+    return json.dumps({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat, "type": "private", "first_name": "Load"},
+            "from": {"id": chat, "is_bot": False, "first_name": "Load"},
+            "text": "/start",
+        },
+    }).encode()
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def fire(session, url, headers, body, scheduled, latencies, errors):
+    try:
+        async with session.post(url, data=body, headers=headers) as resp:
+            await resp.read()
+            if resp.status != 200:
+                errors[resp.status] = errors.get(resp.status, 0) + 1
+                return
+    except aiohttp.ClientError as e:
+        errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        return
+    latencies.append(time.perf_counter() - scheduled)
+
+
+async def load(url, secret, rate, seconds):
+    """Open-loop load: requests go out on schedule whether or not earlier ones have finished"""
+    headers = {webhook.SECRET_HEADER: secret, "Content-Type": "application/json"}
+    latencies, errors, tasks = [], {}, set()
+    connector = aiohttp.TCPConnector(limit=CONNECTIONS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        total = int(rate * seconds)
+        started = time.perf_counter()
+        sent = 0
+        while sent < total:
+            now = time.perf_counter()
+            due = min(total, int((now - started) * rate) + 1)
+            for update_id in range(sent, due):
+                scheduled = started + update_id / rate
+                task = asyncio.create_task(fire(session, url, headers, synthetic_update(update_id),
+                                                scheduled, latencies, errors))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            sent = due
+            await asyncio.sleep(TICK)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    achieved = len(latencies) / elapsed
+    print(f"sent {total:,} in {elapsed:.2f}s -> {achieved:,.0f} ok/s (target {rate:,}/s)"
+          f"{'' if achieved >= rate * 0.95 else '  ⚠️ below target: client or server is CPU bound'}")
+    print(f"latency ms  p50 {percentile(ms, .5):.1f}  p95 {percentile(ms, .95):.1f}  "
+          f"p99 {percentile(ms, .99):.1f}  max {ms[-1] if ms else 0:.1f}")
+    if errors:
+        print(f"errors: {errors}")
+    return len(latencies), errors
+
+
+def serve_local(secret, ready, stop, result):
+    """Child process: a local ingress with a throwaway Application, draining its update queue"""
+
+    async def run():
+        app = ApplicationBuilder().token("123456:LOAD-TEST").updater(None).build()
+        ingress = webhook.WebhookIngress("127.0.0.1", LOCAL_PORT)
+        ingress.register(LOCAL_BOT, app, secret)
+        await ingress.serve()
+        received = 0
+
+        async def drain():
+            nonlocal received
+            while True:
+                await app.update_queue.get()
+                received += 1
+
+        drainer = asyncio.create_task(drain())
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        drainer.cancel()
+        await ingress.close()
+        result.put((received, ingress.stats))
+
+    asyncio.run(run())
+
+
+async def local(rate, seconds):
+    # The ingress runs in its own process so the client doesn't compete with it for the loop
+    secret = webhook.secret_for(LOCAL_BOT, "load-test")
+    ready, stop, result = multiprocessing.Event(), multiprocessing.Event(), multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve_local, args=(secret, ready, stop, result), daemon=True)
+    server.start()
+    try:
+        if not await asyncio.to_thread(ready.wait, 30):
+            print("❌ local ingress did not start")
+            return False
+        url = f"http://127.0.0.1:{LOCAL_PORT}/tg/{LOCAL_BOT}"
+        ok, errors = await load(url, secret, rate, seconds)
+        forbidden = await probe(url)
+        await asyncio.sleep(0.2)
+    finally:
+        stop.set()
+    received, stats = await asyncio.to_thread(result.get, True, 30)
+    server.join(5)
+    print(f"queued {received:,} updates, ingress {stats}, wrong secret -> {forbidden}")
+    return ok == received == int(rate * seconds) and not errors and forbidden == 403
+
+
+async def probe(url):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, data=synthetic_update(0), headers={webhook.SECRET_HEADER: "wrong"}) as resp:
+            return resp.status
+
+
+def main():
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    if len(sys.argv) > 3:
+        url = sys.argv[3]
+        ok, errors = asyncio.run(load(url, webhook.secret_for(url.rstrip("/").rsplit("/", 1)[-1]), rate, seconds))
+        passed = not errors
+    else:
+        passed = asyncio.run(local(rate, seconds))
+    print("✅ passed" if passed else "❌ failed")
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Vectorized Monte Carlo simulator for BOT3 (needs numpy).
+
+  rules    plays millions of matches per format with uniform picks and checks
+           the outcome rates against BOT3.engine playing the same matches
+  tables   replays chases from sampled situations with both sides using the
+           CPU's strategy tables and checks the empirical win rate against
+           ai_tables.WIN_PROBABILITY
+
+    python tools/simulate_bot3.py [matches] [rules|tables|all]
+"""
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BOT3 import ai_tables, engine, rules  # noqa: E402
+from BOT3.match import Match  # noqa: E402
+
+rng = np.random.default_rng()
+TOLERANCE_SIGMAS = 4
+
+
+# ================= VECTORIZED RULES =================
+def innings(n, overs, wickets, target=None):
+    """Score and wickets of n innings with uniform picks, stopping at the target if chasing"""
+    score = np.zeros(n, np.int32)
+    out = np.zeros(n, np.int32)
+    active = np.ones(n, bool)
+    for _ in range(overs * 6):
+        bat = rng.integers(1, 7, n, dtype=np.int32)
+        bowl = rng.integers(1, 7, n, dtype=np.int32)
+        wicket = (bat == bowl) & active
+        out += wicket
+        score += np.where(active & ~wicket, bat, 0)
+        active &= out < wickets
+        if target is not None:
+            active &= score < target
+        if not active.any():
+            break
+    return score, out
+
+
+def matches(n, spec):
+    """Outcome counts for n matches: batting-first wins, chasing wins, ties"""
+    first, _ = innings(n, spec.overs, spec.wickets)
+    target = first + 1
+    second, _ = innings(n, spec.overs, spec.wickets, target)
+    chased = second >= target
+    level = second == first
+    defended = ~chased & ~level
+
+    # Super over for level scores: the side that batted second bats first
+    tied = np.flatnonzero(level) if spec.super_over else np.array([], np.int64)
+    so_first, _ = innings(len(tied), rules.SUPER_OVER.overs, rules.SUPER_OVER.wickets)
+    so_second, _ = innings(len(tied), rules.SUPER_OVER.overs, rules.SUPER_OVER.wickets, so_first + 1)
+    # In the super over the original batting-first side is the one chasing
+    first_wins = defended.sum() + (so_second > so_first).sum()
+    second_wins = chased.sum() + (so_second < so_first).sum()
+    ties = (so_second == so_first).sum() if spec.super_over else level.sum()
+    return np.array([first_wins, second_wins, ties]) / n
+
+
+def engine_matches(n, spec):
+    """The same rates from BOT3.engine, one match at a time"""
+    counts = np.zeros(3)
+    pick = lambda m, uid: random.randint(1, 6)  # noqa: E731
+    for _ in range(n):
+        m = Match("000000", "-1", players=["a", "b"], names=["A", "B"],
+                  format_name=spec.name, total_overs=spec.overs, max_wickets=spec.wickets)
+        m.start_innings("a")
+        winner = engine.play_match(m, pick)
+        counts[0 if winner == "a" else 1 if winner == "b" else 2] += 1
+    return counts / n
+
+
+def rates(values):
+    return "/".join(f"{v:.4f}" for v in values)
+
+
+def check_rules(n):
+    ok = True
+    for spec in rules.FORMAT_LIST:
+        started = time.perf_counter()
+        fast = matches(n, spec)
+        elapsed = time.perf_counter() - started
+        slow_n = max(n // 200, 2000)
+        slow = engine_matches(slow_n, spec)
+        # Binomial standard error of the smaller sample dominates; floored for rare outcomes
+        sigma = np.sqrt(np.maximum(fast * (1 - fast), 1 / slow_n) / slow_n)
+        worst = np.max(np.abs(fast - slow) / sigma)
+        ok &= worst < TOLERANCE_SIGMAS
+        print(f"{spec.name:>4}: {n:,} sims in {elapsed:.2f}s ({n / elapsed:,.0f} matches/s)  "
+              f"first/second/tie {rates(fast)}  engine x{slow_n:,} {rates(slow)}  "
+              f"{'✅' if worst < TOLERANCE_SIGMAS else '❌'} {worst:.1f}σ")
+    return ok
+
+
+# ================= STRATEGY TABLES =================
+def table_chases(n, balls, need, wickets):
+    """Win rate (tie = half) of n chases from one situation, both sides playing the tables"""
+    cum = np.cumsum(np.frombuffer(ai_tables.CHASE, np.uint8).reshape(-1, 6).astype(np.int32), axis=1)
+    need = np.full(n, need, np.int32)
+    out = np.zeros(n, np.int32)
+    for left in range(balls, 0, -1):
+        active = (need > 0) & (out < wickets)
+        if not active.any():
+            break
+        index = ((left - 1) * ai_tables.MAX_NEED + np.clip(need, 1, ai_tables.MAX_NEED) - 1) * ai_tables.MAX_WICKETS \
+            + np.clip(wickets - out, 1, ai_tables.MAX_WICKETS) - 1
+        picks = []
+        for role in (0, 1):
+            rows = cum[2 * index + role]
+            u = rng.random(n) * rows[:, -1]
+            picks.append((u[:, None] >= rows).sum(axis=1) + 1)
+        bat, bowl = picks
+        wicket = (bat == bowl) & active
+        out += wicket
+        need -= np.where(active & ~wicket, bat, 0)
+    return np.mean(np.where(need <= 0, 1.0, np.where(need == 1, 0.5, 0.0)))
+
+
+def check_tables(n, samples=40):
+    errors = []
+    started = time.perf_counter()
+    for _ in range(samples):
+        balls = random.randint(1, ai_tables.MAX_BALLS)
+        need = random.randint(1, min(ai_tables.MAX_NEED, 6 * balls))
+        wickets = random.randint(1, ai_tables.MAX_WICKETS)
+        index = ((balls - 1) * ai_tables.MAX_NEED + need - 1) * ai_tables.MAX_WICKETS + wickets - 1
+        expected = ai_tables.WIN_PROBABILITY[index] / 255
+        errors.append(abs(table_chases(n, balls, need, wickets) - expected))
+    elapsed = time.perf_counter() - started
+    # Quantization to 1/255 plus sampling noise plus the solver's approximation
+    limit = 1 / 255 + TOLERANCE_SIGMAS * 0.5 / np.sqrt(n) + 0.02
+    worst = max(errors)
+    print(f"tables: {samples} situations x {n:,} chases in {elapsed:.2f}s  "
+          f"mean error {np.mean(errors):.4f}, worst {worst:.4f} {'✅' if worst < limit else '❌'} (limit {limit:.4f})")
+    return worst < limit
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    what = sys.argv[2] if len(sys.argv) > 2 else "all"
+    ok = True
+    if what in ("rules", "all"):
+        ok &= check_rules(n)
+    if what in ("tables", "all"):
+        ok &= check_tables(max(n // 20, 1000))
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Concurrency stress test for BOT3 callbacks.
+Plays many duel matches at once through handle_callback (two per chat) with
+both players tapping several numbers at the same moment, plus taps on buttons
+that are already stale, then replays every accepted ball to check that
+scores, innings changes and winners are consistent.
+
+    python tools/stress_bot3_concurrency.py [matches]
+"""
+
+import asyncio
+import gc
+import random
+import sys
+import time
+
+from bot3_harness import FakeApplication, FakeQuery, bot3, settle, tap  # also puts the repo on sys.path
+from BOT3.callbacks import Action
+
+TAPS_PER_PLAYER = 3
+
+
+# ================= RECORDING =================
+balls = {}    # match id -> [(bat, bowl)]
+results = {}  # match id -> winner uid
+openers = {}  # match id -> (bat_first, bowl_first)
+
+_apply_ball, _end_match = bot3.apply_ball, bot3.end_match
+
+
+async def recording_apply_ball(query, m, b1, b2):
+    openers.setdefault(m.match_id, (m.bat_first, m.bowl_first))
+    balls.setdefault(m.match_id, []).append((b1, b2))
+    await _apply_ball(query, m, b1, b2)
+
+
+async def recording_end_match(query, m, winner, reason):
+    assert m.match_id not in results, f"{m.match_id} finished twice"
+    results[m.match_id] = winner
+    await _end_match(query, m, winner, reason)
+
+
+def replay(history, bat_first, bowl_first, overs=1, max_wickets=2):
+    """Expected winner (None for a tie) for a list of (bat, bowl) numbers, super over included"""
+    # (batting side, bowling side, overs, wickets) for innings 1, 2 and the super over
+    innings = [(bat_first, bowl_first, overs, max_wickets), (bowl_first, bat_first, overs, max_wickets),
+               (bowl_first, bat_first, 1, 2), (bat_first, bowl_first, 1, 2)]
+    n, target = 0, 0
+    score = wickets = legal = 0
+    for i, (bat, bowl) in enumerate(history):
+        batting, bowling, limit, max_out = innings[n]
+        if bat == bowl:
+            wickets += 1
+        else:
+            score += bat
+        legal += 1
+        chasing = n % 2 == 1
+        if chasing and score >= target:
+            return batting, i + 1
+        if wickets >= max_out or legal >= limit * 6:
+            if chasing:
+                if score < target - 1:
+                    return bowling, i + 1
+                if n == 3:
+                    return None, i + 1
+            n, target = n + 1, score + 1
+            score = wickets = legal = 0
+    return "unfinished", len(history)
+
+
+# ================= DRIVER =================
+async def play(app, n):
+    chat_id = -100000 - n // 2
+    p1, p2 = 10 * n + 1, 10 * n + 2
+    match_id = bot3.matches.new_id()
+    await tap(app, p1, chat_id, Action.MODE_DUEL, match_id, 0)
+    m = bot3.matches.get(match_id)
+    # Racing joins, including a third user who must be turned away
+    seq = m.seq
+    await asyncio.gather(*(tap(app, uid, chat_id, Action.JOIN, match_id, seq) for uid in (p2, p2, 10 * n + 3)))
+
+    assert len(m.players) == 2, m.players
+    seq = m.seq
+    await asyncio.gather(*(tap(app, int(m.toss_caller), chat_id, Action.HEADS, match_id, seq) for _ in range(2)))
+    seq = m.seq
+    await asyncio.gather(*(tap(app, int(m.toss_winner), chat_id, Action.BAT, match_id, seq) for _ in range(2)))
+
+    while bot3.matches.get(match_id) is not None:
+        seq = m.seq
+        taps = [tap(app, uid, chat_id, Action.N1 + random.randint(0, 5), match_id, seq)
+                for uid in (p1, p2) for _ in range(TAPS_PER_PLAYER)]
+        # A button from an earlier ball must be ignored
+        taps.append(tap(app, p1, chat_id, Action.N6, match_id, seq - 1))
+        random.shuffle(taps)
+        await asyncio.gather(*taps)
+        await settle(m)
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    bot3.BALL_SUSPENSE = 0
+    FakeQuery.max_yields = 3
+    bot3.apply_ball, bot3.end_match = recording_apply_ball, recording_end_match
+    app = FakeApplication()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(play(app, n) for n in range(count)))
+    elapsed = time.perf_counter() - started
+
+    errors = 0
+    for match_id, history in balls.items():
+        bat_first, bowl_first = openers[match_id]
+        winner, used = replay(history, bat_first, bowl_first)
+        if winner != results.get(match_id) or used != len(history):
+            errors += 1
+            print(f"❌ {match_id}: expected {winner} after {used} balls, got {results.get(match_id)} after {len(history)}")
+
+    gc.collect()
+    total = sum(len(h) for h in balls.values())
+    print(f"{count} matches, {total} balls in {elapsed:.2f}s ({total / elapsed:,.0f} balls/s)")
+    print(f"finished: {len(results)}, inconsistent: {errors}, live locks left: {len(bot3.matches.lock)}")
+    if errors or len(results) != count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+"""
+Manage tenants: owners' copies of a multi-tenant bot (bot2, bot4), stored in
+<TENANTS_DB>.tenants. The runner picks them up at its next start when
+TENANTS=true; FLEET_NODES/NODE_NAME decide which deployment runs each.
+
+    python tools/tenants.py list
+    python tools/tenants.py add acme bot4 123:ABC '{"ADMIN_IDS": [1, 2]}'
+    python tools/tenants.py disable acme
+    python tools/tenants.py enable acme
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared import registry, tenants  # noqa: E402
+
+
+def main():
+    bases = {name: spec for name, spec in registry.load_specs().items() if spec.multi_tenant and not spec.tenant}
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("list", [])
+    if command == "list":
+        for doc in tenants.store().find({"bot": {"$in": list(bases)}}).sort("_id"):
+            state = "enabled " if doc.get("enabled", True) else "disabled"
+            print(f"{doc['_id']:20} {doc['bot']:5} {state} node={tenants.ring.node(doc['_id'])} "
+                  f"settings={sorted(doc.get('settings') or {})}")
+    elif command == "add" and len(args) in (3, 4):
+        tenant_id, bot, token = args[:3]
+        if bot not in bases:
+            sys.exit(f"{bot} is not a multi-tenant bot")
+        settings = json.loads(args[3]) if len(args) == 4 else {}
+        tenants.save(tenants.Tenant(tenant_id, bot, token, settings))
+        print(f"saved {tenants.bot_name(bot, tenant_id)}, runs on {tenants.ring.node(tenant_id)}")
+    elif command in ("enable", "disable") and len(args) == 1:
+        result = tenants.store().update_one({"_id": args[0]}, {"$set": {"enabled": command == "enable"}})
+        if not result.matched_count:
+            sys.exit(f"unknown tenant {args[0]!r}")
+        print(f"{args[0]} {command}d")
+    else:
+        sys.exit(__doc__)
+
+
+if __name__ == "__main__":
+    main()